@@ -0,0 +1,63 @@
+"""Measure the commits read and parsed for one package of a monorepo, with and without the `commit_paths` setting.
+
+The synthetic history changes each of `--packages` directories in turn. The bump analysis and the changelog of one
+package are run from its directory over the whole history, first without pathspecs, then with `commit_paths = .`.
+Usage::
+
+    python -m benchmarks.commit_paths --commits 20000 --packages 20
+    python -m benchmarks.commit_paths --commits 20000 --packages 20 --bloom
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from git import Repo
+
+from semantic_release import vcs_helpers
+from semantic_release.history.logs import analyze_version_bump, generate_changelog
+from semantic_release.settings import config
+
+from .synthetic import build_repository
+
+
+def measure(func, repeat: int):
+    """Return the fastest time of `func` and its last result."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--commits", type=int, default=20000)
+    parser.add_argument("--packages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs, the fastest is reported")
+    parser.add_argument(
+        "--bloom", action="store_true", help="write a commit-graph with changed-path Bloom filters, as git gc may do"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = build_repository(Path(directory) / "repo", args.commits, packages=args.packages)
+        if args.bloom:
+            subprocess.run(["git", "commit-graph", "write", "--reachable", "--changed-paths"], cwd=path, check=True)
+        vcs_helpers.repo = Repo(path)
+        os.chdir(path / "packages" / "package0")
+
+        print(f"{'commit_paths':<14} {'parsed commits':>15} {'bump (s)':>10} {'changelog (s)':>14}")
+        for commit_paths in ["", "."]:
+            config["commit_paths"] = commit_paths
+            bump_time, bump = measure(lambda: analyze_version_bump("0.0.0", exhaustive=True), args.repeat)
+            changelog_time, _ = measure(lambda: generate_changelog(None), args.repeat)
+            print(f"{commit_paths or '(unset)':<14} {bump.commit_count:>15} {bump_time:>10.3f} {changelog_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare the ways of resolving the HEAD commit hash and a tagged commit on a repository with many refs.
+
+`git name-rev` walks the refs to name the commit, GitPython reads HEAD through its object database, `resolve_ref`
+only reads the ref files. Tags are looked up with GitPython, with the `git for-each-ref` tag index and with
+`get_version_from_tag`, which reads `TagRefs` and runs `git rev-parse` for the tags it cannot peel. Usage::
+
+    python -m benchmarks.head_hash --commits 2000 --tags 500 --branches 5000
+"""
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from git import Repo
+
+from semantic_release import vcs_helpers
+from semantic_release.refs import resolve_ref
+from semantic_release.vcs_helpers import TagIndex, get_version_from_tag
+
+from .synthetic import build_repository
+
+
+def add_branches(path: Path, count: int):
+    """Create `count` branches pointing to the commits of the history, in a single `git update-ref` call."""
+    shas = subprocess.run(["git", "rev-list", "HEAD"], cwd=path, check=True, capture_output=True, text=True).stdout
+    commits = shas.split()
+    commands = "".join(f"create refs/heads/branch-{i} {commits[i % len(commits)]}\n" for i in range(count))
+    subprocess.run(["git", "update-ref", "--stdin"], cwd=path, input=commands, check=True, text=True)
+
+
+def cold_gitpython_tag(path: Path, tag: str) -> str:
+    """Look a tag up with a new `Repo`, which starts its `git cat-file` process as the first lookup of a run does."""
+    repo = Repo(path)
+    try:
+        return repo.tag(tag).commit.hexsha
+    finally:
+        repo.close()
+
+
+def lookup_tag(tag: str):
+    """Look a tag up as the first lookup of a run, without the tag refs and index of the previous runs."""
+    vcs_helpers._tag_refs = None
+    vcs_helpers._tag_index = None
+    return get_version_from_tag(tag)
+
+
+def measure(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--commits", type=int, default=2000)
+    parser.add_argument("--tags", type=int, default=500)
+    parser.add_argument("--branches", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs, the fastest is reported")
+    parser.add_argument("--packed", action="store_true", help="pack the refs, as after a git gc")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = build_repository(Path(directory) / "repo", args.commits, args.tags)
+        add_branches(path, args.branches)
+        if args.packed:
+            subprocess.run(["git", "pack-refs", "--all"], cwd=path, check=True)
+        repo = Repo(path)
+        git_dir = Path(repo.git_dir)
+
+        expected = repo.head.commit.hexsha
+        assert resolve_ref(git_dir) == expected
+        candidates = [
+            ("name_rev", lambda: repo.head.commit.name_rev.split(" ")[0]),
+            ("gitpython hexsha", lambda: repo.head.commit.hexsha),
+            ("resolve_ref", lambda: resolve_ref(git_dir)),
+        ]
+        report(candidates, args.repeat)
+
+        tag = f"v1.{args.tags - 1}.0"
+        expected = repo.tag(tag).commit.hexsha
+        vcs_helpers.repo = repo
+        assert lookup_tag(tag) == expected
+        candidates = [
+            ("gitpython tag", lambda: repo.tag(tag).commit.hexsha),
+            ("gitpython tag, cold", lambda: cold_gitpython_tag(path, tag)),
+            ("tag index", lambda: TagIndex.from_repo(repo).sha(tag)),
+            ("get_version_from_tag", lambda: lookup_tag(tag)),
+        ]
+        print()
+        report(candidates, args.repeat)
+
+
+def report(candidates, repeat: int):
+    print(f"{'method':<20} {'time (ms)':>10}")
+    for name, func in candidates:
+        print(f"{name:<20} {measure(func, repeat) * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare serial commit parsing with the `parse_workers` process pool.
+
+Synthetic angular commit messages are parsed with and without worker processes, for growing numbers of commits, to
+find the range size above which the pool is worth its start-up and pickling cost. Usage::
+
+    python -m benchmarks.parse_workers --workers 4 --chunk-size 256 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import time
+
+from semantic_release.history import angular_parser
+from semantic_release.history.cache import ParsedCommitCache
+
+TYPES = ["feat", "fix", "docs", "perf", "refactor", "chore", "test", "ci"]
+
+
+def synthetic_commits(count, seed=0):
+    rng = random.Random(seed)
+    for index in range(count):
+        body = "\n\n".join(" ".join(f"word{rng.randrange(1000)}" for _ in range(12)) for _ in range(rng.randrange(4)))
+        if rng.random() < 0.02:
+            body += "\n\nBREAKING CHANGE: the public api changed"
+        yield f"{index:040x}", f"{rng.choice(TYPES)}(scope{rng.randrange(20)}): subject of commit {index}\n\n{body}"
+
+
+def measure(commits, workers=0, chunk_size=1):
+    start = time.perf_counter()
+    for _ in ParsedCommitCache(angular_parser).parse_batch(commits, workers=workers, chunk_size=chunk_size):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 5000, 20000, 50000, 100000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"{'commits':>10} {'serial (s)':>12} {f'{args.workers} workers (s)':>16} {'speedup':>8}")
+    crossover = None
+    for size in args.sizes:
+        commits = list(synthetic_commits(size))
+        serial = measure(commits)
+        parallel = measure(commits, args.workers, args.chunk_size)
+        print(f"{size:>10} {serial:>12.3f} {parallel:>16.3f} {serial / parallel:>8.2f}")
+        if crossover is None and parallel < serial:
+            crossover = size
+    if crossover is None:
+        print("The process pool was slower for every size")
+    else:
+        print(f"The process pool is faster from {crossover} commits")
+
+
+if __name__ == "__main__":
+    main()
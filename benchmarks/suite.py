@@ -0,0 +1,139 @@
+"""Benchmark the hot paths of semantic-release on a synthetic repository.
+
+Each stage is timed over several runs, and run once more under tracemalloc to report its peak memory. Results can be
+saved and compared with a previous run, the exit code is 1 when a stage got slower than the tolerance. Usage::
+
+    python -m benchmarks.suite --commits 20000 --tags 50 --mix angular=4,scipy=1,emoji=1,gitmoji=1
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from git import Repo
+
+from semantic_release import vcs_helpers
+from semantic_release.changelog import markdown_changelog
+from semantic_release.history import get_previous_version
+from semantic_release.history.logs import evaluate_version_bump, generate_changelog, get_commits
+from semantic_release.settings import config
+from semantic_release.vcs_helpers import get_commit_log, get_last_version
+
+from .synthetic import DEFAULT_MIX, build_repository, parse_mix
+
+PARSERS = {
+    "angular": "semantic_release.history.angular_parser",
+    "scipy": "semantic_release.history.scipy_parser",
+    "emoji": "semantic_release.history.emoji_parser",
+    "gitmoji": "semantic_release.history.gitmoji_parser",
+}
+
+
+def stages() -> List[Tuple[str, Callable[[], object]]]:
+    """The benchmarked functions, the log functions read the whole history."""
+    version = get_last_version()
+    changelog = generate_changelog(None)
+    return [
+        ("get_commit_log", lambda: sum(1 for _ in get_commit_log())),
+        ("evaluate_version_bump", lambda: evaluate_version_bump(version or "0.0.0")),
+        ("generate_changelog", lambda: generate_changelog(None)),
+        # get_commits raises on messages the parser does not recognise, the emoji parser accepts any message
+        ("get_commits", with_parser("emoji", lambda: get_commits(None))),
+        ("get_last_version", lambda: get_last_version()),
+        ("get_previous_version", lambda: get_previous_version(version or "0.0.0")),
+        ("markdown_changelog", lambda: markdown_changelog("owner", "repo", "2.0.0", changelog, version)),
+    ]
+
+
+def with_parser(name: str, func: Callable[[], object]) -> Callable[[], object]:
+    def run():
+        configured = config.get("commit_parser")
+        config["commit_parser"] = PARSERS[name]
+        try:
+            return func()
+        finally:
+            config["commit_parser"] = configured
+
+    return run
+
+
+def reset():
+    # Run each stage from scratch, the tag index would otherwise be built once
+    vcs_helpers._tag_index = None
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        reset()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    reset()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time": min(times), "peak": peak}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> bool:
+    """Print the change of each stage relative to the baseline, return False if a stage got slower."""
+    ok = True
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["time"] / baseline[name]["time"]
+        regression = ratio > 1 + tolerance
+        ok = ok and not regression
+        print(f"{name:<24} {ratio:>7.2f}x time {result['peak'] / max(baseline[name]['peak'], 1):>7.2f}x peak", end="")
+        print("  REGRESSION" if regression else "")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--commits", type=int, default=10000, help="number of commits, release commits excluded")
+    parser.add_argument("--tags", type=int, default=20, help="number of tagged releases")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="weights such as angular=4,scipy=1")
+    parser.add_argument("--parser", choices=PARSERS, default="angular", help="configured commit parser")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage, the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown when comparing, 0.2 is 20%%")
+    parser.add_argument("--prefilter", action="store_true", help="enable the commit_log_prefilter setting")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        path = build_repository(Path(directory) / "repo", args.commits, args.tags, args.mix, args.seed)
+        print(f"Built {args.commits} commits and {args.tags} tags in {time.perf_counter() - start:.2f}s")
+
+        vcs_helpers.repo = Repo(path)
+        config["commit_parser"] = PARSERS[args.parser]
+        config["commit_log_prefilter"] = args.prefilter
+        results = {}
+        print(f"{'stage':<24} {'time (s)':>10} {'peak (KiB)':>12}")
+        for name, func in stages():
+            results[name] = measure(func, args.repeat)
+            print(f"{name:<24} {results[name]['time']:>10.4f} {results[name]['peak'] / 1024:>12.1f}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+    if args.compare:
+        return 0 if compare(results, json.loads(args.compare.read_text()), args.tolerance) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Throwaway git repositories with synthetic commit histories.
+
+The history is written with a single `git fast-import`, so repositories with hundreds of thousands of commits are
+created in seconds. Commit messages are drawn from a weighted mix of the bundled commit styles, and release commits
+are tagged the way semantic-release tags them.
+"""
+import random
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Tuple
+
+from semantic_release.history.parser_gitmoji.data import gitmojis
+
+ANGULAR_TYPES = ["feat", "fix", "docs", "perf", "refactor", "style", "test", "chore", "ci", "build"]
+SCIPY_TAGS = ["API", "BUG", "DEP", "DOC", "ENH", "MAINT", "REV", "STY", "TST", "FEAT", "BLD"]
+EMOJIS = [":boom:", ":sparkles:", ":bug:", ":ambulance:", ":lock:", ":zap:", ":memo:", ":art:"]
+GITMOJIS = [gitmoji["emoji"] for gitmoji in gitmojis]
+
+DEFAULT_MIX = {"angular": 4, "scipy": 1, "emoji": 1, "gitmoji": 1}
+START_TIME = 1_600_000_000
+
+
+def paragraphs(rng: random.Random) -> List[str]:
+    return [
+        " ".join(f"word{rng.randrange(1000)}" for _ in range(rng.randrange(5, 20))) for _ in range(rng.randrange(3))
+    ]
+
+
+def angular_message(rng: random.Random) -> str:
+    scope = f"(module{rng.randrange(30)})" if rng.random() < 0.7 else ""
+    body = paragraphs(rng)
+    if rng.random() < 0.02:
+        body.append("BREAKING CHANGE: the public interface changed")
+    return "\n\n".join([f"{rng.choice(ANGULAR_TYPES)}{scope}: change number {rng.randrange(10**6)}", *body])
+
+
+def scipy_message(rng: random.Random) -> str:
+    return "\n\n".join([f"{rng.choice(SCIPY_TAGS)}: change number {rng.randrange(10**6)}", *paragraphs(rng)])
+
+
+def emoji_message(rng: random.Random) -> str:
+    return "\n\n".join([f"{rng.choice(EMOJIS)} change number {rng.randrange(10**6)}", *paragraphs(rng)])
+
+
+def gitmoji_message(rng: random.Random) -> str:
+    return "\n\n".join([f"{rng.choice(GITMOJIS)} change number {rng.randrange(10**6)}", *paragraphs(rng)])
+
+
+MESSAGE_STYLES: Dict[str, Callable[[random.Random], str]] = {
+    "angular": angular_message,
+    "scipy": scipy_message,
+    "emoji": emoji_message,
+    "gitmoji": gitmoji_message,
+}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse a message mix such as "angular=4,scipy=1"."""
+    mix = {}
+    for item in value.split(","):
+        style, _, weight = item.partition("=")
+        if style.strip() not in MESSAGE_STYLES:
+            raise ValueError(f"Unknown commit style {style!r}, expected one of {', '.join(MESSAGE_STYLES)}")
+        mix[style.strip()] = int(weight or 1)
+    return mix
+
+
+def synthetic_history(
+    commits: int, tags: int, mix: Mapping[str, int] = DEFAULT_MIX, seed: int = 0
+) -> Iterator[Tuple[str, str]]:
+    """Yield (message, tag) pairs from the oldest commit to the newest, tag is empty for untagged commits.
+
+    `tags` release commits are spread evenly over the `commits` other commits, with versions 1.0.0, 1.1.0, ...
+    """
+    rng = random.Random(seed)
+    styles = [MESSAGE_STYLES[style] for style in mix]
+    weights = list(mix.values())
+    release_every = commits // (tags + 1) if tags else 0
+    version = 0
+    for index in range(1, commits + 1):
+        yield rng.choices(styles, weights)[0](rng), ""
+        if release_every and index % release_every == 0 and version < tags:
+            yield f"1.{version}.0\n\nAutomatically generated by project-semantic-release", f"v1.{version}.0"
+            version += 1
+
+
+def changed_path(mark: int, packages: int) -> bytes:
+    """Path of the file changed by a commit, spread over `packages` package directories when there are any."""
+    if packages:
+        return b"packages/package%d/file%d.txt" % (mark % packages, mark % 10)
+    return b"file%d.txt" % (mark % 10)
+
+
+def fast_import_stream(history: Iterator[Tuple[str, str]], packages: int = 0) -> Iterator[bytes]:
+    def data(text: str) -> bytes:
+        encoded = text.encode()
+        return b"data %d\n%s\n" % (len(encoded), encoded)
+
+    for mark, (message, tag) in enumerate(history, start=1):
+        timestamp = START_TIME + mark * 60
+        yield b"commit refs/heads/master\nmark :%d\n" % mark
+        yield b"committer Bench <bench@example.com> %d +0000\n" % timestamp
+        yield data(message)
+        if mark > 1:
+            yield b"from :%d\n" % (mark - 1)
+        yield b"M 644 inline %s\n" % changed_path(mark, packages)
+        yield data(f"content {mark}")
+        if tag:
+            yield b"tag %s\nfrom :%d\n" % (tag.encode(), mark)
+            yield b"tagger Bench <bench@example.com> %d +0000\n" % timestamp
+            yield data(tag)
+
+
+def build_repository(
+    path: Path,
+    commits: int,
+    tags: int = 0,
+    mix: Mapping[str, int] = DEFAULT_MIX,
+    seed: int = 0,
+    packages: int = 0,
+) -> Path:
+    """Create a git repository at `path` with a synthetic history.
+
+    :param path: Directory of the new repository.
+    :param commits: Number of commits, not counting the release commits.
+    :param tags: Number of tagged release commits.
+    :param mix: Relative weight of each commit message style.
+    :param seed: Seed of the random messages, the same arguments always create the same history.
+    :param packages: Number of directories under `packages/` changed in turn by the commits, 0 for a single package.
+    :return: The repository path.
+    """
+    subprocess.run(["git", "init", "--quiet", str(path)], check=True)
+    process = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=path, stdin=subprocess.PIPE)
+    try:
+        for chunk in fast_import_stream(synthetic_history(commits, tags, mix, seed), packages):
+            process.stdin.write(chunk)  # type: ignore
+    finally:
+        process.stdin.close()  # type: ignore
+    if process.wait():
+        raise RuntimeError(f"git fast-import failed with exit code {process.returncode}")
+    subprocess.run(["git", "checkout", "--quiet", "master"], cwd=path, check=True)
+    return path
@@ -1,6 +1,6 @@
 import logging
 
-from ..helpers import LoggedFunction
+from ..helpers import LOG_MAX_LENGTH, LoggedFunction
 from ..settings import config, import_from_settings
 
 from .changelog import changelog_headers, changelog_table, changelog_template  # noqa isort:skip
@@ -11,7 +11,7 @@ __all__ = ("compare_url", "changelog_headers", "changelog_table", "changelog_tem
 logger = logging.getLogger(__name__)
 
 
-@LoggedFunction(logger)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
 def markdown_changelog(owner: str, repo_name: str, version: str, changelog: dict, previous_version: str = None) -> str:
     """Generate a markdown version of the changelog.
 
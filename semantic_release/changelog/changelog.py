@@ -7,7 +7,7 @@ from ..errors import ImproperConfigurationError
 from ..history import get_new_version
 from ..history.logs import evaluate_version_bump
 from ..hvcs import Github, Gitlab
-from ..settings import config
+from ..settings import config, get_settings
 from .compare import compare_url
 
 
@@ -24,7 +24,7 @@ def add_pr_link(owner: str, repo_name: str, message: str) -> str:
         pr_number = match.group(1)
         url = (
             f"https://{Gitlab.domain()}/{owner}/{repo_name}/-/issues/{pr_number}"
-            if config.get("hvcs") == "gitlab"
+            if get_settings(config).hvcs == "gitlab"
             else f"https://{Github.domain()}/{owner}/{repo_name}/issues/{pr_number}"
         )
 
@@ -35,7 +35,7 @@ def add_pr_link(owner: str, repo_name: str, message: str) -> str:
 
 def get_changelog_sections(changelog: dict, changelog_sections: list) -> Iterable[str]:
     """Generator which yields each changelog section to be included."""
-    included_sections = config.get("changelog_sections")
+    included_sections = get_settings(config).changelog_sections
 
     for section in included_sections:
         section = section.strip()
@@ -47,7 +47,7 @@ def get_hash_link(owner: str, repo_name: str, hash_: str) -> str:
     """Generate the link for commit hash."""
     url = (
         f"https://{Gitlab.domain()}/{owner}/{repo_name}/-/commit/{hash_}"
-        if config.get("hvcs") == "gitlab"
+        if get_settings(config).hvcs == "gitlab"
         else f"https://{Github.domain()}/{owner}/{repo_name}/commit/{hash_}"
     )
     short_hash = hash_[:7]
@@ -96,16 +96,14 @@ def changelog_template(
         import chevron
     except ImportError:
         raise ImproperConfigurationError("Install `chevron` for use 'changelog_template' component")
-    from ..vcs_helpers import get_formatted_tag, repo
+    from ..vcs_helpers import get_formatted_tag, get_version_from_tag
     from . import handlers
 
     last_release = previous_version or version
     last_git_tag = get_formatted_tag(last_release)
-    git_head_last = ""
 
     next_release = previous_version and version or None
     level_bump = ""
-    git_head_next = ""
     if not next_release:
         # Calculate the new version
         level_bump = evaluate_version_bump(version or "", config.get("force_level"))
@@ -113,16 +111,8 @@ def changelog_template(
 
     next_git_tag = get_formatted_tag(next_release)
 
-    try:
-        tag = repo.tag(last_git_tag)
-        git_head_last = tag.commit.hexsha
-    except ValueError:
-        pass
-    try:
-        tag = repo.tag(next_git_tag)
-        git_head_next = tag.commit.hexsha
-    except ValueError:
-        pass
+    git_head_last = get_version_from_tag(last_git_tag) or ""
+    git_head_next = get_version_from_tag(next_git_tag) or ""
 
     template_path: str = config.get("changelog_template", str(Path(__file__).parent.parent / "templates/template.tpl"))
 
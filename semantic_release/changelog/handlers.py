@@ -5,7 +5,7 @@ from semantic_release.errors import SemanticReleaseBaseError
 from semantic_release.hvcs import Github, Gitlab
 from semantic_release.vcs_helpers import get_repository_owner_and_name
 
-from ..settings import config
+from ..settings import config, get_settings
 
 
 class TextProc:
@@ -88,7 +88,7 @@ def add_pr_link_github(msg: str, pattern: Pattern, owner="", repo_name=""):
 
 @TextProc
 def add_pr_link(msg: str):
-    if config.get("hvcs") == "gitlab":
+    if get_settings(config).hvcs == "gitlab":
         return add_mr_link_gitlab(msg)
     return add_pr_link_github(msg)
 
@@ -197,7 +197,7 @@ else:
         hash_ = render(msg)
         url = (
             f"https://{Gitlab.domain()}/{owner}/{repo_name}/-/commit/{hash_}"
-            if config.get("hvcs") == "gitlab"
+            if get_settings(config).hvcs == "gitlab"
             else f"https://{Github.domain()}/{owner}/{repo_name}/commit/{hash_}"
         )
         return url
@@ -10,35 +10,40 @@ import click_log
 from semantic_release import ci_checks
 from semantic_release.errors import GitError, ImproperConfigurationError
 
-from .changelog import markdown_changelog
-from .dist import build_dists, remove_dists, should_build, should_remove_dist
-from .history import (
-    evaluate_version_bump,
-    get_current_version,
-    get_new_version,
-    get_previous_version,
-    set_new_version,
-)
-from .hvcs import (
-    check_build_status,
-    check_token,
-    get_domain,
-    get_token,
-    post_changelog,
-    post_pull_request,
-    upload_to_release,
-)
-from .repository import ArtifactRepo
-from .settings import config, import_from_settings, overload_configuration
-from .vcs_helpers import (
-    checkout,
-    commit_new_version,
-    get_current_head_hash,
-    get_repository_owner_and_name,
-    push_new_version,
-    tag_new_version,
-    update_changelog_file,
-)
+from .context import with_release_context
+from .helpers import LazyImport
+from .pipeline import Step, run_steps
+from .settings import config, get_settings, import_from_settings, overload_configuration
+
+# The commands are imported when they are first used, so each command only loads the modules it needs
+# (print-version does not need twine, requests or python-gitlab)
+markdown_changelog = LazyImport("semantic_release.changelog", "markdown_changelog")
+build_dists = LazyImport("semantic_release.dist", "build_dists")
+remove_dists = LazyImport("semantic_release.dist", "remove_dists")
+should_build = LazyImport("semantic_release.dist", "should_build")
+should_remove_dist = LazyImport("semantic_release.dist", "should_remove_dist")
+evaluate_version_bump = LazyImport("semantic_release.history", "evaluate_version_bump")
+get_current_version = LazyImport("semantic_release.history", "get_current_version")
+get_new_version = LazyImport("semantic_release.history", "get_new_version")
+get_previous_version = LazyImport("semantic_release.history", "get_previous_version")
+set_new_version = LazyImport("semantic_release.history", "set_new_version")
+analyze_packages = LazyImport("semantic_release.history.packages", "analyze_packages")
+get_packages = LazyImport("semantic_release.history.packages", "get_packages")
+check_build_status = LazyImport("semantic_release.hvcs", "check_build_status")
+check_token = LazyImport("semantic_release.hvcs", "check_token")
+get_domain = LazyImport("semantic_release.hvcs", "get_domain")
+get_token = LazyImport("semantic_release.hvcs", "get_token")
+post_changelog = LazyImport("semantic_release.hvcs", "post_changelog")
+post_pull_request = LazyImport("semantic_release.hvcs", "post_pull_request")
+upload_to_release = LazyImport("semantic_release.hvcs", "upload_to_release")
+ArtifactRepo = LazyImport("semantic_release.repository", "ArtifactRepo")
+checkout = LazyImport("semantic_release.vcs_helpers", "checkout")
+commit_new_version = LazyImport("semantic_release.vcs_helpers", "commit_new_version")
+get_current_head_hash = LazyImport("semantic_release.vcs_helpers", "get_current_head_hash")
+get_repository_owner_and_name = LazyImport("semantic_release.vcs_helpers", "get_repository_owner_and_name")
+push_new_version = LazyImport("semantic_release.vcs_helpers", "push_new_version")
+tag_new_version = LazyImport("semantic_release.vcs_helpers", "tag_new_version")
+update_changelog_file = LazyImport("semantic_release.vcs_helpers", "update_changelog_file")
 
 logger = logging.getLogger("semantic_release")
 sys.path.append(os.getcwd())
@@ -82,6 +87,7 @@ def common_options(func):
     return func
 
 
+@with_release_context
 def print_version(*, current=False, force_level=None, **_):
     """Print the current or new version to standard output."""
     try:
@@ -104,6 +110,21 @@ def print_version(*, current=False, force_level=None, **_):
     return False
 
 
+@with_release_context
+def print_packages(**_):
+    """Print the name, current version and new version of each package of the `packages` setting."""
+    packages = get_packages()
+    if not packages:
+        print("No package is declared in the packages setting.", file=sys.stderr)
+        return False
+
+    releases = analyze_packages(packages)
+    for release in releases.values():
+        print(release.package.name, release.current_version, release.new_version)
+    return any(release.bump for release in releases.values())
+
+
+@with_release_context
 def version(*, retry=False, noop=False, force_level=None, **_):
     """Detect the new version according to git log and semver.
 
@@ -172,6 +193,7 @@ def bump_version(new_version, level_bump):
     logger.info(f"Bumping with a {level_bump} version to {new_version}")
 
 
+@with_release_context
 def changelog(*, unreleased=False, noop=False, post=False, **_):
     """Generate the changelog since the last release.
 
@@ -209,6 +231,8 @@ def changelog(*, unreleased=False, noop=False, post=False, **_):
             logger.error("Missing token: cannot post changelog to HVCS")
 
 
+# The bump and the changelog read the same commits
+@with_release_context(replay_commits=True)
 def publish(retry: bool = False, noop: bool = False, **kwargs):
     """Run the version task, then push to git and upload to an artifact repository / GitHub Releases."""
     current_version = get_current_version()
@@ -252,50 +276,69 @@ def publish(retry: bool = False, noop: bool = False, **kwargs):
         if not retry:
             update_changelog_file(new_version, changelog_md)
             bump_version(new_version, level_bump)
-        # A new version was released
-        logger.info("Pushing new version")
-        push_new_version(
-            auth_token=get_token(),
-            owner=owner,
-            name=name,
-            branch=branch,
-            domain=get_domain(),
-        )
 
         # Get config options for uploads
         dist_path = config.get("dist_path")
         upload_release = config.get("upload_to_release")
 
-        if should_build():
-            # We need to run the command to build wheels for releasing
-            logger.info("Building distributions")
-            if should_remove_dist():
-                # Remove old distributions before building
-                remove_dists(dist_path)
-            build_dists()
-
-        if ArtifactRepo.upload_enabled():
-            logger.info("Uploading to artifact Repository")
-            ArtifactRepo(Path(dist_path)).upload(noop=noop, verbose=verbose, skip_existing=retry)
-
-        if check_token():
-            # Update changelog on HVCS
-            logger.info("Posting changelog to HVCS")
-            try:
-                post_changelog(owner, name, new_version, changelog_md)
-            except GitError:
-                logger.error("Posting changelog failed")
-        else:
-            logger.warning("Missing token: cannot post changelog to HVCS")
+        def push():
+            # A new version was released
+            logger.info("Pushing new version")
+            push_new_version(
+                auth_token=get_token(),
+                owner=owner,
+                name=name,
+                branch=branch,
+                domain=get_domain(),
+            )
 
-        # Upload to GitHub Releases
-        if upload_release:
+        def build():
+            if should_build():
+                # We need to run the command to build wheels for releasing
+                logger.info("Building distributions")
+                if should_remove_dist():
+                    # Remove old distributions before building
+                    remove_dists(dist_path)
+                build_dists()
+
+        def upload_to_repository():
+            if ArtifactRepo.upload_enabled():
+                logger.info("Uploading to artifact Repository")
+                ArtifactRepo(Path(dist_path)).upload(noop=noop, verbose=verbose, skip_existing=retry)
+
+        def post_release():
             if check_token():
-                logger.info("Uploading to HVCS release")
-                upload_to_release(owner, name, new_version, dist_path)
-                logger.info("Upload to HVCS is complete")
+                # Update changelog on HVCS
+                logger.info("Posting changelog to HVCS")
+                try:
+                    post_changelog(owner, name, new_version, changelog_md)
+                except GitError:
+                    logger.error("Posting changelog failed")
             else:
-                logger.warning("Missing token: cannot upload to HVCS")
+                logger.warning("Missing token: cannot post changelog to HVCS")
+
+        def upload_release_assets():
+            # Upload to GitHub Releases
+            if upload_release:
+                if check_token():
+                    logger.info("Uploading to HVCS release")
+                    upload_to_release(owner, name, new_version, dist_path)
+                    logger.info("Upload to HVCS is complete")
+                else:
+                    logger.warning("Missing token: cannot upload to HVCS")
+
+        # Nothing is published before the push succeeds, as an upload to the artifact repository cannot be undone. The
+        # release is posted once the tag is pushed, and its assets are uploaded once it exists
+        run_steps(
+            [
+                Step("push", push, []),
+                Step("build", build, []),
+                Step("upload to repository", upload_to_repository, ["build", "push"]),
+                Step("post changelog", post_release, ["push"]),
+                Step("upload to release", upload_release_assets, ["build", "post changelog"]),
+            ],
+            workers=get_settings(config).publish_concurrency,
+        )
 
         # Remove distribution files as they are no longer needed
         if should_remove_dist():
@@ -307,6 +350,7 @@ def publish(retry: bool = False, noop: bool = False, **kwargs):
     # else: Since version shows a message on failure, we do not need to print another.
 
 
+@with_release_context
 def merge_request(
     title: str = "",
     commit_prefix: str = "",
@@ -444,6 +488,16 @@ def cmd_print_version(**kwargs):
         exit(1)
 
 
+@main.command(name="print-packages", help=print_packages.__doc__)
+@common_options
+def cmd_print_packages(**kwargs):
+    try:
+        return print_packages(**kwargs)
+    except Exception as error:
+        print(filter_output_for_secrets(str(error)), file=sys.stderr)
+        exit(1)
+
+
 @main.command(name="merge_request", help=merge_request.__doc__)
 @click.option(
     "--source-branch",
@@ -0,0 +1,134 @@
+"""Release context.
+
+While a release context is active, the parsed commits and the results of the log functions are memoized, and the
+commit walks too when the context replays commits. A command which needs the bump level, the changelog and the commit
+list then walks and parses the commit range once. The memo is cleared whenever the history changes (a new commit or
+tag) or another commit is checked out.
+"""
+import copy
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+_active_context: Optional["ReleaseContext"] = None
+
+
+class ReplayableIterator:
+    """Iterable over an iterator which reads each item of the underlying iterator once.
+
+    Items are kept as they are read, so iterating again replays them before reading further. This lets a consumer stop
+    early, and another one continue from where the first one stopped.
+    """
+
+    def __init__(self, iterator: Iterator):
+        self.iterator = iterator
+        self.items: List[Any] = []
+        self.exhausted = False
+
+    def __iter__(self):
+        index = 0
+        while True:
+            if index < len(self.items):
+                yield self.items[index]
+                index += 1
+                continue
+            if self.exhausted:
+                return
+            try:
+                item = next(self.iterator)
+            except StopIteration:
+                self.exhausted = True
+                return
+            self.items.append(item)
+
+    def close(self):
+        """Close the underlying iterator, i.e. stop a git process which was not read until the end."""
+        close = getattr(self.iterator, "close", None)
+        if close:
+            close()
+        self.exhausted = True
+
+
+class ReleaseContext:
+    """Memo shared by the functions which walk and parse the commit log during a release.
+
+    Use it as a context manager, contexts can be nested and the innermost one is used.
+
+    :param replay_commits: Keep the commits read by each walk, so another walk of the same range replays them instead
+        of running git again. The commits are kept until the context is cleared, so only commands which read a range
+        several times enable it, the others stream the log in constant memory.
+    """
+
+    def __init__(self, replay_commits: bool = False):
+        self.replay_commits = replay_commits
+        self.memo: Dict[Hashable, Any] = {}
+        self.previous: Optional[ReleaseContext] = None
+
+    def __enter__(self) -> "ReleaseContext":
+        global _active_context
+        self.previous, _active_context = _active_context, self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active_context
+        self.clear()
+        _active_context = self.previous
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get the memoized value for the key, creating it with `factory` on first use."""
+        try:
+            return self.memo[key]
+        except KeyError:
+            value = self.memo[key] = factory()
+            return value
+
+    def clear(self):
+        """Forget every memoized value."""
+        for value in self.memo.values():
+            if isinstance(value, ReplayableIterator):
+                value.close()
+        self.memo.clear()
+
+
+def get_release_context() -> Optional[ReleaseContext]:
+    """Return the active release context, if any."""
+    return _active_context
+
+
+def invalidate_release_context():
+    """Clear the active release context, to be called when the history changes."""
+    if _active_context is not None:
+        _active_context.clear()
+
+
+def with_release_context(func=None, *, replay_commits: bool = False):
+    """Decorator which runs the function inside a new `ReleaseContext`.
+
+    :param replay_commits: See `ReleaseContext`.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with ReleaseContext(replay_commits):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator if func is None else decorator(func)
+
+
+def memoized(func):
+    """Decorator which memoizes the result of a function while a `ReleaseContext` is active.
+
+    A copy of the result is returned, since changelog components modify the changelog they receive.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        context = get_release_context()
+        if context is None:
+            return func(*args, **kwargs)
+        key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+        return copy.deepcopy(context.get(key, lambda: func(*args, **kwargs)))
+
+    return wrapper
@@ -1,66 +1,135 @@
+import contextlib
 import functools
 import importlib
-from typing import Union
-
-from requests import Session
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterator, Optional, Union
 
 from .errors import ImproperConfigurationError
 
+if TYPE_CHECKING:  # pragma: no cover
+    from requests import Session
+    from requests.packages.urllib3.util.retry import Retry
+
+# Length of the arguments and results logged by the functions which receive commit messages or changelogs
+LOG_MAX_LENGTH = 200
 
-def format_arg(value):
+
+def format_arg(value, max_length: Optional[int] = None):
     if type(value) == str:
-        return f"'{value.strip()}'"
+        return truncate(f"'{value.strip()}'", max_length)
     else:
-        return str(value)
+        return truncate(str(value), max_length)
+
 
+def truncate(text: str, max_length: Optional[int] = None) -> str:
+    if max_length is None or len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}...<{len(text)} chars>"
 
-def build_requests_session(raise_for_status=True, retry: Union[bool, int, Retry] = True) -> Session:
+
+def build_requests_session(
+    raise_for_status=True, retry: Union[bool, int, "Retry"] = True, pool_maxsize: Optional[int] = None
+) -> "Session":
     """Create a requests session.
 
     :param raise_for_status: If True, a hook to invoke raise_for_status be installed
     :param retry: If true, it will use default Retry configuration. if an integer, it will use default Retry
     configuration with given integer as total retry count. if Retry instance, it will use this instance.
+    :param pool_maxsize: Number of connections kept alive per host, the requests default if None
     :return: configured requests Session
     """
+    # requests is imported here, so the commands which do not use the network do not load it
+    from requests import Session
+    from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+    from requests.packages.urllib3.util.retry import Retry
+
     session = Session()
     if raise_for_status:
         session.hooks = {"response": [lambda r, *args, **kwargs: r.raise_for_status()]}
-    if retry:
+    if retry or pool_maxsize:
         if isinstance(retry, bool):
-            retry = Retry()
+            # Without retries the adapter is only mounted for the pool size
+            retry = Retry() if retry else 0
         elif isinstance(retry, int):
             retry = Retry(retry)
         elif not isinstance(retry, Retry):
             raise ValueError("retry should be a bool, int or Retry instance.")
-        adapter = HTTPAdapter(max_retries=retry)
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize or DEFAULT_POOLSIZE)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
     return session
 
 
+@contextlib.contextmanager
+def atomic_write(path: Path, mode: str = "wb") -> Iterator[IO]:
+    """Open a temporary file for writing, which replaces `path` once the block completes.
+
+    Readers see either the previous or the new content, and nothing is changed if the block raises. The file mode of
+    `path` is kept.
+
+    :param path: The file to replace.
+    :param mode: "wb", or "w" to write text like `Path.write_text`.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
 class LoggedFunction:
     """Decorator which adds debug logging to a function.
 
     The input arguments are logged before the function is called, and the
-    return value is logged once it has completed.
+    return value is logged once it has completed. Nothing is formatted unless
+    the logger is enabled for debug messages.
+
+    Functions on a hot path, such as the commit parsers which are called for
+    every commit, are not wrapped at all if `hot_path_logging` is False. It
+    defaults to the SEMANTIC_RELEASE_HOT_PATH_LOGGING environment variable and
+    must be set before the decorated modules are imported.
 
     :param logger: Logger to send output to.
+    :param max_length: Truncate each formatted argument and the result to this length, None to log them whole.
+    :param hot: Whether the function is on a hot path.
     """
 
-    def __init__(self, logger):
+    hot_path_logging = os.environ.get("SEMANTIC_RELEASE_HOT_PATH_LOGGING", "true").lower() not in ("0", "false", "no")
+
+    def __init__(self, logger, max_length: Optional[int] = None, hot: bool = False):
         self.logger = logger
+        self.max_length = max_length
+        self.hot = hot
 
     def __call__(self, func):
+        if self.hot and not LoggedFunction.hot_path_logging:
+            return func
+
+        logger = self.logger
+        max_length = self.max_length
+
         @functools.wraps(func)
         def logged_func(*args, **kwargs):
+            if not logger.isEnabledFor(logging.DEBUG):
+                return func(*args, **kwargs)
+
             # Log function name and arguments
-            self.logger.debug(
+            logger.debug(
                 "{function}({args}{kwargs})".format(
                     function=func.__name__,
-                    args=", ".join([format_arg(x) for x in args]),
-                    kwargs="".join([f", {k}={format_arg(v)}" for k, v in kwargs.items()]),
+                    args=", ".join([format_arg(x, max_length) for x in args]),
+                    kwargs="".join([f", {k}={format_arg(v, max_length)}" for k, v in kwargs.items()]),
                 )
             )
 
@@ -69,12 +138,40 @@ class LoggedFunction:
 
             # Log result
             if result is not None:
-                self.logger.debug(f"{func.__name__} -> {result}")
+                logger.debug(f"{func.__name__} -> {truncate(str(result), max_length)}")
             return result
 
         return logged_func
 
 
+class LazyImport:
+    """Stand-in for an attribute of a module, the module is only imported when the attribute is first used.
+
+    Calling it calls the attribute and other attributes are read from it, so it can replace an imported function or
+    class, and be patched like one in tests. The attribute is looked up on each use, so patching or reloading the
+    module is seen as well.
+
+    :param module: Dotted path of the module.
+    :param name: Name of the attribute in the module.
+    """
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.name = name
+
+    def resolve(self) -> Any:
+        return getattr(importlib.import_module(self.module), self.name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self.module}.{self.name}>"
+
+
 def import_path(path):
     try:
         parts = path.split(".")
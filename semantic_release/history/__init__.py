@@ -1,19 +1,26 @@
 """History."""
 import csv
+import itertools
 import logging
 import re
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import semver
 import tomlkit
 from dotty_dict import Dotty
 
 from ..errors import ImproperConfigurationError
-from ..helpers import LoggedFunction
+from ..helpers import LoggedFunction, atomic_write
 from ..settings import config
-from ..vcs_helpers import get_commit_log, get_formatted_tag, get_last_version
+from ..vcs_helpers import (
+    describe_previous_version,
+    get_formatted_tag,
+    get_last_version,
+    get_release_commit_log,
+    get_tag_index,
+)
 from .logs import evaluate_version_bump  # noqa
 
 from .parser_angular import parse_commit_message as angular_parser  # noqa isort:skip
@@ -22,8 +29,19 @@ from .parser_scipy import parse_commit_message as scipy_parser  # noqa isort:ski
 from .parser_tag import parse_commit_message as tag_parser  # noqa isort:skip
 from .parser_gitmoji import gitmoji_parser  # noqa isort:skip
 
+try:
+    import tomllib  # type: ignore
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib  # type: ignore
+    except ImportError:
+        tomllib = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
+# Read-only TOML documents, reused while the file is not modified
+_toml_documents: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+
 
 class VersionDeclaration(ABC):
     def __init__(self, path: Union[str, Path]):
@@ -51,7 +69,6 @@ class VersionDeclaration(ABC):
         pattern = pattern.format(version=PatternVersionDeclaration.version_regex)
         return PatternVersionDeclaration(path, pattern)
 
-    @abstractmethod
     def parse(self) -> Set[str]:
         """Return the versions.
 
@@ -59,8 +76,8 @@ class VersionDeclaration(ABC):
         only be one element in this set (i.e. even if the version is specified in multiple places, it should be the same
         version in each place), but it falls on the caller to check for this condition.
         """
+        return self.parse_content(self.path.read_text())
 
-    @abstractmethod
     def replace(self, new_version: str):
         """Update the versions.
 
@@ -69,6 +86,40 @@ class VersionDeclaration(ABC):
 
         :param new_version: The new version number as a string
         """
+        content = self.path.read_text()
+        new_content = self.replace_content(content, new_version)
+        if new_content != content:
+            self.path.write_text(new_content)
+
+    @abstractmethod
+    def parse_content(self, content: str) -> Set[str]:
+        """Return the versions found in the content of the file, see `parse`."""
+
+    @abstractmethod
+    def replace_content(self, content: str, new_version: str) -> str:
+        """Return the content of the file with the versions replaced, see `replace`."""
+
+
+def loads_toml(content: str) -> Any:
+    """Parse a TOML document which is only read, with tomllib (or tomli) when available as it is faster than tomlkit."""
+    return tomllib.loads(content) if tomllib else tomlkit.loads(content)
+
+
+def load_toml(path: Path, content: Optional[str] = None) -> Any:
+    """Return the read-only TOML document of a file, it is parsed again only once the file is modified.
+
+    :param path: The TOML file
+    :param content: The content of the file if it was already read
+    """
+    key = path.absolute()
+    stat = path.stat()
+    modified = (stat.st_mtime_ns, stat.st_size)
+    cached = _toml_documents.get(key)
+    if cached and cached[0] == modified:
+        return cached[1]
+    document = loads_toml(path.read_text() if content is None else content)
+    _toml_documents[key] = (modified, document)
+    return document
 
 
 class TomlVersionDeclaration(VersionDeclaration):
@@ -76,21 +127,36 @@ class TomlVersionDeclaration(VersionDeclaration):
         super().__init__(path)
         self.key = key
 
-    def _read(self) -> Dotty:
-        toml_doc = tomlkit.loads(self.path.read_text())
-        return Dotty(toml_doc)
-
     def parse(self) -> Set[str]:
-        _config = self._read()
+        return self.parse_document(load_toml(self.path))
+
+    def parse_content(self, content: str) -> Set[str]:
+        return self.parse_document(loads_toml(content))
+
+    def parse_document(self, document: Any) -> Set[str]:
+        _config = Dotty(document)
         if self.key in _config:
             return {_config.get(self.key)}
         return set()
 
-    def replace(self, new_version: str) -> None:
-        _config = self._read()
-        if self.key in _config:
-            _config[self.key] = new_version
-            self.path.write_text(tomlkit.dumps(_config))
+    def replace_content(self, content: str, new_version: str) -> str:
+        return self.replace_keys(content, [self], new_version)
+
+    @staticmethod
+    def replace_keys(content: str, declarations: List["TomlVersionDeclaration"], new_version: str) -> str:
+        """Update the keys of several declarations of the same file, with a single parse and a single dump.
+
+        :param content: The content of the file
+        :param declarations: The declarations of the file
+        :param new_version: The new version number as a string
+        """
+        _config = Dotty(tomlkit.loads(content))
+        keys = [declaration.key for declaration in declarations if declaration.key in _config]
+        if not keys:
+            return content
+        for key in keys:
+            _config[key] = new_version
+        return tomlkit.dumps(_config)
 
 
 class PatternVersionDeclaration(VersionDeclaration):
@@ -108,47 +174,88 @@ class PatternVersionDeclaration(VersionDeclaration):
     def __init__(self, path: str, pattern: str):
         super().__init__(path)
         self.pattern = pattern
+        self.regex = re.compile(pattern, re.MULTILINE)
 
-    def parse(self) -> Set[str]:
+    def parse_content(self, content: str) -> Set[str]:
         """Return the versions matching this pattern.
 
         Because a pattern can match in multiple places, this method returns a set of matches.  Generally, there should
         only be one element in this set (i.e. even if the version is specified in multiple places, it should be the same
         version in each place), but it falls on the caller to check for this condition.
         """
-        content = self.path.read_text()
-
-        versions = {m.group(1) for m in re.finditer(self.pattern, content, re.MULTILINE)}
+        versions = {m.group(1) for m in self.regex.finditer(content)}
 
         logger.debug(
             f"Parsing current version: path={self.path!r} pattern={self.pattern!r} num_matches={len(versions)}"
         )
         return versions
 
-    def replace(self, new_version: str):
-        """Update the versions matching this pattern.
-
-        This method reads the underlying file, replaces each occurrence of the
-        matched pattern, then writes the updated file.
+    def replace_content(self, content: str, new_version: str) -> str:
+        """Replace the versions matching this pattern.
 
+        :param content: The content of the file
         :param new_version: The new version number as a string
         """
-        n = 0
-        old_content = self.path.read_text()
 
         def swap_version(m):
-            nonlocal n
-            n += 1
             s = m.string
             i, j = m.span()
             ii, jj = m.span(1)
             return s[i:ii] + new_version + s[jj:j]
 
-        new_content = re.sub(self.pattern, swap_version, old_content, flags=re.MULTILINE)
+        new_content, n = self.regex.subn(swap_version, content)
 
         logger.debug(f"Writing new version number: path={self.path!r} pattern={self.pattern!r} num_matches={n!r}")
 
-        self.path.write_text(new_content)
+        return new_content
+
+
+def group_by_path(declarations: List[VersionDeclaration]) -> Dict[Path, List[VersionDeclaration]]:
+    """Group the declarations by file, keeping their order."""
+    groups: Dict[Path, List[VersionDeclaration]] = {}
+    for declaration in declarations:
+        groups.setdefault(declaration.path, []).append(declaration)
+    return groups
+
+
+def parse_versions(declarations: List[VersionDeclaration]) -> Set[str]:
+    """Return the versions found by the declarations, each file is read once.
+
+    TOML documents are parsed with a read-only parser and kept until the file is modified.
+    """
+    versions: Set[str] = set()
+    for path, group in group_by_path(declarations).items():
+        is_toml = [isinstance(declaration, TomlVersionDeclaration) for declaration in group]
+        # A file which only has TOML declarations is not read while its document is cached
+        content = None if all(is_toml) else path.read_text()
+        for declaration, toml in zip(group, is_toml):
+            if toml:
+                versions.update(declaration.parse_document(load_toml(path, content)))  # type: ignore
+            else:
+                versions.update(declaration.parse_content(content))  # type: ignore
+    return versions
+
+
+def replace_versions(declarations: List[VersionDeclaration], new_version: str):
+    """Update the versions of the declarations, each file is read once and replaced atomically once.
+
+    The declarations of a file are applied one after another in their order, as if each one updated the file. TOML
+    documents are parsed and dumped once for the consecutive TOML declarations of a file.
+    """
+    for path, group in group_by_path(declarations).items():
+        content = new_content = path.read_text()
+        # The consecutive TOML declarations of a file are updated together
+        for is_toml, consecutive in itertools.groupby(group, lambda x: isinstance(x, TomlVersionDeclaration)):
+            batch = list(consecutive)
+            if is_toml:
+                new_content = TomlVersionDeclaration.replace_keys(new_content, batch, new_version)  # type: ignore
+                continue
+            for declaration in batch:
+                new_content = declaration.replace_content(new_content, new_version)
+        if new_content != content:
+            with atomic_write(path, "w") as file:
+                file.write(new_content)
+            _toml_documents.pop(path.absolute(), None)
 
 
 @LoggedFunction(logger)
@@ -173,8 +280,7 @@ def get_current_version_by_config_file() -> str:
     :raises ImproperConfigurationError: if either no versions are found, or
     multiple versions are found.
     """
-    declarations = load_version_declarations()
-    versions = set.union(*[x.parse() for x in declarations])
+    versions = parse_versions(load_version_declarations())
 
     if len(versions) == 0:
         raise ImproperConfigurationError("no versions found in the configured locations")
@@ -216,11 +322,19 @@ def get_new_version(current_version: str, level_bump: str) -> str:
 def get_previous_version(version: str) -> Optional[str]:
     """Return the version prior to the given version.
 
+    The nearest release tag reachable from the parent of the version's tag is used first, then the highest tagged
+    version lower than the given version. The messages of the release commits are only scanned when no release is
+    tagged.
+
     :param version: A string with the version number.
     :return: A string with the previous version number.
     """
+    previous_version = describe_previous_version(version) or get_tag_index().previous_version(version)
+    if previous_version:
+        return previous_version
+
     found_version = False
-    for commit_hash, commit_message in get_commit_log():
+    for commit_hash, commit_message in get_release_commit_log():
         logger.debug(f"Checking commit {commit_hash}")
         if version in commit_message:
             found_version = True
@@ -243,10 +357,7 @@ def set_new_version(new_version: str) -> bool:
     :param new_version: The new version number as a string.
     :return: `True` if it succeeded.
     """
-
-    for declaration in load_version_declarations():
-        declaration.replace(new_version)
-
+    replace_versions(load_version_declarations(), new_version)
     return True
 
 
@@ -0,0 +1,215 @@
+"""Persistent cache of parsed commits.
+
+A commit message never changes, so the result of parsing it only depends on the commit parser and its settings. The
+cache maps a commit sha to the serialized `ParsedCommit` and is stored under the git directory. It is discarded as a
+whole whenever the parser or one of its settings changes.
+"""
+import collections
+import hashlib
+import itertools
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..context import get_release_context
+from ..errors import UnknownCommitMessageStyleError
+from ..settings import config
+from .parser_helpers import BatchParser, ParsedCommit
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "semantic-release"
+CACHE_FILE = "parsed-commits.json"
+
+# Settings read by the bundled parsers, in addition to every `parser_*` setting
+PARSER_SETTINGS = ("major_emoji", "minor_emoji", "patch_emoji", "minor_tag", "fix_tag")
+
+_caches: Dict[str, "ParsedCommitCache"] = {}
+
+
+def parser_identity(commit_parser: Callable[[str], ParsedCommit]) -> str:
+    """Return the dotted path of the given commit parser."""
+    return f"{commit_parser.__module__}.{commit_parser.__qualname__}"
+
+
+def parser_settings() -> Dict[str, Any]:
+    """Return every setting which can change the result of a commit parser."""
+    settings = {key: config.get(key) for key in PARSER_SETTINGS}
+    settings.update(
+        {key.lower(): value for key, value in config.as_dict().items() if key.lower().startswith("parser_")}
+    )
+    return settings
+
+
+def parser_settings_hash(commit_parser: Callable[[str], ParsedCommit]) -> str:
+    """Hash the parser identity together with every setting which can change its result.
+
+    :param commit_parser: The configured commit parser.
+    :return: A hex digest used to invalidate the cache.
+    """
+    payload = json.dumps([parser_identity(commit_parser), parser_settings()], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ParsedCommitCache:
+    """Parse commits through `commit_parser`, reusing the results stored for already known commit shas.
+
+    Commits which cannot be parsed are stored as well, so `UnknownCommitMessageStyleError` is raised again without
+    running the parser.
+
+    :param commit_parser: The configured commit parser.
+    :param path: Path of the cache file, if None nothing is read or stored.
+    :param memoize: Keep parsed commits in memory, defaults to True when a path is given.
+    """
+
+    def __init__(
+        self, commit_parser: Callable[[str], ParsedCommit], path: Optional[Path] = None, memoize: Optional[bool] = None
+    ):
+        self.commit_parser = commit_parser
+        self.path = path
+        self.memoize = bool(path) if memoize is None else memoize
+        self.key = parser_settings_hash(commit_parser) if path else ""
+        self.commits: Dict[str, Optional[List]] = {}
+        self.dirty = False
+        self.batch_parser = BatchParser(commit_parser)
+        if path:
+            self.load()
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text())  # type: ignore
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("key") != self.key:
+            logger.debug(f"Parser or parser settings changed, discarding {self.path}")
+            self.dirty = True
+            return
+        self.commits = data.get("commits", {})
+        logger.debug(f"Loaded {len(self.commits)} parsed commits from {self.path}")
+
+    def save(self):
+        if not (self.path and self.dirty):
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"key": self.key, "commits": self.commits}))
+        except OSError as error:
+            logger.warning(f"Unable to save parsed commit cache {self.path}: {error}")
+            return
+        self.dirty = False
+
+    def parse(self, sha: str, message: str) -> ParsedCommit:
+        """Parse a commit message, using the cached result for this sha when available.
+
+        :param sha: The commit sha.
+        :param message: The commit message.
+        :raises UnknownCommitMessageStyleError: if the parser does not recognise the message
+        """
+        parsed = self.parse_or_none(sha, message)
+        if parsed is None:
+            raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
+        return parsed
+
+    def parse_or_none(self, sha: str, message: str) -> Optional[ParsedCommit]:
+        """Parse a commit message through the batch API of the parser, returning None if it is not recognised.
+
+        :param sha: The commit sha.
+        :param message: The commit message.
+        """
+        if not self.memoize:
+            return self.batch_parser.parse(message)
+        try:
+            cached = self.commits[sha]
+        except KeyError:
+            pass
+        else:
+            return None if cached is None else ParsedCommit(*cached)
+
+        self.dirty = True
+        parsed = self.batch_parser.parse(message)
+        self.commits[sha] = None if parsed is None else list(parsed)
+        return parsed
+
+    def parse_batch(
+        self, commits: Iterable[Tuple[str, str]], workers: int = 0, chunk_size: int = 1
+    ) -> Iterator[Tuple[str, str, Optional[ParsedCommit]]]:
+        """Parse (sha, message) pairs, yielding (sha, message, parsed commit or None) for each of them in order.
+
+        Without workers commits are parsed one at a time as they are read. Otherwise the commits which are not cached
+        are sent to a process pool in chunks, so the input is read ahead by a few chunks.
+
+        :param commits: The (sha, message) pairs to parse.
+        :param workers: Number of worker processes, 0 or 1 to parse in this process.
+        :param chunk_size: Number of commits sent at once to a worker.
+        """
+        if workers < 2:
+            for sha, message in commits:
+                yield sha, message, self.parse_or_none(sha, message)
+            return
+
+        # Imported here, so the pool machinery is only loaded when it is used
+        from .parallel import ParserPool
+
+        commits = iter(commits)
+        pending: Deque[Tuple[List[Tuple[str, str, bool]], Any]] = collections.deque()
+        with ParserPool(self.commit_parser, workers) as pool:
+            while True:
+                chunk = [
+                    (sha, message, not (self.memoize and sha in self.commits))
+                    for sha, message in itertools.islice(commits, chunk_size)
+                ]
+                if chunk:
+                    missing = [message for _, message, is_missing in chunk if is_missing]
+                    pending.append((chunk, pool.submit(missing) if missing else None))
+                # Keep every worker busy while the results are read in order
+                while pending and (not chunk or len(pending) > workers):
+                    yield from self._collect(*pending.popleft())
+                if not chunk:
+                    return
+
+    def _collect(self, chunk: List[Tuple[str, str, bool]], future) -> Iterator[Tuple[str, str, Optional[ParsedCommit]]]:
+        results = iter(future.result() if future else ())
+        for sha, message, is_missing in chunk:
+            if not is_missing:
+                cached = self.commits[sha]
+                yield sha, message, None if cached is None else ParsedCommit(*cached)
+                continue
+            parsed = next(results)
+            if self.memoize:
+                self.dirty = True
+                self.commits[sha] = None if parsed is None else list(parsed)
+            yield sha, message, parsed
+
+
+def get_cache_path() -> Optional[Path]:
+    """Return the cache file path inside the git directory, or None if there is no repository."""
+    from .. import vcs_helpers
+
+    repo = vcs_helpers.get_repo()
+    if repo is None:
+        return None
+    return Path(repo.git_dir) / CACHE_DIR / CACHE_FILE
+
+
+def get_parsed_commit_cache(commit_parser: Callable[[str], ParsedCommit]) -> ParsedCommitCache:
+    """Get the parsed commit cache for the given parser.
+
+    The cache is only persisted if the `commit_parser_cache` setting is enabled. Caches are shared within the process,
+    so several walks over the same commits read the cache file once. Otherwise parsed commits are only kept in memory
+    while a `ReleaseContext` is active.
+
+    :param commit_parser: The configured commit parser.
+    """
+    path = get_cache_path() if config.get("commit_parser_cache") else None
+    if not path:
+        context = get_release_context()
+        if context is None:
+            return ParsedCommitCache(commit_parser)
+        # Without a cache file, parsed commits are still shared during the release
+        return context.get(("parsed_commits", commit_parser), lambda: ParsedCommitCache(commit_parser, memoize=True))
+
+    cache = _caches.get(str(path))
+    if cache is None or cache.commit_parser is not commit_parser or cache.key != parser_settings_hash(commit_parser):
+        cache = _caches[str(path)] = ParsedCommitCache(commit_parser, path)
+    return cache
@@ -1,12 +1,15 @@
 """Logs."""
+import collections
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from ..context import memoized
 from ..errors import UnknownCommitMessageStyleError
-from ..helpers import LoggedFunction
-from ..settings import config, import_from_settings
+from ..helpers import LOG_MAX_LENGTH, LoggedFunction
+from ..settings import SettingsSnapshot, as_bool, config, get_settings, import_from_settings
 from ..vcs_helpers import get_commit_log, get_commits_beetwen
-from .parser_helpers import ParsedCommit
+from .cache import get_parsed_commit_cache
+from .parser_helpers import ParsedCommit, ere_escape, get_grep_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,21 @@ LEVELS = {
     2: "minor",
     3: "major",
 }
+MAJOR_LEVEL = 3
+
+
+# Result of the version bump analysis:
+# - bump: "major", "minor", "patch" or None
+# - commit_count: number of commits read since the last release, without the ones git filtered out
+# - sha: the commit which decided the bump level, None if no commit did
+# - exhaustive: False if the analysis stopped before the last release because the bump could not change anymore
+VersionBump = collections.namedtuple("VersionBump", ["bump", "commit_count", "sha", "exhaustive"])
+
+
+def get_parse_options() -> Dict[str, int]:
+    """Worker processes options of `ParsedCommitCache.parse_batch`, read from the settings."""
+    settings = get_settings(config)
+    return {"workers": settings.parse_workers, "chunk_size": settings.parse_chunk_size}
 
 
 @LoggedFunction(logger)
@@ -27,53 +45,136 @@ def evaluate_version_bump(current_version: str, force: str = None) -> Optional[s
     :return: A string with either major, minor or patch if there should be a release.
              If no release is necessary, None will be returned.
     """
-    if force:
-        return force
+    return analyze_version_bump(current_version, force).bump
 
-    bump = None
 
-    changes = []
+@LoggedFunction(logger)
+@memoized
+def analyze_version_bump(current_version: str, force: Optional[str] = None, exhaustive: bool = False) -> VersionBump:
+    """Read git log since the last release to decide the bump level, together with how it was decided.
+
+    Once a major change is found the bump level cannot change anymore, so the rest of the log is neither read nor
+    parsed, unless `exhaustive` is set to count every commit since the last release.
+
+    :param current_version: A string with the current version number.
+    :param force: A string with the bump level that should be forced.
+    :param exhaustive: Read the whole log since the last release, even when the bump level is already known.
+    :return: A `VersionBump` with the bump level, the number of commits read and the deciding commit.
+    """
+    if force:
+        return VersionBump(force, 0, None, False)
+
+    level = None
+    sha = None
+    first_sha = None
     commit_count = 0
+    completed = True
     commit_parser = import_from_settings("commit_parser")
-    for _, commit_message in get_commit_log(current_version):
-        if commit_message.startswith(current_version):
-            # Stop once we reach the current version
-            # (we are looping in the order of newest -> oldest)
-            logger.debug(f'"{commit_message}" is commit for {current_version}, breaking loop')
-            break
-
-        commit_count += 1  # noqa: SIM113
-
-        # Attempt to parse this commit using the currently-configured parser
-        try:
-            message = commit_parser(commit_message)
-            changes.append(message.bump)
-        except UnknownCommitMessageStyleError as err:
-            logger.debug(f"Ignoring UnknownCommitMessageStyleError: {err}")
-            pass
-
+    cache = get_parsed_commit_cache(commit_parser)
+    grep = get_grep_patterns(commit_parser, current_version)
+
+    def commits_since_release():
+        nonlocal completed
+        for _hash, commit_message in get_commit_log(current_version, grep):
+            if commit_message.startswith(current_version):
+                # Stop once we reach the current version
+                # (we are looping in the order of newest -> oldest)
+                logger.debug(f'"{commit_message}" is commit for {current_version}, breaking loop')
+                return
+
+            if level is not None and level >= MAJOR_LEVEL and not exhaustive:
+                # Nothing can raise the bump level anymore
+                logger.debug(f"Bump level decided by {sha}, skipping the rest of the log")
+                completed = False
+                return
+            yield _hash, commit_message
+
+    # Commits are parsed one at a time as they are read, so the log is not read past the stop conditions.
+    # Worker processes read ahead, they are only used when the whole log is read anyway.
+    options = get_parse_options() if exhaustive else {}
+    for _hash, _, message in cache.parse_batch(commits_since_release(), **options):
+        commit_count += 1
+        first_sha = first_sha or _hash
+
+        if message is None:
+            logger.debug(f"Ignoring commit {_hash} with an unknown commit message style")
+            continue
+        # Keep the largest required bump level from the commits we parsed
+        if level is None or message.bump > level:
+            level = message.bump
+            sha = _hash
+
+    cache.save()
     logger.debug(f"Commits found since last release: {commit_count}")
 
-    if changes:
-        # Select the largest required bump level from the commits we parsed
-        level = max(changes)
-        if level in LEVELS:
-            bump = LEVELS[level]
-        else:
-            logger.warning(f"Unknown bump level {level}")
+    bump = level_to_bump(level)
+    if bump is None:
+        sha = None
+        if grep and get_settings(config).patch_without_tag:
+            # The commits git filtered out still count for patch_without_tag
+            first_sha = get_newest_commit(current_version)
+    adjusted_bump = apply_bump_settings(bump, first_sha is not None, current_version)
+    if bump is None and adjusted_bump is not None:
+        # patch_without_tag, the newest commit decides
+        sha = first_sha
+
+    return VersionBump(adjusted_bump, commit_count, sha, completed)
+
+
+def get_grep_patterns(commit_parser: Callable[[str], ParsedCommit], *versions: Optional[str]) -> Tuple[str, ...]:
+    """Get the patterns git pre-filters the log with, so the messages the parser cannot recognise are not read.
 
-    if config.get("patch_without_tag") and commit_count > 0 and bump is None:
+    The versions are matched as well, so the release commits the log functions stop at are still listed.
+
+    :param commit_parser: The configured commit parser.
+    :param versions: The versions looked for in the commit messages.
+    :return: No pattern if the `commit_log_prefilter` setting is disabled or the parser declares none.
+    """
+    if not as_bool(config.get("commit_log_prefilter"), False):
+        return ()
+    pattern = get_grep_pattern(commit_parser)
+    if not pattern:
+        return ()
+    return (pattern, *(ere_escape(version) for version in versions if version))
+
+
+def get_newest_commit(current_version: str) -> Optional[str]:
+    """Get the sha of the newest commit since the release of the given version, None if there is none."""
+    for _hash, commit_message in get_commit_log(current_version):
+        return None if commit_message.startswith(current_version) else _hash
+    return None
+
+
+def level_to_bump(level: Optional[int]) -> Optional[str]:
+    """Return the bump matching the highest level of the parsed commits, None if no release is needed."""
+    if level is None:
+        return None
+    if level not in LEVELS:
+        logger.warning(f"Unknown bump level {level}")
+        return None
+    return LEVELS[level]
+
+
+def apply_bump_settings(bump: Optional[str], has_commits: bool, current_version: str) -> Optional[str]:
+    """Adjust a bump with the `patch_without_tag` and `major_on_zero` settings.
+
+    :param bump: The bump decided by the commits.
+    :param has_commits: Whether there is any commit since the last release.
+    :param current_version: The version being bumped.
+    """
+    settings = get_settings(config)
+    if settings.patch_without_tag and has_commits and bump is None:
         bump = "patch"
         logger.debug("Changing bump level to patch based on config patch_without_tag")
 
-    if not config.get("major_on_zero") and current_version.startswith("0.") and bump == "major":
+    if not settings.major_on_zero and current_version.startswith("0.") and bump == "major":
         bump = "minor"
         logger.debug("Changing bump level to minor based on config major_on_zero")
-
     return bump
 
 
-@LoggedFunction(logger)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
+@memoized
 def generate_changelog(from_version: str, to_version: str = None) -> dict:
     """Parse a changelog dictionary for the given version.
 
@@ -90,65 +191,86 @@ def generate_changelog(from_version: str, to_version: str = None) -> dict:
         rev = from_version
 
     commit_parser = import_from_settings("commit_parser")
-
-    found_the_release = to_version is None
-    for _hash, commit_message in get_commit_log(rev):
-        if not found_the_release:
-            # Skip until we find the last commit in this release
-            # (we are looping in the order of newest -> oldest)
-            if to_version and to_version not in commit_message:
-                continue
-            else:
-                logger.debug(f"Reached the start of {to_version}, beginning changelog generation")
-                found_the_release = True
-
-        if from_version is not None and from_version in commit_message:
-            # We reached the previous release
-            logger.debug(f"{from_version} reached, ending changelog generation")
-            break
-
-        try:
-            message = commit_parser(commit_message)
-            if message.type not in changes:
-                logger.debug(f"Creating new changelog section for {message.type} ")
-                changes[message.type] = []
-
-            # Capitalize the first letter of the message, leaving others as they were
-            # (using str.capitalize() would make the other letters lowercase)
-            formatted_message = message.descriptions[0][0].upper() + message.descriptions[0][1:]
-            if config.get("changelog_capitalize") is False:
-                formatted_message = message.descriptions[0]
-
-            # By default, feat(x): description shows up in changelog with the
-            # scope bolded, like:
-            #
-            # * **x**: description
-            if config.get("changelog_scope") and message.scope:
-                formatted_message = f"**{message.scope}:** {formatted_message}"
-
-            changes[message.type].append((_hash, formatted_message))
-
-            if message.breaking_descriptions:
-                # Copy breaking change descriptions into changelog
-                for paragraph in message.breaking_descriptions:
-                    changes["breaking"].append((_hash, paragraph))
-            elif message.bump == 3:
-                # Major, but no breaking descriptions, use commit subject instead
-                changes["breaking"].append((_hash, message.descriptions[0]))
-
-        except UnknownCommitMessageStyleError as err:
-            logger.debug(f"Ignoring UnknownCommitMessageStyleError: {err}")
-
+    cache = get_parsed_commit_cache(commit_parser)
+    settings = get_settings(config)
+    grep = get_grep_patterns(commit_parser, from_version, to_version)
+
+    def commits_in_release():
+        found_the_release = to_version is None
+        for _hash, commit_message in get_commit_log(rev, grep):
+            if not found_the_release:
+                # Skip until we find the last commit in this release
+                # (we are looping in the order of newest -> oldest)
+                if to_version and to_version not in commit_message:
+                    continue
+                else:
+                    logger.debug(f"Reached the start of {to_version}, beginning changelog generation")
+                    found_the_release = True
+
+            if from_version is not None and from_version in commit_message:
+                # We reached the previous release
+                logger.debug(f"{from_version} reached, ending changelog generation")
+                return
+            yield _hash, commit_message
+
+    for _hash, _, message in cache.parse_batch(commits_in_release(), **get_parse_options()):
+        if message is None:
+            logger.debug(f"Ignoring commit {_hash} with an unknown commit message style")
+            continue
+        add_changelog_entry(changes, _hash, message, settings)
+
+    cache.save()
     return changes
 
 
-@LoggedFunction(logger)
+def add_changelog_entry(changes: dict, _hash: str, message: ParsedCommit, settings: SettingsSnapshot):
+    """Add a parsed commit to its section of a changelog dict, and to the breaking changes if it has any.
+
+    :param changes: The changelog dict, with at least a "breaking" section.
+    :param _hash: The commit hash.
+    :param message: The parsed commit message.
+    :param settings: The settings snapshot.
+    """
+    if message.type not in changes:
+        logger.debug(f"Creating new changelog section for {message.type} ")
+        changes[message.type] = []
+
+    # Capitalize the first letter of the message, leaving others as they were
+    # (using str.capitalize() would make the other letters lowercase)
+    formatted_message = message.descriptions[0][0].upper() + message.descriptions[0][1:]
+    if not settings.changelog_capitalize:
+        formatted_message = message.descriptions[0]
+
+    # By default, feat(x): description shows up in changelog with the
+    # scope bolded, like:
+    #
+    # * **x**: description
+    if settings.changelog_scope and message.scope:
+        formatted_message = f"**{message.scope}:** {formatted_message}"
+
+    changes[message.type].append((_hash, formatted_message))
+
+    if message.breaking_descriptions:
+        # Copy breaking change descriptions into changelog
+        for paragraph in message.breaking_descriptions:
+            changes["breaking"].append((_hash, paragraph))
+    elif message.bump == 3:
+        # Major, but no breaking descriptions, use commit subject instead
+        changes["breaking"].append((_hash, message.descriptions[0]))
+
+
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
+@memoized
 def get_commits(from_version: str, to_version: str = None, rev: str = None) -> List[Dict[str, Any]]:
     results = []
     commit_parser: Callable[[str], ParsedCommit] = import_from_settings("commit_parser")
+    cache = get_parsed_commit_cache(commit_parser)
 
-    for commit in get_commits_beetwen(from_version, to_version, rev):
-        message: ParsedCommit = commit_parser(commit.message)
+    commits = list(get_commits_beetwen(from_version, to_version, rev))
+    parsed_commits = cache.parse_batch(((commit.hexsha, commit.message) for commit in commits), **get_parse_options())
+    for commit, (_, _, message) in zip(commits, parsed_commits):
+        if message is None:
+            raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {commit.message}")
         results.append(
             {
                 "commit": {
@@ -177,4 +299,5 @@ def get_commits(from_version: str, to_version: str = None, rev: str = None) -> L
                 "scope": message.scope,
             }
         )
+    cache.save()
     return results
@@ -0,0 +1,168 @@
+"""Versioning of several packages released from one repository.
+
+Packages are declared with the `packages` setting, as `name=path` entries where the path is relative to the root of
+the repository. Each package is released with its own tags, formatted with `package_tag_format`. The history is read
+once: the paths changed by each commit route it to the package with the longest matching path, and the commits of
+every package since its last release are parsed in the same pass.
+"""
+import collections
+import logging
+import re
+from pathlib import PurePosixPath
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..errors import ImproperConfigurationError
+from ..helpers import LOG_MAX_LENGTH, LoggedFunction
+from ..settings import as_tuple, config, get_settings, import_from_settings
+from ..vcs_helpers import get_tag_index, iter_commit_paths, re_version
+from .cache import get_parsed_commit_cache
+from .logs import add_changelog_entry, apply_bump_settings, get_parse_options, level_to_bump
+
+logger = logging.getLogger(__name__)
+
+Package = collections.namedtuple("Package", ["name", "path"])
+
+# Result of the analysis of a package:
+# - package: the `Package`
+# - current_version: the version of its last release tag, 0.0.0 if it was never released
+# - bump: "major", "minor", "patch" or None
+# - new_version: the version to release, the current version if no release is needed
+# - commit_count: number of commits changing the package since its last release
+# - changelog: a changelog dict, as returned by `generate_changelog`
+PackageRelease = collections.namedtuple(
+    "PackageRelease", ["package", "current_version", "bump", "new_version", "commit_count", "changelog"]
+)
+
+
+class PathTrie:
+    """Map paths to the package with the longest matching path prefix, one path component per node."""
+
+    def __init__(self):
+        self.children: Dict[str, "PathTrie"] = {}
+        self.package: Optional[str] = None
+
+    def add(self, prefix: str, package: str):
+        """Add a package, an empty prefix or "." matches every path."""
+        node = self
+        for part in PurePosixPath(prefix).parts:
+            node = node.children.setdefault(part, PathTrie())
+        node.package = package
+
+    def match(self, path: str) -> Optional[str]:
+        """Get the package of the longest prefix of the path, or None if no prefix matches."""
+        node = self
+        package = self.package
+        for part in path.split("/"):
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            if node.package is not None:
+                package = node.package
+        return package
+
+
+def get_packages() -> List[Package]:
+    """Read the packages from the `packages` setting.
+
+    :raises ImproperConfigurationError: if an entry is not `name=path` or a name is used twice
+    """
+    packages: List[Package] = []
+    for entry in as_tuple(config.get("packages")):
+        name, separator, path = entry.partition("=")
+        name, path = name.strip(), path.strip()
+        if not (separator and name):
+            raise ImproperConfigurationError(f"Package {entry!r} must be declared as name=path")
+        if any(package.name == name for package in packages):
+            raise ImproperConfigurationError(f"Package {name!r} is declared twice")
+        packages.append(Package(name, path))
+    return packages
+
+
+def get_package_tag(package: str, version: str) -> str:
+    """Get the tag of a package version, formatted with the `package_tag_format` setting."""
+    return config.get("package_tag_format").format(package=package, version=version)
+
+
+def get_package_version(package: str) -> str:
+    """Find the version of the most recently created tag of a package.
+
+    :return: The version, or 0.0.0 if the package has no tag.
+    """
+    prefix, _, suffix = get_package_tag(package, "\0").partition("\0")
+    pattern = re.compile(f"{re.escape(prefix)}({re_version.pattern}){re.escape(suffix)}")
+    for name, _, _ in get_tag_index().tags:
+        match = pattern.fullmatch(name)
+        if match:
+            return match.group(1)
+    logger.debug(f"No tag found for {package}, returning default of 0.0.0")
+    return "0.0.0"
+
+
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
+def analyze_packages(packages: List[Package]) -> Dict[str, PackageRelease]:
+    """Decide the bump and build the changelog of each package from a single walk over the history.
+
+    The walk stops for a package at the commit tagged with its current version and ends once it has stopped for every
+    package. Each commit is parsed once, whatever the number of packages it changes.
+
+    :param packages: The packages, see `get_packages`.
+    :return: The `PackageRelease` of each package, by name.
+    """
+    # Imported here, as the history package imports its submodules
+    from . import get_new_version
+
+    trie = PathTrie()
+    for package in packages:
+        trie.add(package.path, package.name)
+    current_versions = {package.name: get_package_version(package.name) for package in packages}
+    release_commits: Dict[str, List[str]] = collections.defaultdict(list)
+    for name, version in current_versions.items():
+        sha = get_tag_index().sha(get_package_tag(name, version))
+        if sha:
+            release_commits[sha].append(name)
+
+    active = set(current_versions)
+    routes: Dict[str, Set[str]] = {}
+
+    def routed_commits() -> Iterator[Tuple[str, str]]:
+        for sha, message, paths in iter_commit_paths():
+            active.difference_update(release_commits.get(sha, ()))
+            if not active:
+                logger.debug(f"Reached the last release of every package at {sha}")
+                return
+            names = {trie.match(path) for path in paths} & active
+            if names:
+                routes[sha] = names  # type: ignore
+                yield sha, message
+
+    levels: Dict[str, int] = {}
+    commit_counts: Dict[str, int] = collections.Counter()
+    changelogs: Dict[str, dict] = {name: {"breaking": []} for name in current_versions}
+    settings = get_settings(config)
+    cache = get_parsed_commit_cache(import_from_settings("commit_parser"))
+    for sha, _, message in cache.parse_batch(routed_commits(), **get_parse_options()):
+        for name in routes.pop(sha):
+            commit_counts[name] += 1
+            if message is None:
+                logger.debug(f"Ignoring commit {sha} with an unknown commit message style")
+                continue
+            levels[name] = max(levels.get(name, message.bump), message.bump)
+            add_changelog_entry(changelogs[name], sha, message, settings)
+    cache.save()
+
+    releases = {}
+    for package in packages:
+        current_version = current_versions[package.name]
+        bump = apply_bump_settings(
+            level_to_bump(levels.get(package.name)), commit_counts[package.name] > 0, current_version
+        )
+        releases[package.name] = PackageRelease(
+            package,
+            current_version,
+            bump,
+            get_new_version(current_version, bump),
+            commit_counts[package.name],
+            changelogs[package.name],
+        )
+    return releases
@@ -0,0 +1,57 @@
+"""Parse commit messages in worker processes.
+
+Commit parsers are pure Python, so a very long range (e.g. the first release of a repository with a long history)
+is parsed on a single core. With the `parse_workers` setting, messages are sent in chunks of `parse_chunk_size` to a
+process pool and the results are read back in the order of the chunks.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ..settings import config, invalidate_settings
+from .cache import parser_settings
+from .parser_helpers import ParsedCommit, parse_batch
+
+_worker_parser: Optional[Callable[[str], ParsedCommit]] = None
+
+
+def init_worker(commit_parser: Callable[[str], ParsedCommit], settings: Dict[str, Any]):
+    """Set up a worker process with the parser and parser settings of the main process.
+
+    Settings are copied since the worker may not inherit them, e.g. the ones given with `--define`.
+    """
+    global _worker_parser
+    for key, value in settings.items():
+        config[key] = value
+    invalidate_settings()
+    _worker_parser = commit_parser
+
+
+def parse_chunk(messages: List[str]) -> List[Optional[ParsedCommit]]:
+    """Parse a chunk of commit messages in a worker process."""
+    return list(parse_batch(_worker_parser, messages))  # type: ignore
+
+
+class ParserPool:
+    """Process pool which parses chunks of commit messages with the given parser.
+
+    Use it as a context manager, the worker processes are stopped on exit.
+
+    :param commit_parser: The configured commit parser, it must be importable by the worker processes.
+    :param workers: Number of worker processes.
+    """
+
+    def __init__(self, commit_parser: Callable[[str], ParsedCommit], workers: int):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(commit_parser, parser_settings())
+        )
+
+    def __enter__(self) -> "ParserPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.executor.shutdown()
+
+    def submit(self, messages: List[str]) -> "Future[List[Optional[ParsedCommit]]]":
+        """Parse a chunk of messages, the result has a `ParsedCommit` or None for each message."""
+        return self.executor.submit(parse_chunk, messages)
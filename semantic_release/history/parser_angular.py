@@ -4,11 +4,19 @@ https://github.com/angular/angular/blob/master/CONTRIBUTING.md#-commit-message-g
 """
 import logging
 import re
+from typing import FrozenSet, Iterable, Iterator, Optional, Tuple, Union
 
 from ..errors import ImproperConfigurationError, UnknownCommitMessageStyleError
-from ..helpers import LoggedFunction
-from ..settings import config
-from .parser_helpers import ParsedCommit, parse_paragraphs, re_breaking
+from ..helpers import LOG_MAX_LENGTH, LoggedFunction
+from ..settings import SettingsSnapshot, config, get_settings
+from .parser_helpers import (
+    ParsedCommit,
+    ere_escape,
+    parse_paragraphs,
+    re_breaking,
+    with_grep_pattern,
+    with_parse_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +30,151 @@ LONG_TYPE_NAMES = {
 
 LEVEL_BUMPS = {"no-release": 0, "patch": 1, "minor": 2, "major": 3}
 
+re_plain_type = re.compile(r"^[\w-]+$")
 
-@LoggedFunction(logger)
+_parser: Optional[Tuple[SettingsSnapshot, "AngularParser"]] = None
+
+
+class AngularParser:
+    """Angular commit parser built once from a snapshot of the settings.
+
+    :param allowed_types: Commit types accepted by the parser.
+    :param minor_types: Commit types which trigger a minor release.
+    :param patch_types: Commit types which trigger a patch release.
+    :param default_level_bump: Bump level of the other allowed types.
+    :raises ImproperConfigurationError: if the default level bump is not valid
+    """
+
+    def __init__(
+        self,
+        allowed_types: Iterable[str],
+        minor_types: Union[str, Iterable[str]],
+        patch_types: Union[str, Iterable[str]],
+        default_level_bump: str,
+    ):
+        default_level_bump = default_level_bump.lower()
+        if default_level_bump not in LEVEL_BUMPS.keys():
+            raise ImproperConfigurationError(
+                f"{default_level_bump} is not a valid option for "
+                f"parser_angular_default_level_bump.\n"
+                f"valid options are: {', '.join(LEVEL_BUMPS.keys())}"
+            )
+        allowed_types = tuple(allowed_types)
+        self.default_level_bump = LEVEL_BUMPS[default_level_bump]
+        self.minor_types = as_frozenset(minor_types)
+        self.patch_types = as_frozenset(patch_types)
+        # Types are used as regular expressions, the git pre-filter is only built for plain names
+        self.grep_pattern: Optional[str] = None
+        if all(re_plain_type.match(allowed_type) for allowed_type in allowed_types):
+            self.grep_pattern = r"^(" + "|".join(map(ere_escape, allowed_types)) + r")(\(.+\))?!?: ."
+        self.re_parser = re.compile(
+            r"(?P<type>" + "|".join(allowed_types) + ")"
+            r"(?:\((?P<scope>[^\n]+)\))?"
+            r"(?P<break>!)?: "
+            r"(?P<subject>[^\n]+)"
+            r"(:?\n\n(?P<text>.+))?",
+            re.DOTALL,
+        )
+
+    @classmethod
+    def from_config(cls, settings: SettingsSnapshot) -> "AngularParser":
+        return cls(
+            settings.parser_angular_allowed_types,
+            settings.parser_angular_minor_types,
+            settings.parser_angular_patch_types,
+            settings.parser_angular_default_level_bump,
+        )
+
+    def parse(self, message: str) -> ParsedCommit:
+        """Parse a commit message.
+
+        :raises UnknownCommitMessageStyleError: if regular expression matching fails
+        """
+        parsed = self.parse_or_none(message)
+        if parsed is None:
+            raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
+        return parsed
+
+    def parse_many(self, messages: Iterable[str]) -> Iterator[Optional[ParsedCommit]]:
+        """Parse commit messages, yielding None instead of raising for the messages which do not match."""
+        return map(self.parse_or_none, messages)
+
+    def parse_or_none(self, message: str) -> Optional[ParsedCommit]:
+        """Parse a commit message, returning None if it does not match."""
+        # Attempt to parse the commit message with a regular expression
+        parsed = self.re_parser.match(message)
+        if not parsed:
+            return None
+        parsed_break, parsed_scope, parsed_subject, parsed_text, parsed_type = parsed.group(
+            "break", "scope", "subject", "text", "type"
+        )
+
+        if parsed_text:
+            descriptions = [i.replace("\n", " ") for i in parse_paragraphs(parsed_text)]
+        else:
+            descriptions = []
+        # Insert the subject before the other paragraphs
+        descriptions.insert(0, parsed_subject)
+
+        # Look for descriptions of breaking changes
+        breaking_descriptions = [match.group(1) for match in (re_breaking.match(p) for p in descriptions[1:]) if match]
+
+        level_bump = self.default_level_bump
+        if parsed_break or breaking_descriptions:
+            level_bump = 3  # Major
+        elif parsed_type in self.minor_types:
+            level_bump = 2  # Minor
+        elif parsed_type in self.patch_types:
+            level_bump = 1  # Patch
+
+        parsed_type_long = LONG_TYPE_NAMES.get(parsed_type, parsed_type)
+        # first param is the key you're getting from the dict,
+        # second param is the default value
+        # allows only putting types with a long name in the LONG_TYPE_NAMES dict
+
+        return ParsedCommit(
+            level_bump,
+            parsed_type_long,
+            parsed_scope,
+            descriptions,
+            breaking_descriptions,
+        )
+
+
+def as_frozenset(types: Union[str, Iterable[str]]) -> FrozenSet[str]:
+    """Convert a list of types, or a comma separated string of types, to a frozenset."""
+    if isinstance(types, str):
+        types = types.split(",")
+    return frozenset(t.strip() for t in types)
+
+
+def get_parser() -> AngularParser:
+    """Get the parser for the current settings, it is only rebuilt when the settings change."""
+    global _parser
+    # loading the settings here makes it easier to mock in tests
+    settings = get_settings(config)
+    if _parser is None or _parser[0] is not settings:
+        _parser = (settings, AngularParser.from_config(settings))
+    return _parser[1]
+
+
+def parse_many(messages: Iterable[str]) -> Iterator[Optional[ParsedCommit]]:
+    """Parse commit messages according to the angular commit guidelines specification.
+
+    :param messages: Commit messages.
+    :return: A `ParsedCommit` for each message, or None if the message does not follow the specification.
+    """
+    return get_parser().parse_many(messages)
+
+
+def grep_pattern() -> Optional[str]:
+    """Get the git pre-filter matching the first line of the messages with an allowed type."""
+    return get_parser().grep_pattern
+
+
+@with_grep_pattern(grep_pattern)
+@with_parse_batch(parse_many)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH, hot=True)
 def parse_commit_message(message: str) -> ParsedCommit:
     """Parse a commit message according to the angular commit guidelines specification.
 
@@ -31,64 +182,4 @@ def parse_commit_message(message: str) -> ParsedCommit:
     :return: A tuple of (level to bump, type of change, scope of change, a tuple with descriptions)
     :raises UnknownCommitMessageStyleError: if regular expression matching fails
     """
-
-    # loading these are here to make it easier to mock in tests
-    allowed_types = config.get("parser_angular_allowed_types")
-    minor_types = config.get("parser_angular_minor_types")
-    patch_types = config.get("parser_angular_patch_types")
-    re_parser = re.compile(
-        r"(?P<type>" + "|".join(allowed_types) + ")"
-        r"(?:\((?P<scope>[^\n]+)\))?"
-        r"(?P<break>!)?: "
-        r"(?P<subject>[^\n]+)"
-        r"(:?\n\n(?P<text>.+))?",
-        re.DOTALL,
-    )
-
-    # Attempt to parse the commit message with a regular expression
-    parsed = re_parser.match(message)
-    if not parsed:
-        raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
-    parsed_break = parsed.group("break")
-    parsed_scope = parsed.group("scope")
-    parsed_subject = parsed.group("subject")
-    parsed_text = parsed.group("text")
-    parsed_type = parsed.group("type")
-
-    if parsed_text:
-        descriptions = [i.replace("\n", " ") for i in parse_paragraphs(parsed_text)]
-    else:
-        descriptions = []
-    # Insert the subject before the other paragraphs
-    descriptions.insert(0, parsed_subject)
-
-    # Look for descriptions of breaking changes
-    breaking_descriptions = [match.group(1) for match in (re_breaking.match(p) for p in descriptions[1:]) if match]
-
-    default_level_bump = config.get("parser_angular_default_level_bump").lower()
-    if default_level_bump not in LEVEL_BUMPS.keys():
-        raise ImproperConfigurationError(
-            f"{default_level_bump} is not a valid option for "
-            f"parser_angular_default_level_bump.\n"
-            f"valid options are: {', '.join(LEVEL_BUMPS.keys())}"
-        )
-    level_bump = LEVEL_BUMPS[default_level_bump]
-    if parsed_break or breaking_descriptions:
-        level_bump = 3  # Major
-    elif parsed_type in minor_types:
-        level_bump = 2  # Minor
-    elif parsed_type in patch_types:
-        level_bump = 1  # Patch
-
-    parsed_type_long = LONG_TYPE_NAMES.get(parsed_type, parsed_type)
-    # first param is the key you're getting from the dict,
-    # second param is the default value
-    # allows only putting types with a long name in the LONG_TYPE_NAMES dict
-
-    return ParsedCommit(
-        level_bump,
-        parsed_type_long,
-        parsed_scope,
-        descriptions,
-        breaking_descriptions,
-    )
+    return get_parser().parse(message)
@@ -1,58 +1,50 @@
 """Commit parser which looks for emojis to determine the type of commit."""
 import logging
+import re
+from typing import Dict, Iterable, Iterator, Optional, Pattern, Tuple
 
-from ..helpers import LoggedFunction
-from ..settings import config
-from .parser_helpers import ParsedCommit, parse_paragraphs
+from ..helpers import LOG_MAX_LENGTH, LoggedFunction
+from ..settings import SettingsSnapshot, config, get_settings
+from .parser_helpers import ParsedCommit, parse_paragraphs, with_parse_batch
 
 logger = logging.getLogger(__name__)
 
+_levels: Optional[Tuple[SettingsSnapshot, Dict[str, int], Optional[Pattern]]] = None
 
-@LoggedFunction(logger)
-def parse_commit_message(
-    message: str,
-) -> ParsedCommit:
-    """Parse a commit using an emoji in the subject line.
 
-    When multiple emojis are encountered, the one with the highest bump
-    level is used. If there are multiple emojis on the same level, the
-    we use the one listed earliest in the configuration.
+def get_emoji_levels() -> Tuple[Dict[str, int], Optional[Pattern]]:
+    """Read the emojis from the settings, they are only read again when the settings change.
 
-    If the message does not contain any known emojis, then the level to bump
-    will be 0 and the type of change "Other". This parser never raises
-    UnknownCommitMessageStyleError.
+    :return: The bump level of each emoji, from most important to least important, and a pattern matching at each
+             position of a subject the most important emoji starting there.
+    """
+    global _levels
+    settings = get_settings(config)
+    if _levels is not None and _levels[0] is settings:
+        return _levels[1], _levels[2]
 
-    Emojis are not removed from the description, and will appear alongside
-    the commit subject in the changelog.
+    levels: Dict[str, int] = {}
+    for level, emojis in ((3, settings.major_emoji), (2, settings.minor_emoji), (1, settings.patch_emoji)):
+        for emoji in emojis:
+            levels.setdefault(emoji, level)
+    # A lookahead finds overlapping matches, so an emoji contained in another one is still found
+    re_emoji = re.compile("(?=(" + "|".join(map(re.escape, levels)) + "))") if levels else None
+    _levels = (settings, levels, re_emoji)
+    return levels, re_emoji
 
-    :param message: A string of a commit message.
-    :return: A tuple of (level to bump, type of change, scope of change, a tuple with descriptions)
-    """
 
+def parse_with_emojis(message: str, levels: Dict[str, int], re_emoji: Optional[Pattern]) -> ParsedCommit:
+    """Parse a commit message with the emojis returned by `get_emoji_levels`."""
     subject = message.split("\n")[0]
 
-    major = config.get("major_emoji")
-    minor = config.get("minor_emoji")
-    patch = config.get("patch_emoji")
-    all_emojis = major + minor + patch
-
-    # Loop over emojis from most important to least important
-    # Therefore, we find the highest level emoji first
+    # The highest level emoji is the one listed first among the emojis found in the subject
     primary_emoji = "Other"
-    for emoji in all_emojis:
-        if emoji in subject:
-            primary_emoji = emoji
-            break
-    logger.debug(f"Selected {primary_emoji} as the primary emoji")
+    if re_emoji is not None:
+        found = {match.group(1) for match in re_emoji.finditer(subject)}
+        primary_emoji = next((emoji for emoji in levels if emoji in found), primary_emoji)
 
     # Find which level this commit was from
-    level_bump = 0
-    if primary_emoji in major:
-        level_bump = 3
-    elif primary_emoji in minor:
-        level_bump = 2
-    elif primary_emoji in patch:
-        level_bump = 1
+    level_bump = levels.get(primary_emoji, 0)
 
     # All emojis will remain part of the returned description
     descriptions = parse_paragraphs(message)
@@ -63,3 +55,39 @@ def parse_commit_message(
         descriptions,
         descriptions[1:] if level_bump == 3 else [],
     )
+
+
+def parse_batch(messages: Iterable[str]) -> Iterator[Optional[ParsedCommit]]:
+    """Parse commit messages using an emoji in the subject line.
+
+    The emojis are read from the settings once for the whole batch.
+    """
+    levels, re_emoji = get_emoji_levels()
+    for message in messages:
+        yield parse_with_emojis(message, levels, re_emoji)
+
+
+@with_parse_batch(parse_batch)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH, hot=True)
+def parse_commit_message(
+    message: str,
+) -> ParsedCommit:
+    """Parse a commit using an emoji in the subject line.
+
+    When multiple emojis are encountered, the one with the highest bump
+    level is used. If there are multiple emojis on the same level, the
+    we use the one listed earliest in the configuration.
+
+    If the message does not contain any known emojis, then the level to bump
+    will be 0 and the type of change "Other". This parser never raises
+    UnknownCommitMessageStyleError.
+
+    Emojis are not removed from the description, and will appear alongside
+    the commit subject in the changelog.
+
+    :param message: A string of a commit message.
+    :return: A tuple of (level to bump, type of change, scope of change, a tuple with descriptions)
+    """
+    parsed = parse_with_emojis(message, *get_emoji_levels())
+    logger.debug("Selected %s as the primary emoji", parsed.type)
+    return parsed
@@ -1,8 +1,13 @@
 """Commit parser which looks for emojis to determine the type of commit."""
 import logging
+from typing import Iterable, Iterator, Optional
 
-from semantic_release.helpers import LoggedFunction
-from semantic_release.history.parser_helpers import ParsedCommit, parse_paragraphs
+from semantic_release.helpers import LOG_MAX_LENGTH, LoggedFunction
+from semantic_release.history.parser_helpers import (
+    ParsedCommit,
+    parse_paragraphs,
+    with_parse_batch,
+)
 
 from .data import GITMOJIS_CODE_DICT, GITMOJIS_DICT, get_emoji_regexp
 
@@ -11,13 +16,8 @@ logger = logging.getLogger(__name__)
 LEVEL_BUMPS = {None: 0, "patch": 1, "minor": 2, "major": 3}
 
 
-@LoggedFunction(logger)
-def parse_commit_message(message: str) -> ParsedCommit:
-    """Parse a commit using an emoji in the subject line.
-
-    :param message: A string of a commit message.
-    :return: A tuple of (level to bump, type of change, scope of change, a tuple with descriptions)
-    """
+def parse_gitmoji(message: str) -> ParsedCommit:
+    """Parse a commit using the first gitmoji of the subject line."""
     descriptions = parse_paragraphs(message)
 
     subject = descriptions[0]
@@ -28,7 +28,6 @@ def parse_commit_message(message: str) -> ParsedCommit:
     )
     primary_emoji = primary_emoji.lower()
 
-    logger.debug(f"Selected {primary_emoji} as the primary emoji")
     # Find which level this commit was from
     emoji_info = GITMOJIS_DICT.get(primary_emoji) or GITMOJIS_CODE_DICT.get(primary_emoji)
     level_bump = 0
@@ -38,3 +37,21 @@ def parse_commit_message(message: str) -> ParsedCommit:
         code = emoji_info["code"]
 
     return ParsedCommit(level_bump, code, None, descriptions, None)
+
+
+def parse_batch(messages: Iterable[str]) -> Iterator[Optional[ParsedCommit]]:
+    """Parse commit messages using the first gitmoji of their subject line."""
+    return map(parse_gitmoji, messages)
+
+
+@with_parse_batch(parse_batch)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH, hot=True)
+def parse_commit_message(message: str) -> ParsedCommit:
+    """Parse a commit using an emoji in the subject line.
+
+    :param message: A string of a commit message.
+    :return: A tuple of (level to bump, type of change, scope of change, a tuple with descriptions)
+    """
+    parsed = parse_gitmoji(message)
+    logger.debug("Selected %s as the primary emoji", parsed.type or "other")
+    return parsed
@@ -1,9 +1,14 @@
 """Commit parser helpers."""
 import collections
+import contextlib
 import re
-from typing import List
+from typing import Callable, Deque, Iterable, Iterator, List, Optional
+
+from ..errors import UnknownCommitMessageStyleError
 
 re_breaking = re.compile("BREAKING[ -]CHANGE: ?(.*)")
+# Special characters of POSIX extended regular expressions, escaping any other character is undefined
+re_ere_special = re.compile(r"[\\.\[()*+?{|^$]")
 
 
 ParsedCommit = collections.namedtuple(
@@ -18,3 +23,98 @@ def parse_paragraphs(text: str) -> List[str]:
     :return: A list of paragraphs.
     """
     return [paragraph for paragraph in text.split("\n\n") if paragraph]
+
+
+def with_parse_batch(parse_batch: Callable[[Iterable[str]], Iterator[Optional[ParsedCommit]]]):
+    """Decorator which attaches the batch API of a commit parser to its single message function.
+
+    The batch function takes an iterable of commit messages and lazily yields a `ParsedCommit` for each of them, or
+    None instead of raising `UnknownCommitMessageStyleError`.
+    """
+
+    def decorator(func):
+        func.parse_batch = parse_batch
+        return func
+
+    return decorator
+
+
+def with_grep_pattern(grep_pattern: Callable[[], Optional[str]]):
+    """Decorator which attaches a git pre-filter to a commit parser.
+
+    The function returns an extended regular expression matching a line of every message the parser may recognise,
+    or None if it cannot tell. git then lists only these commits with `--extended-regexp --grep`, the pattern may
+    match more messages than the parser does but never fewer. git may use the regex library of the system, so the
+    pattern only uses POSIX ERE syntax, without GNU or Perl extensions such as backslash character classes.
+    """
+
+    def decorator(func):
+        func.grep_pattern = grep_pattern
+        return func
+
+    return decorator
+
+
+def get_grep_pattern(commit_parser: Callable[[str], ParsedCommit]) -> Optional[str]:
+    """Get the git pre-filter declared by a commit parser, None if it has none."""
+    grep_pattern = getattr(commit_parser, "grep_pattern", None)
+    return grep_pattern() if grep_pattern is not None else None
+
+
+def ere_escape(text: str) -> str:
+    """Escape the special characters of a POSIX extended regular expression."""
+    return re_ere_special.sub(r"\\\g<0>", text)
+
+
+def parse_or_none(commit_parser: Callable[[str], ParsedCommit], message: str) -> Optional[ParsedCommit]:
+    """Parse a commit message with a single message parser, returning None if the style is not recognised."""
+    try:
+        return commit_parser(message)
+    except UnknownCommitMessageStyleError:
+        return None
+
+
+def parse_batch(
+    commit_parser: Callable[[str], ParsedCommit], messages: Iterable[str]
+) -> Iterator[Optional[ParsedCommit]]:
+    """Parse commit messages with the batch API of the parser, if it has one.
+
+    Custom parsers which only parse one message at a time are called once per message.
+
+    :param commit_parser: The configured commit parser.
+    :param messages: Commit messages.
+    :return: A `ParsedCommit` for each message, or None if the parser does not recognise the message.
+    """
+    batch = getattr(commit_parser, "parse_batch", None)
+    if batch is not None:
+        return batch(messages)
+    return (parse_or_none(commit_parser, message) for message in messages)
+
+
+class BatchParser:
+    """Feed commit messages one by one to the batch API of a commit parser.
+
+    A single batch is used for every message, but it is only given the messages fed so far, so a caller can stop after
+    any commit without the rest of the log being read or parsed.
+
+    :param commit_parser: The configured commit parser.
+    """
+
+    def __init__(self, commit_parser: Callable[[str], ParsedCommit]):
+        self.commit_parser = commit_parser
+        self.pending: Deque[str] = collections.deque()
+        self.results: Optional[Iterator[Optional[ParsedCommit]]] = None
+
+    def messages(self) -> Iterator[str]:
+        while self.pending:
+            yield self.pending.popleft()
+
+    def parse(self, message: str) -> Optional[ParsedCommit]:
+        """Parse a commit message, returning None if the parser does not recognise it."""
+        self.pending.append(message)
+        if self.results is not None:
+            # A batch which read ahead ended when no message was pending, then a new one is started
+            with contextlib.suppress(StopIteration):
+                return next(self.results)
+        self.results = parse_batch(self.commit_parser, self.messages())
+        return next(self.results)
@@ -36,10 +36,11 @@ Supported Changelog Sections::
 
 import logging
 import re
+from typing import Iterable, Iterator, Optional
 
 from ..errors import UnknownCommitMessageStyleError
-from ..helpers import LoggedFunction
-from .parser_helpers import ParsedCommit
+from ..helpers import LOG_MAX_LENGTH, LoggedFunction
+from .parser_helpers import ParsedCommit, ere_escape, with_grep_pattern, with_parse_batch
 
 logger = logging.getLogger(__name__)
 
@@ -104,50 +105,64 @@ re_parser = re.compile(
 )
 
 
-@LoggedFunction(logger)
-def parse_commit_message(message: str) -> ParsedCommit:
-    """Parse a scipy-style commit message.
+COMMIT_TYPES_BY_TAG = {c.tag: c for c in COMMIT_TYPES}
 
-    :param message: A string of a commit message.
-    :return: A tuple of (level to bump, type of change, scope of change, a tuple
-    with descriptions)
-    :raises UnknownCommitMessageStyleError: if regular expression matching fails
-    """
+# git pre-filter matching the lines `re_parser` matches at the start of a message
+GREP_PATTERN = r"^(" + "|".join(ere_escape(c.tag) for c in COMMIT_TYPES) + r")?(\(.+\))?:? ."
 
+
+def parse_or_none(message: str) -> Optional[ParsedCommit]:
+    """Parse a scipy-style commit message, returning None if regular expression matching fails."""
     parsed = re_parser.match(message)
     if not parsed:
-        raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
-
-    if parsed.group("subject"):
-        subject = parsed.group("subject")
-    else:
-        raise UnknownCommitMessageStyleError(f"The commit has no subject {message}")
+        return None
+    tag, scope, subject, text = parsed.group("tag", "scope", "subject", "text")
 
-    if parsed.group("text"):
-        blocks = parsed.group("text").split("\n\n")
-        blocks = [x for x in blocks if x != ""]
+    if text:
+        blocks = [x for x in text.split("\n\n") if x != ""]
         blocks.insert(0, subject)
     else:
         blocks = [subject]
 
-    msg_type: ChangeType
-    for msg_type in COMMIT_TYPES:
-        if msg_type.tag == parsed.group("tag"):
-            break
-    else:
-        # some commits may not have a tag, e.g. if they belong to a PR that
-        # wasn't squashed (for maintainability) ignore them
-        msg_type = Ignore("", "None")
+    # some commits may not have a tag, e.g. if they belong to a PR that
+    # wasn't squashed (for maintainability) ignore them
+    msg_type: ChangeType = COMMIT_TYPES_BY_TAG.get(tag) or Ignore("", "None")
 
     # Look for descriptions of breaking changes
     migration_instructions = [block for block in blocks if block.startswith("BREAKING CHANGE")]
-    if migration_instructions:
-        msg_type.make_breaking()
+    # The shared commit types are not modified, a breaking change only affects this commit
+    bump_level = 3 if migration_instructions else msg_type.bump_level
 
     return ParsedCommit(
-        msg_type.bump_level,
+        bump_level,
         msg_type.section,
-        parsed.group("scope"),
+        scope,
         blocks,
         migration_instructions,
     )
+
+
+def parse_batch(messages: Iterable[str]) -> Iterator[Optional[ParsedCommit]]:
+    """Parse scipy-style commit messages, yielding None for the messages which do not match."""
+    return map(parse_or_none, messages)
+
+
+def grep_pattern() -> Optional[str]:
+    return GREP_PATTERN
+
+
+@with_grep_pattern(grep_pattern)
+@with_parse_batch(parse_batch)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH, hot=True)
+def parse_commit_message(message: str) -> ParsedCommit:
+    """Parse a scipy-style commit message.
+
+    :param message: A string of a commit message.
+    :return: A tuple of (level to bump, type of change, scope of change, a tuple
+    with descriptions)
+    :raises UnknownCommitMessageStyleError: if regular expression matching fails
+    """
+    parsed = parse_or_none(message)
+    if parsed is None:
+        raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
+    return parsed
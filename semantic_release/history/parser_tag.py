@@ -1,54 +1,43 @@
 """Legacy commit parser from Python Semantic Release 1.0."""
 import logging
 import re
+from typing import Iterable, Iterator, Optional
 
 from ..errors import UnknownCommitMessageStyleError
-from ..helpers import LoggedFunction
-from ..settings import config
-from .parser_helpers import ParsedCommit, parse_paragraphs, re_breaking
+from ..helpers import LOG_MAX_LENGTH, LoggedFunction
+from ..settings import config, get_settings
+from .parser_helpers import ParsedCommit, parse_paragraphs, re_breaking, with_parse_batch
 
 logger = logging.getLogger(__name__)
 
 re_parser = re.compile(r"(?P<subject>[^\n]+)" r"(:?\n\n(?P<text>.+))?", re.DOTALL)
 
 
-@LoggedFunction(logger)
-def parse_commit_message(
-    message: str,
-) -> ParsedCommit:
-    """Parse a commit message according to the 1.0 version of project-semantic-release.
-
-    It expects a tag of some sort in the commit message and will use the rest of the first line
-    as changelog content.
-
-    :param message: A string of a commit message.
-    :raises UnknownCommitMessageStyleError: If it does not recognise the commit style
-    :return: A tuple of (level to bump, type of change, scope of change, a tuple with descriptions)
-    """
-
+def parse_with_tags(message: str, minor_tag: str, fix_tag: str) -> Optional[ParsedCommit]:
+    """Parse a commit message with the given tags, returning None if it does not recognise the commit style."""
     # Attempt to parse the commit message with a regular expression
     parsed = re_parser.match(message)
     if not parsed:
-        raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
+        return None
 
     subject = parsed.group("subject")
 
     # Check tags for minor or patch
-    if config.get("minor_tag") in message:
+    if minor_tag in message:
         level = "feature"
         level_bump = 2
         if subject:
-            subject = subject.replace(config.get("minor_tag"), "")
+            subject = subject.replace(minor_tag, "")
 
-    elif config.get("fix_tag") in message:
+    elif fix_tag in message:
         level = "fix"
         level_bump = 1
         if subject:
-            subject = subject.replace(config.get("fix_tag"), "")
+            subject = subject.replace(fix_tag, "")
 
     else:
         # We did not find any tags in the commit message
-        raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
+        return None
 
     if parsed.group("text"):
         descriptions = parse_paragraphs(parsed.group("text"))
@@ -63,3 +52,35 @@ def parse_commit_message(
         level_bump = 3
 
     return ParsedCommit(level_bump, level, None, descriptions, breaking_descriptions)
+
+
+def parse_batch(messages: Iterable[str]) -> Iterator[Optional[ParsedCommit]]:
+    """Parse commit messages, yielding None for the messages without a known tag.
+
+    The tags are read from the settings once for the whole batch.
+    """
+    settings = get_settings(config)
+    minor_tag, fix_tag = settings.minor_tag, settings.fix_tag
+    for message in messages:
+        yield parse_with_tags(message, minor_tag, fix_tag)
+
+
+@with_parse_batch(parse_batch)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH, hot=True)
+def parse_commit_message(
+    message: str,
+) -> ParsedCommit:
+    """Parse a commit message according to the 1.0 version of project-semantic-release.
+
+    It expects a tag of some sort in the commit message and will use the rest of the first line
+    as changelog content.
+
+    :param message: A string of a commit message.
+    :raises UnknownCommitMessageStyleError: If it does not recognise the commit style
+    :return: A tuple of (level to bump, type of change, scope of change, a tuple with descriptions)
+    """
+    settings = get_settings(config)
+    parsed = parse_with_tags(message, settings.minor_tag, settings.fix_tag)
+    if parsed is None:
+        raise UnknownCommitMessageStyleError(f"Unable to parse the given commit message: {message}")
+    return parsed
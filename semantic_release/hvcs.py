@@ -1,8 +1,12 @@
 """HVCS."""
+import collections
 import logging
 import mimetypes
 import os
-from typing import Optional, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlsplit
 
 from gitlab import Gitlab as GitlabObj
@@ -12,8 +16,8 @@ from requests.auth import AuthBase
 from urllib3 import Retry
 
 from .errors import ImproperConfigurationError
-from .helpers import LoggedFunction, build_requests_session
-from .settings import config
+from .helpers import LOG_MAX_LENGTH, LoggedFunction, build_requests_session
+from .settings import config, get_settings
 from .vcs_helpers import get_formatted_tag
 
 logger = logging.getLogger(__name__)
@@ -21,6 +25,90 @@ logger = logging.getLogger(__name__)
 # Add a mime type for wheels
 mimetypes.add_type("application/octet-stream", ".whl")
 
+AssetUpload = collections.namedtuple("AssetUpload", ["file", "success", "retries"])
+
+# Sessions and Gitlab clients shared by the whole process, so connections are kept alive between API calls.
+# They are used by several threads at once: the asset upload threads and the concurrent publish steps. This is safe
+# because a client is fully configured by its factory and never changed afterwards, so requests only reads the session
+# settings, while urllib3 connection pools and the cookie jar are locked. At worst two threads authenticate a new
+# Gitlab client at the same time, which only makes one more API call.
+_clients: Dict[Tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(key: Tuple, factory: Callable[[], Any]) -> Any:
+    """Return the client stored under `key`, it is created with `factory` on first use.
+
+    :param key: Everything the client depends on, such as the API url and the token
+    :param factory: Function creating the client
+    """
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = factory()
+        return _clients[key]
+
+
+def close_clients():
+    """Close the shared sessions and Gitlab clients, the next API call creates new ones."""
+    with _clients_lock:
+        for client in _clients.values():
+            getattr(client, "session", client).close()
+        _clients.clear()
+
+
+class UploadStream:
+    """Request body which streams a file instead of reading it into memory.
+
+    requests sends a body with `read` in blocks and takes the Content-Length from `len`. The position is tracked so
+    urllib3 can rewind the body before a retry. Progress and throughput are logged when debug logging is enabled.
+
+    :param fileobj: The file opened in binary mode
+    :param name: Name of the file in the log messages
+    """
+
+    # Progress is logged each time this fraction of the file has been sent
+    PROGRESS_STEP = 0.25
+
+    def __init__(self, fileobj: BinaryIO, name: str):
+        self.fileobj = fileobj
+        self.name = name
+        self.size = os.fstat(fileobj.fileno()).st_size
+        self.started: Optional[float] = None
+        self.next_progress: float = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        return iter(lambda: self.read(64 * 1024), b"")
+
+    def read(self, size: int = -1) -> bytes:
+        if self.started is None:
+            self.started = time.perf_counter()
+        chunk = self.fileobj.read(size)
+        if logger.isEnabledFor(logging.DEBUG):
+            self.log_progress(self.fileobj.tell())
+        return chunk
+
+    def tell(self) -> int:
+        return self.fileobj.tell()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        position = self.fileobj.seek(offset, whence)
+        self.next_progress = 0
+        return position
+
+    def log_progress(self, sent: int):
+        if sent < self.next_progress or not self.size:
+            return
+        elapsed = time.perf_counter() - self.started  # type: ignore
+        if sent < self.size:
+            logger.debug("Uploading %s: %d%% of %d bytes", self.name, sent * 100 // self.size, self.size)
+        else:
+            rate = self.size / elapsed / 2**20 if elapsed else float("inf")
+            logger.debug("Uploaded %s: %d bytes in %.2fs, %.1f MiB/s", self.name, self.size, elapsed, rate)
+        self.next_progress = (sent // (self.size * self.PROGRESS_STEP) + 1) * self.size * self.PROGRESS_STEP
+
 
 class Base:
     @staticmethod
@@ -146,9 +234,21 @@ class Github(Base):
 
     @staticmethod
     def session(raise_for_status=True, retry: Union[Retry, bool, int] = True) -> Session:
-        session = build_requests_session(raise_for_status=raise_for_status, retry=retry)
-        session.auth = Github.auth()
-        return session
+        """Return a keep-alive session shared by the API calls, with `hvcs_pool_size` connections per host.
+
+        A session is shared by the calls with the same arguments and token, a Retry instance gets a new session.
+        """
+
+        def build() -> Session:
+            session = build_requests_session(
+                raise_for_status=raise_for_status, retry=retry, pool_maxsize=get_settings(config).hvcs_pool_size
+            )
+            session.auth = Github.auth()
+            return session
+
+        if isinstance(retry, Retry):
+            return build()
+        return shared_client(("github", raise_for_status, retry, Github.token()), build)
 
     @staticmethod
     @LoggedFunction(logger)
@@ -172,7 +272,7 @@ class Github(Base):
             return False
 
     @classmethod
-    @LoggedFunction(logger)
+    @LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
     def create_release(cls, owner: str, repo: str, tag: str, changelog: str) -> bool:
         """Create a new release.
 
@@ -223,7 +323,7 @@ class Github(Base):
             return None
 
     @classmethod
-    @LoggedFunction(logger)
+    @LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
     def edit_release(cls, owner: str, repo: str, id: int, changelog: str) -> bool:
         """Edit a release with updated change notes.
 
@@ -247,7 +347,7 @@ class Github(Base):
             return False
 
     @classmethod
-    @LoggedFunction(logger)
+    @LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
     def post_release_changelog(cls, owner: str, repo: str, version: str, changelog: str) -> bool:
         """Post release changelog.
 
@@ -288,6 +388,16 @@ class Github(Base):
 
         :return: The status of the request
         """
+        return Github.upload_asset_with_result(owner, repo, release_id, file, label).success
+
+    @classmethod
+    def upload_asset_with_result(
+        cls, owner: str, repo: str, release_id: int, file: str, label: Optional[str] = None
+    ) -> AssetUpload:
+        """Upload an asset to an existing release, see `upload_asset`.
+
+        :return: The file, the status of the request and the number of retries made by the session
+        """
         url = f"https://uploads.github.com/repos/{owner}/{repo}/releases/{release_id}/assets"
 
         content_type = mimetypes.guess_type(file, strict=False)[0]
@@ -302,26 +412,28 @@ class Github(Base):
                     headers={
                         "Content-Type": content_type,
                     },
-                    data=fileobj.read(),
+                    data=UploadStream(fileobj, os.path.basename(file)),
                 )
 
             logger.debug(f"Asset upload on Github completed, url: {response.url}, status code: {response.status_code}")
 
-            return True
+            return AssetUpload(file, True, _retry_count(response))
         except HTTPError as e:
             logger.warning(f"Asset upload {file} on Github has failed: {e}")
-            return False
+            return AssetUpload(file, False, _retry_count(e.response))
 
     @classmethod
     def upload_dists(cls, owner: str, repo: str, version: str, path: str) -> bool:
         """Upload distributions to a release.
 
+        Files are uploaded concurrently by up to `upload_concurrency` threads.
+
         :param owner: The owner namespace of the repository
         :param repo: The repository name
         :param version: Version to upload for
         :param path: Path to the dist directory
 
-        :return: The status of the request
+        :return: The status of the request, False if one or more uploads failed
         """
 
         # Find the release corresponding to this version
@@ -331,14 +443,20 @@ class Github(Base):
             return False
 
         # Upload assets
-        one_or_more_failed = False
-        for file in os.listdir(path):
-            file_path = os.path.join(path, file)
+        files = [os.path.join(path, file) for file in sorted(os.listdir(path))]
+        uploads = upload_concurrently(
+            lambda file: Github.upload_asset_with_result(owner, repo, release_id, file), files
+        )
 
-            if not Github.upload_asset(owner, repo, release_id, file_path):
-                one_or_more_failed = True
+        failed = [upload.file for upload in uploads if not upload.success]
+        logger.debug(
+            f"Uploaded {len(files) - len(failed)} of {len(files)} assets "
+            f"with {sum(upload.retries for upload in uploads)} retries"
+        )
+        if failed:
+            logger.warning(f"Asset upload has failed for {', '.join(failed)}")
 
-        return not one_or_more_failed
+        return not failed
 
 
 class Gitlab(Base):
@@ -378,6 +496,28 @@ class Gitlab(Base):
         """
         return os.environ.get(config.get("gitlab_token_var"))
 
+    @staticmethod
+    def client(ssl_verify: bool = True, authenticate: bool = False) -> GitlabObj:
+        """Return a Gitlab client shared by the API calls, with `hvcs_pool_size` connections per host.
+
+        :param ssl_verify: Whether to verify the certificate of the Gitlab instance
+        :param authenticate: Authenticate the client unless it was already done
+        """
+        gl = shared_client(
+            ("gitlab", Gitlab.api_url(), Gitlab.token(), ssl_verify),
+            lambda: GitlabObj(
+                Gitlab.api_url(),
+                private_token=Gitlab.token(),
+                ssl_verify=ssl_verify,
+                session=build_requests_session(
+                    raise_for_status=False, retry=False, pool_maxsize=get_settings(config).hvcs_pool_size
+                ),
+            ),
+        )
+        if authenticate and gl.user is None:
+            gl.auth()
+        return gl
+
     @staticmethod
     @LoggedFunction(logger)
     def check_build_status(owner: str, repo: str, ref: str) -> bool:
@@ -389,8 +529,7 @@ class Gitlab(Base):
 
         :return: the status of the pipeline (False if a job failed)
         """
-        gl = GitlabObj(Gitlab.api_url(), private_token=Gitlab.token())
-        gl.auth()
+        gl = Gitlab.client(authenticate=True)
         jobs = gl.projects.get(owner + "/" + repo).commits.get(ref).statuses.list()
         for job in jobs:
             if job.status not in ["success", "skipped"]:
@@ -403,7 +542,7 @@ class Gitlab(Base):
         return True
 
     @classmethod
-    @LoggedFunction(logger)
+    @LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
     def post_release_changelog(cls, owner: str, repo: str, version: str, changelog: str) -> bool:
         """Post release changelog.
 
@@ -415,8 +554,7 @@ class Gitlab(Base):
         :return: The status of the request
         """
         ref = get_formatted_tag(version)
-        gl = GitlabObj(Gitlab.api_url(), private_token=Gitlab.token())
-        gl.auth()
+        gl = Gitlab.client(authenticate=True)
         try:
             logger.debug("Before release create call")
             gl.projects.get(owner + "/" + repo).releases.create(
@@ -443,7 +581,7 @@ class Gitlab(Base):
         target_branch: str,
         **kwargs,
     ) -> bool:
-        gl = GitlabObj(Gitlab.api_url(), private_token=Gitlab.token(), ssl_verify=not kwargs.get("insecure"))
+        gl = Gitlab.client(ssl_verify=not kwargs.get("insecure"))
         project_str = f"{owner}/{repo}"
         try:
             project = gl.projects.get(project_str)
@@ -493,6 +631,26 @@ class Gitlab(Base):
         return True
 
 
+def _retry_count(response) -> int:
+    """Return the number of retries the session made for a response, 0 if unknown."""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(getattr(retries, "history", ()))
+
+
+def upload_concurrently(upload, files: List[str]) -> List[AssetUpload]:
+    """Run `upload` for each file with a pool of `upload_concurrency` threads.
+
+    :param upload: Function uploading a single file and returning its `AssetUpload`
+    :param files: Paths of the files to upload
+    :return: The result of each upload, in the order of the files
+    """
+    workers = max(1, min(get_settings(config).upload_concurrency, len(files)))
+    if workers == 1:
+        return [upload(file) for file in files]
+    with ThreadPoolExecutor(workers, thread_name_prefix="upload") as executor:
+        return list(executor.map(upload, files))
+
+
 @LoggedFunction(logger)
 def get_hvcs() -> Base:
     """Get HVCS helper class.
@@ -0,0 +1,77 @@
+"""Run the steps of a command concurrently, following their dependencies.
+
+Each step is started once the steps it requires have completed, so independent steps (e.g. building the
+distributions and pushing the new version) overlap.
+"""
+import collections
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+Step = collections.namedtuple("Step", ["name", "func", "requires"])
+
+
+def check_steps(steps: List[Step]):
+    """Check that every step only requires steps listed before it, which also rules out cycles.
+
+    :raises ValueError: if a step requires an unknown or a later step
+    """
+    names: Set[str] = set()
+    for step in steps:
+        unknown = set(step.requires) - names
+        if unknown:
+            raise ValueError(
+                f"Step {step.name!r} requires {', '.join(sorted(unknown))}, which must be listed before it"
+            )
+        names.add(step.name)
+
+
+def run_step(step: Step):
+    logger.debug(f"Starting step {step.name}")
+    start = time.perf_counter()
+    step.func()
+    logger.info(f"Step {step.name} completed in {time.perf_counter() - start:.2f}s")
+
+
+def run_steps(steps: List[Step], workers: int = 1):
+    """Run the steps, each one once the steps it requires have completed.
+
+    With a single worker the steps run one after another in the order of the list. Otherwise up to `workers` steps
+    run at the same time in threads. As when they run one after another, no step is started once a step has failed:
+    the running steps are awaited and the exception of the first failed step of the list is raised.
+
+    :param steps: The steps, a step may only require the steps listed before it.
+    :param workers: Maximum number of steps run at the same time.
+    """
+    check_steps(steps)
+    if workers < 2:
+        for step in steps:
+            run_step(step)
+        return
+
+    pending = list(steps)
+    completed: Set[str] = set()
+    running: Dict[Future, Step] = {}
+    failures: Dict[int, BaseException] = {}
+    with ThreadPoolExecutor(workers, thread_name_prefix="step") as executor:
+        while True:
+            if not failures:
+                for step in [step for step in pending if completed.issuperset(step.requires)]:
+                    pending.remove(step)
+                    running[executor.submit(run_step, step)] = step
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    completed.add(step.name)
+                else:
+                    logger.debug(f"Step {step.name} failed: {error!r}")
+                    failures[steps.index(step)] = error
+    if failures:
+        raise failures[min(failures)]
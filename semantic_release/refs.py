@@ -0,0 +1,217 @@
+"""Resolve git references by reading the git directory, without running git.
+
+HEAD, branch and tag tips are read from the loose ref files and from `packed-refs`. Repositories using another ref
+storage (e.g. reftable) are not supported, `resolve_ref` returns None for them and the caller asks git instead.
+`TagRefs` looks tags up the same way and peels annotated tags without reading objects through git.
+"""
+import mmap
+import os
+import re
+import zlib
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple, Union
+
+re_sha = re.compile(r"^[0-9a-f]{40}(?:[0-9a-f]{24})?$")
+re_tag_object = re.compile(rb"^object ([0-9a-f]+)\ntype (\w+)\n")
+
+# Symbolic references are followed up to this depth, as git does
+MAX_SYMREF_DEPTH = 5
+# Tags of tags are followed up to this depth
+MAX_PEEL_DEPTH = 5
+# packed-refs files from this size on are memory-mapped instead of read
+MMAP_THRESHOLD = 1024 * 1024
+# Enough of a loose object to read its type and, for a tag, the object it points to
+OBJECT_HEADER_SIZE = 256
+TAGS_PREFIX = "refs/tags/"
+
+
+def get_common_dir(git_dir: Path) -> Path:
+    """Return the directory with the shared refs, which differs from the git directory in a linked worktree."""
+    try:
+        common_dir = (git_dir / "commondir").read_text().strip()
+    except OSError:
+        return git_dir
+    return git_dir / common_dir
+
+
+def read_packed_ref(common_dir: Path, name: str) -> Optional[str]:
+    """Return the sha of a reference in `packed-refs`, reading the file only up to it."""
+    suffix = f" {name}"
+    with suppress(OSError), (common_dir / "packed-refs").open() as packed_refs:
+        for line in packed_refs:
+            line = line.rstrip("\n")
+            # The header and the peeled sha of annotated tags never end with a reference name
+            if line.endswith(suffix) and not line.startswith(("#", "^")):
+                return line[: -len(suffix)]
+    return None
+
+
+def read_ref(git_dir: Path, common_dir: Path, name: str) -> Optional[str]:
+    """Read a loose reference, HEAD and the other pseudo refs are kept in the git directory of the worktree."""
+    path = (git_dir if "/" not in name else common_dir) / name
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def resolve_ref(git_dir: Path, name: str = "HEAD") -> Optional[str]:
+    """Return the sha a reference points to, following symbolic references such as HEAD.
+
+    :param git_dir: The git directory of the repository.
+    :param name: A full reference name, such as HEAD or refs/heads/main.
+    :return: The sha, or None if the reference does not exist or cannot be read from the files.
+    """
+    common_dir = get_common_dir(git_dir)
+    for _ in range(MAX_SYMREF_DEPTH):
+        value = read_ref(git_dir, common_dir, name)
+        if value is None:
+            value = read_packed_ref(common_dir, name)
+        if value is None:
+            return None
+        if not value.startswith("ref:"):
+            return value if re_sha.match(value) else None
+        name = value.split(":", 1)[1].strip()
+    return None
+
+
+def parse_packed_refs(data: Union[bytes, mmap.mmap], prefix: str) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Parse the references under `prefix` from the content of a packed-refs file.
+
+    When the file is sorted, only the lines of the prefix are read.
+
+    :return: The (sha, peeled sha) of each reference, the peeled sha is None if packed-refs does not record it.
+    """
+    traits: list = []
+    start = 0
+    if data[:1] == b"#":
+        start = data.find(b"\n") + 1 or len(data)
+        traits = data[:start].split()
+    # With these traits the peeled sha of every annotated tag is recorded, other refs point to their commit
+    peeled = b"peeled" in traits or b"fully-peeled" in traits
+    if b"sorted" in traits:
+        position = data.find(f" {prefix}".encode(), start)
+        if position < 0:
+            return {}
+        start = data.rfind(b"\n", 0, position) + 1
+
+    refs: Dict[str, Tuple[str, Optional[str]]] = {}
+    name = None
+    while start < len(data):
+        end = data.find(b"\n", start)
+        if end < 0:
+            end = len(data)
+        line = data[start:end].rstrip(b"\r")
+        start = end + 1
+        if line.startswith(b"^"):
+            if name is not None:
+                refs[name] = (refs[name][0], line[1:].decode())
+            continue
+        sha, _, ref = line.decode().partition(" ")
+        if not ref.startswith(prefix):
+            if name is not None and b"sorted" in traits:
+                break
+            name = None
+            continue
+        name = ref
+        refs[name] = (sha, sha if peeled else None)
+    return refs
+
+
+def read_packed_refs(common_dir: Path, prefix: str) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Read the references under `prefix` from packed-refs, memory-mapping large files."""
+    try:
+        with (common_dir / "packed-refs").open("rb") as packed_refs:
+            if os.fstat(packed_refs.fileno()).st_size < MMAP_THRESHOLD:
+                return parse_packed_refs(packed_refs.read(), prefix)
+            with mmap.mmap(packed_refs.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return parse_packed_refs(data, prefix)
+    except OSError:
+        return {}
+
+
+def read_object_header(common_dir: Path, sha: str) -> Optional[bytes]:
+    """Return the beginning of a loose object, or None if the object is packed or cannot be read."""
+    try:
+        data = (common_dir / "objects" / sha[:2] / sha[2:]).read_bytes()
+        return zlib.decompressobj().decompress(data, OBJECT_HEADER_SIZE)
+    except (OSError, zlib.error):
+        return None
+
+
+def peel_object(common_dir: Path, sha: str) -> Optional[str]:
+    """Return the commit an object points to, following tag objects.
+
+    Only loose objects are read, None is returned when an object is packed or does not point to a commit.
+    """
+    for _ in range(MAX_PEEL_DEPTH):
+        header = read_object_header(common_dir, sha)
+        if header is None:
+            return None
+        kind, _, content = header.partition(b"\0")
+        if kind.startswith(b"commit "):
+            return sha
+        match = re_tag_object.match(content) if kind.startswith(b"tag ") else None
+        if match is None:
+            return None
+        sha = match.group(1).decode()
+    return None
+
+
+class TagRefs:
+    """Tags of a repository, read from packed-refs once and from the loose ref of a tag when it is looked up.
+
+    The commit of an annotated tag is taken from the peeled sha recorded in packed-refs, or from the tag object when
+    it is a loose object, so a tag lookup usually reads no object through git.
+
+    :param refs: The (sha, peeled sha or None) of the packed tag refs.
+    :param common_dir: The directory with the shared refs and objects, if None only `refs` are used.
+    :param readable: False if the refs are not stored in files, every lookup must then ask git.
+    """
+
+    def __init__(
+        self, refs: Dict[str, Tuple[str, Optional[str]]], common_dir: Optional[Path] = None, readable: bool = True
+    ):
+        self.refs = refs
+        self.common_dir = common_dir
+        self.readable = readable
+        # Tag refs whose loose file has been read
+        self.loose: Set[str] = set()
+
+    @classmethod
+    def read(cls, git_dir: Path) -> "TagRefs":
+        common_dir = get_common_dir(git_dir)
+        if (common_dir / "reftable").is_dir():
+            return cls({}, common_dir, readable=False)
+        return cls(read_packed_refs(common_dir, TAGS_PREFIX), common_dir)
+
+    def get(self, tag_name: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Get the (sha, peeled sha or None) of a tag, or None if the tag does not exist."""
+        name = TAGS_PREFIX + tag_name
+        if self.common_dir is not None and self.readable and name not in self.loose:
+            self.loose.add(name)
+            sha = read_ref(self.common_dir, self.common_dir, name)
+            # Loose refs take precedence, as in git
+            if sha is not None and re_sha.match(sha) and sha != self.refs.get(name, (None,))[0]:
+                self.refs[name] = (sha, None)
+        return self.refs.get(name)
+
+    def __contains__(self, tag_name: str) -> bool:
+        return self.get(tag_name) is not None
+
+    def add(self, tag_name: str, commit: str):
+        """Record a tag pointing to the given commit, a new tag or a tag peeled by git."""
+        name = TAGS_PREFIX + tag_name
+        self.refs[name] = (commit, commit)
+        self.loose.add(name)
+
+    def commit(self, tag_name: str) -> Optional[str]:
+        """Get the sha of the commit a tag points to, or None if the tag is unknown or cannot be peeled here."""
+        sha, peeled = self.get(tag_name) or (None, None)
+        if sha is None or peeled is not None or self.common_dir is None:
+            return peeled
+        peeled = peel_object(self.common_dir, sha)
+        if peeled is not None:
+            self.refs[TAGS_PREFIX + tag_name] = (sha, peeled)
+        return peeled
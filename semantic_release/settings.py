@@ -1,7 +1,8 @@
 """Helpers to read settings from setup.cfg or pyproject.toml."""
 import logging
+from dataclasses import dataclass
 from functools import wraps
-from typing import Any
+from typing import Any, Optional, Tuple
 
 from dynaconf import Dynaconf
 
@@ -30,6 +31,123 @@ def _config(root_path=None):
 
 config = _config()
 
+# Incremented whenever the settings are changed after loading, so the snapshot is rebuilt
+_generation = 0
+_snapshot: Optional[Tuple[Any, int, "SettingsSnapshot"]] = None
+
+
+def as_bool(value: Any, default: bool) -> bool:
+    """Convert a setting to a boolean, strings such as "false" come from `--define`."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def as_tuple(value: Any) -> Tuple[str, ...]:
+    """Convert a list setting, or a comma separated string, to a tuple of strings."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(str(item).strip() for item in value)
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Typed copy of the settings read for every commit, so hot code reads attributes instead of calling `config.get`.
+
+    Use `get_settings` to get the snapshot of the current settings.
+    """
+
+    __slots__ = (
+        "changelog_capitalize",
+        "changelog_scope",
+        "changelog_sections",
+        "fix_tag",
+        "hvcs",
+        "hvcs_pool_size",
+        "major_emoji",
+        "major_on_zero",
+        "minor_emoji",
+        "minor_tag",
+        "parse_chunk_size",
+        "parse_workers",
+        "parser_angular_allowed_types",
+        "parser_angular_default_level_bump",
+        "parser_angular_minor_types",
+        "parser_angular_patch_types",
+        "patch_emoji",
+        "patch_without_tag",
+        "publish_concurrency",
+        "upload_concurrency",
+    )
+
+    changelog_capitalize: bool
+    changelog_scope: bool
+    changelog_sections: Tuple[str, ...]
+    fix_tag: str
+    hvcs: str
+    hvcs_pool_size: int
+    major_emoji: Tuple[str, ...]
+    major_on_zero: bool
+    minor_emoji: Tuple[str, ...]
+    minor_tag: str
+    parse_chunk_size: int
+    parse_workers: int
+    parser_angular_allowed_types: Tuple[str, ...]
+    parser_angular_default_level_bump: str
+    parser_angular_minor_types: Tuple[str, ...]
+    parser_angular_patch_types: Tuple[str, ...]
+    patch_emoji: Tuple[str, ...]
+    patch_without_tag: bool
+    publish_concurrency: int
+    upload_concurrency: int
+
+    @classmethod
+    def from_config(cls, settings) -> "SettingsSnapshot":
+        return cls(
+            changelog_capitalize=as_bool(settings.get("changelog_capitalize"), True),
+            changelog_scope=as_bool(settings.get("changelog_scope"), True),
+            changelog_sections=as_tuple(settings.get("changelog_sections")),
+            fix_tag=settings.get("fix_tag"),
+            hvcs=(settings.get("hvcs") or "github").lower(),
+            hvcs_pool_size=int(settings.get("hvcs_pool_size") or 0),
+            major_emoji=as_tuple(settings.get("major_emoji")),
+            major_on_zero=as_bool(settings.get("major_on_zero"), True),
+            minor_emoji=as_tuple(settings.get("minor_emoji")),
+            minor_tag=settings.get("minor_tag"),
+            parse_chunk_size=max(int(settings.get("parse_chunk_size") or 1), 1),
+            parse_workers=int(settings.get("parse_workers") or 0),
+            parser_angular_allowed_types=as_tuple(settings.get("parser_angular_allowed_types")),
+            parser_angular_default_level_bump=str(settings.get("parser_angular_default_level_bump")).lower(),
+            parser_angular_minor_types=as_tuple(settings.get("parser_angular_minor_types")),
+            parser_angular_patch_types=as_tuple(settings.get("parser_angular_patch_types")),
+            patch_emoji=as_tuple(settings.get("patch_emoji")),
+            patch_without_tag=as_bool(settings.get("patch_without_tag"), False),
+            publish_concurrency=max(int(settings.get("publish_concurrency") or 1), 1),
+            upload_concurrency=max(int(settings.get("upload_concurrency") or 1), 1),
+        )
+
+
+def get_settings(settings=None) -> SettingsSnapshot:
+    """Get the snapshot of the given settings object, `config` by default.
+
+    The snapshot is built once and only rebuilt for another settings object or after `invalidate_settings`.
+    """
+    global _snapshot
+    settings = config if settings is None else settings
+    if _snapshot is None or _snapshot[0] is not settings or _snapshot[1] != _generation:
+        _snapshot = (settings, _generation, SettingsSnapshot.from_config(settings))
+    return _snapshot[2]
+
+
+def invalidate_settings():
+    """Rebuild the settings snapshot on next use, to be called after changing settings."""
+    global _generation
+    _generation += 1
+
 
 def import_from_settings(settings_name: str) -> Any:
     val = config.get(settings_name)
@@ -57,6 +175,7 @@ def overload_configuration(func):
                 pair = defined_param.split("=", maxsplit=1)
                 if len(pair) == 2:
                     config[str(pair[0])] = pair[1]
+                    invalidate_settings()
         return func(*args, **kwargs)
 
     return wrap
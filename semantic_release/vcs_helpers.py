@@ -1,35 +1,101 @@
 """VCS Helpers."""
+import bisect
+import collections
+import json
 import logging
+import mmap
 import os
 import re
+import shutil
+import time
 from contextlib import suppress
-from datetime import date
+from datetime import date, datetime
 from functools import wraps
 from pathlib import Path, PurePath
-from typing import Iterator, Optional, Tuple
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, cast
 from urllib.parse import urlsplit
 
-from git import GitCommandError, InvalidGitRepositoryError, Repo
+from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
 from git.exc import BadName
-from git.objects import TagObject
 from git.objects.commit import Commit
 
+from .context import ReplayableIterator, get_release_context, invalidate_release_context
 from .errors import GitError, HvcsRepoParseError
-from .helpers import LoggedFunction
-from .settings import config
-
-with suppress(InvalidGitRepositoryError):
-    repo = Repo(".", search_parent_directories=True)
+from .helpers import LOG_MAX_LENGTH, LoggedFunction, atomic_write, import_path
+from .refs import TagRefs, resolve_ref
+from .settings import as_tuple, config
 
 logger = logging.getLogger(__name__)
 
 
+class LazyRepo:
+    """Stand-in for the repository of the working directory, which is only opened when it is first used.
+
+    Attributes are read from the opened `Repo`. Use `get_repo` to know whether there is a repository.
+    """
+
+    def __init__(self, path: str = "."):
+        self.path = path
+        self.opened = False
+        self.repo: Optional[Repo] = None
+
+    def open(self) -> Optional[Repo]:
+        if not self.opened:
+            self.opened = True
+            with suppress(InvalidGitRepositoryError, NoSuchPathError):
+                self.repo = Repo(self.path, search_parent_directories=True)
+        return self.repo
+
+    def __getattr__(self, name: str):
+        repo = self.open()
+        if get_repo() is None:
+            raise GitError("Not in a valid git repository")
+        return getattr(repo, name)
+
+
+# Typed as a `Repo`, the stand-in forwards every attribute to the opened repository
+repo: Repo = cast(Repo, LazyRepo())
+
+
+def get_repo() -> Optional[Repo]:
+    """Return the repository of the working directory, opening it on first use, or None if there is none."""
+    if isinstance(repo, LazyRepo):
+        return repo.open()
+    return repo
+
+
+# Lightweight commit records produced by the `git` log backend.
+# They provide the attributes of GitPython `Commit` objects used by semantic-release.
+Actor = collections.namedtuple("Actor", ["name", "email"])
+Tree = collections.namedtuple("Tree", ["hexsha"])
+CommitRecord = collections.namedtuple(
+    "CommitRecord",
+    ["hexsha", "tree", "author", "authored_datetime", "committer", "committed_datetime", "message"],
+)
+
+# One record per commit, fields are separated by the ASCII unit separator and the message comes last
+COMMIT_LOG_FIELD_SEPARATOR = "\x1f"
+COMMIT_LOG_FORMAT = "%x1f".join(["%H", "%T", "%an", "%ae", "%aI", "%cn", "%ce", "%cI", "%B"])
+COMMIT_LOG_CHUNK_SIZE = 64 * 1024
+# Each commit starts with the ASCII record separator, it is followed by the paths it changed
+COMMIT_PATHS_FORMAT = "%x1e%H%x1f%B"
+COPY_BLOCK_SIZE = 1024 * 1024
+CHANGELOG_INDEX_FILE = "changelog-index.json"
+
+# Tag name, tag object or commit, peeled commit (annotated tags only) and creation date, newest first
+TAG_FORMAT = "%(refname:strip=2)%00%(objectname)%00%(*objectname)%00%(creatordate:unix)"
+re_version = re.compile(r"\d+\.\d+\.\d+")
+
+_tag_index: Optional[Tuple[Repo, "TagIndex"]] = None
+_tag_refs: Optional[Tuple[Repo, TagRefs]] = None
+
+
 def check_repo(func):
     """Decorator which checks that we are in a git repository."""
 
     @wraps(func)
     def function_wrapper(*args, **kwargs):
-        if repo is None:
+        if get_repo() is None:
             raise GitError("Not in a valid git repository")
         return func(*args, **kwargs)
 
@@ -42,9 +108,156 @@ def get_formatted_tag(version):
     return tag_format.format(version=version)
 
 
+def iter_records(stream: IO[bytes], separator: bytes = b"\0") -> Iterator[bytes]:
+    """Split a binary stream into separator-terminated records, reading it in chunks.
+
+    :param stream: The stream to read, i.e. the stdout of a git process.
+    :param separator: The record separator.
+    """
+    pending = b""
+    for chunk in iter(lambda: stream.read(COMMIT_LOG_CHUNK_SIZE), b""):
+        records = (pending + chunk).split(separator)
+        pending = records.pop()
+        yield from records
+    if pending:
+        yield pending
+
+
+def parse_commit_record(record: bytes) -> CommitRecord:
+    """Build a `CommitRecord` from one record of `git log --format=COMMIT_LOG_FORMAT`."""
+    (
+        hexsha,
+        tree,
+        author_name,
+        author_email,
+        authored_date,
+        committer_name,
+        committer_email,
+        committed_date,
+        message,
+    ) = record.decode("utf-8", "replace").split(COMMIT_LOG_FIELD_SEPARATOR, 8)
+    return CommitRecord(
+        hexsha,
+        Tree(tree),
+        Actor(author_name, author_email),
+        datetime.fromisoformat(authored_date),
+        Actor(committer_name, committer_email),
+        datetime.fromisoformat(committed_date),
+        message,
+    )
+
+
+@check_repo
+def iter_commits_gitpython(
+    rev: Optional[str] = None, paths: Sequence[str] = (), grep: Sequence[str] = ()
+) -> Iterator[Commit]:
+    """Log backend yielding GitPython `Commit` objects."""
+    options: Dict[str, Any] = {"grep": list(grep), "extended_regexp": True} if grep else {}
+    yield from repo.iter_commits(rev, paths=list(paths), **options)
+
+
+@check_repo
+def iter_commits_git(
+    rev: Optional[str] = None, paths: Sequence[str] = (), grep: Sequence[str] = ()
+) -> Iterator[CommitRecord]:
+    """Log backend streaming the output of a single `git log` process.
+
+    The output is parsed incrementally, so memory usage does not depend on the size of the history and no git object
+    is loaded by GitPython.
+
+    :param rev: A revision range understood by `git log`, the whole history of HEAD if None.
+    :param paths: Pathspecs, only the commits changing them are listed.
+    :param grep: Extended regular expressions, only the commits with a line matching one of them are listed.
+    """
+    args = ["-z", f"--format={COMMIT_LOG_FORMAT}"]
+    if grep:
+        args.append("--extended-regexp")
+        args.extend(f"--grep={pattern}" for pattern in grep)
+    if rev:
+        args.append(rev)
+    if paths:
+        args.extend(["--", *paths])
+    process = repo.git.log(*args, as_process=True)
+    try:
+        for record in iter_records(process.stdout):
+            yield parse_commit_record(record)
+        process.wait()
+    except GitCommandError as error:
+        raise GitError(str(error)) from error
+    finally:
+        if process.poll() is None:
+            process.terminate()
+
+
+LOG_BACKENDS = {
+    "git": iter_commits_git,
+    "gitpython": iter_commits_gitpython,
+}
+
+
+def iter_commits(rev: Optional[str] = None, grep: Sequence[str] = ()) -> Iterator[Union[Commit, CommitRecord]]:
+    """Yield commits from last to first using the configured `commit_log_backend`.
+
+    The backend is either one of `LOG_BACKENDS` or the import path of a function with the same signature. When the
+    `commit_paths` setting is set, its pathspecs are given to the backend as a second argument and git only lists the
+    commits changing them.
+
+    While a `ReleaseContext` replaying commits is active, the log of each revision range is read once and shared until
+    HEAD moves.
+
+    :param rev: A revision range understood by `git log`, the whole history of HEAD if None.
+    :param grep: Extended regular expressions to pre-filter the commit messages. It is only a hint, custom backends
+        list every commit.
+    """
+    backend = config.get("commit_log_backend", "git")
+    log_backend = LOG_BACKENDS.get(backend) or import_path(backend)
+    paths = get_commit_pathspecs()
+    grep = tuple(grep) if backend in LOG_BACKENDS else ()
+
+    def read_log():
+        if grep:
+            return log_backend(rev, paths, grep=grep)
+        # Backends without pathspec support keep working as long as the setting is not used
+        return log_backend(rev, paths) if paths else log_backend(rev)
+
+    context = get_release_context()
+    if context is None or not context.replay_commits:
+        yield from read_log()
+        return
+    key = ("commits", backend, get_head_sha(), walk_key(rev), paths, grep)
+    yield from context.get(key, lambda: ReplayableIterator(read_log()))
+
+
+def get_commit_pathspecs() -> Tuple[str, ...]:
+    """Get the pathspecs of the `commit_paths` setting, relative to the root of the repository.
+
+    Paths are relative to the current directory, e.g. "." for the package being released from a subdirectory of a
+    monorepo. Pathspecs with a magic signature, such as ":(exclude)docs", are given to git as they are.
+    """
+    paths = as_tuple(config.get("commit_paths"))
+    if not paths:
+        return ()
+    prefix = os.path.relpath(Path.cwd().resolve(), Path(repo.working_dir).resolve())
+    return tuple(
+        path if path.startswith(":") else os.path.normpath(os.path.join(prefix, path)).replace(os.sep, "/")
+        for path in paths
+    )
+
+
+def walk_key(rev: Optional[str]) -> Optional[str]:
+    """Normalize a revision range, `A...B` and `B...A` select the same commits in the same order."""
+    if not rev or "..." not in rev:
+        return rev
+    return "...".join(sorted(side or "HEAD" for side in rev.split("...", 1)))
+
+
 @check_repo
-def get_commit_log(from_rev=None):
-    """Yield all commit messages from last to first."""
+def get_commit_log(from_rev=None, grep: Sequence[str] = ()):
+    """Yield all commit messages from last to first.
+
+    :param from_rev: The version of the last release, the whole history is read if it is not tagged.
+    :param grep: Extended regular expressions, git may then only list the commits with a line matching one of them.
+    """
     rev = None
     if from_rev:
         from_rev = get_formatted_tag(from_rev)
@@ -54,8 +267,145 @@ def get_commit_log(from_rev=None):
         except BadName:
             logger.debug(f"Reference {from_rev} does not exist, considering entire history")
 
-    for commit in repo.iter_commits(rev):
-        yield (commit.hexsha, commit.message.replace("\r\n", "\n"))
+    for commit in iter_commits(rev, grep):
+        yield (commit.hexsha, cast(str, commit.message).replace("\r\n", "\n"))
+
+
+@check_repo
+def iter_commit_paths(rev: Optional[str] = None) -> Iterator[Tuple[str, str, List[str]]]:
+    """Yield the sha, message and changed paths of each commit from last to first, read from a single `git log`.
+
+    Paths are relative to the root of the repository. Renames are listed as a deletion and an addition, so both paths
+    are included, and merge commits have no paths.
+
+    :param rev: A revision range understood by `git log`, the whole history of HEAD if None.
+    """
+    args = ["-z", "--name-only", "--no-renames", f"--format={COMMIT_PATHS_FORMAT}"]
+    if rev:
+        args.append(rev)
+    process = repo.git.log(*args, as_process=True)
+    commit: Optional[Tuple[str, str, List[str]]] = None
+    try:
+        for record in iter_records(process.stdout):
+            text = record.decode("utf-8", "replace")
+            if text.startswith("\x1e"):
+                if commit is not None:
+                    yield commit
+                sha, _, message = text[1:].partition(COMMIT_LOG_FIELD_SEPARATOR)
+                commit = (sha, message.replace("\r\n", "\n"), [])
+            elif commit is not None:
+                # The list of paths is separated from the message by a new line
+                commit[2].append(text.lstrip("\n"))
+        if commit is not None:
+            yield commit
+        process.wait()
+    except GitCommandError as error:
+        raise GitError(str(error)) from error
+    finally:
+        if process.poll() is None:
+            process.terminate()
+
+
+class TagIndex:
+    """Index of the repository tags, answering version lookups without walking the tags again.
+
+    Tags are kept newest first, ordered by their creation date (the tagger date of annotated tags and the commit date
+    of lightweight tags).
+
+    :param tags: Tuples of (tag name, sha of the tagged commit, creation timestamp), newest first.
+    """
+
+    def __init__(self, tags: Iterable[Tuple[str, str, int]] = ()):
+        self.tags: List[Tuple[str, str, int]] = list(tags)
+        self.shas: Dict[str, str] = {}
+        self.tags_by_sha: Dict[str, List[str]] = collections.defaultdict(list)
+        versions = {}
+        for name, sha, _ in self.tags:
+            self.shas[name] = sha
+            self.tags_by_sha[sha].append(name)
+            match = re_version.search(name)
+            if match:
+                versions[version_key(match.group(0))] = match.group(0)
+        # Sorted (major, minor, patch) keys and their version strings
+        self.version_keys: List[Tuple[int, int, int]] = sorted(versions)
+        self.versions: List[str] = [versions[key] for key in self.version_keys]
+
+    @classmethod
+    def from_repo(cls, repo: Repo) -> "TagIndex":
+        """Build the index from a single `git for-each-ref` call."""
+        output = repo.git.for_each_ref("--sort=-creatordate", f"--format={TAG_FORMAT}", "refs/tags")
+        tags = []
+        for line in output.splitlines():
+            name, sha, peeled_sha, created = line.split("\0")
+            tags.append((name, peeled_sha or sha, int(created or 0)))
+        logger.debug(f"Indexed {len(tags)} tags")
+        return cls(tags)
+
+    def add(self, name: str, sha: str, created: int):
+        """Add a tag to the index, keeping tags ordered newest first."""
+        position = len(self.tags)
+        while position and self.tags[position - 1][2] < created:
+            position -= 1
+        self.tags.insert(position, (name, sha, created))
+        self.shas[name] = sha
+        self.tags_by_sha[sha].append(name)
+
+        match = re_version.search(name)
+        if match:
+            version = match.group(0)
+            key = version_key(version)
+            index = bisect.bisect_left(self.version_keys, key)
+            if index == len(self.version_keys) or self.version_keys[index] != key:
+                self.version_keys.insert(index, key)
+                self.versions.insert(index, version)
+
+    def last_version(self, skip_tags: Iterable[str] = ()) -> Optional[str]:
+        """Find the version of the most recently created tag containing a version number."""
+        for name, _, _ in self.tags:
+            match = re_version.search(name)
+            if match and name not in skip_tags:
+                return match.group(0)
+        return None
+
+    def sha(self, tag_name: str) -> Optional[str]:
+        """Get the sha of the commit pointed to by a tag."""
+        return self.shas.get(tag_name)
+
+    def tags_for(self, sha: str) -> List[str]:
+        """Get the names of the tags pointing to a commit."""
+        return self.tags_by_sha.get(sha, [])
+
+    def previous_version(self, version: str) -> Optional[str]:
+        """Find the highest tagged version lower than the given version."""
+        index = bisect.bisect_left(self.version_keys, version_key(version))
+        return self.versions[index - 1] if index else None
+
+
+def version_key(version: str) -> Tuple[int, int, int]:
+    """Return a sortable (major, minor, patch) key for a version string such as 1.2.3."""
+    match = re_version.search(version)
+    if not match:
+        raise ValueError(f"{version!r} is not a valid version")
+    major, minor, patch = match.group(0).split(".")
+    return int(major), int(minor), int(patch)
+
+
+@check_repo
+def get_tag_index() -> TagIndex:
+    """Get the tag index of the current repository, it is built once per process."""
+    global _tag_index
+    if _tag_index is None or _tag_index[0] is not repo:
+        _tag_index = (repo, TagIndex.from_repo(repo))
+    return _tag_index[1]
+
+
+@check_repo
+def get_tag_refs() -> TagRefs:
+    """Get the tags of the current repository read from the git directory, they are read once per process."""
+    global _tag_refs
+    if _tag_refs is None or _tag_refs[0] is not repo:
+        _tag_refs = (repo, TagRefs.read(Path(repo.git_dir)))
+    return _tag_refs[1]
 
 
 @check_repo
@@ -65,19 +415,39 @@ def get_last_version(skip_tags=None) -> Optional[str]:
 
     :return: A string containing a version number.
     """
-    skip_tags = skip_tags or []
+    return get_tag_index().last_version(skip_tags or [])
+
+
+@check_repo
+@LoggedFunction(logger)
+def describe_previous_version(version: str) -> Optional[str]:
+    """Find the version of the nearest release tag reachable from the parent of the given version's tagged commit.
 
-    def version_finder(tag):
-        if isinstance(tag.commit, TagObject):
-            return tag.tag.tagged_date
-        return tag.commit.committed_date
+    :param version: A version which is tagged.
+    :return: The previous version, or None if the version is not tagged or no older release tag is reachable.
+    """
+    tag = get_formatted_tag(version)
+    if get_version_from_tag(tag) is None:
+        return None
+    try:
+        previous_tag = repo.git.describe(
+            "--tags", "--abbrev=0", f"--match={config.get('tag_format').format(version='*')}", f"{tag}^"
+        )
+    except GitCommandError:
+        # No release tag before this one, or the tagged commit has no parent
+        return None
+    match = re_version.search(previous_tag)
+    return match.group(0) if match else None
 
-    for i in sorted(repo.tags, reverse=True, key=version_finder):
-        match = re.search(r"\d+\.\d+\.\d+", i.name)
-        if match and i.name not in skip_tags:
-            return match.group(0)  # Return only numeric vesion like 1.2.3
 
-    return None
+@check_repo
+def get_release_commit_log() -> Iterator[Tuple[str, str]]:
+    """Yield the (sha, message) of the commits authored by `commit_author`, newest first."""
+    author = config.get("commit_author", "semantic-release <semantic-release>")
+    output = repo.git.log("--fixed-strings", f"--author={author}", "-z", "--format=%H%n%B")
+    for record in filter(None, output.split("\0")):
+        sha, _, message = record.partition("\n")
+        yield sha, message.replace("\r\n", "\n")
 
 
 @check_repo
@@ -88,10 +458,29 @@ def get_version_from_tag(tag_name: str) -> Optional[str]:
     :param tag_name: Name of the git tag (i.e. 'v1.0.0')
     :return: sha1 hash of the commit
     """
-    for i in repo.tags:
-        if i.name == tag_name:
-            return i.commit.hexsha
-    return None
+    tag_refs = get_tag_refs()
+    if tag_refs.readable and tag_name not in tag_refs:
+        return None
+    sha = tag_refs.commit(tag_name)
+    if sha is None:
+        # The tag cannot be peeled from the git directory, e.g. its object is packed
+        sha = peel_tag(tag_name)
+        if sha is not None:
+            tag_refs.add(tag_name, sha)
+    return sha
+
+
+def peel_tag(tag_name: str) -> Optional[str]:
+    """Ask git for the commit a tag points to, with the tag index if it is already built.
+
+    :return: The sha of the commit, or None if the tag does not exist.
+    """
+    if _tag_index is not None and _tag_index[0] is repo:
+        return _tag_index[1].sha(tag_name)
+    try:
+        return repo.git.rev_parse("--verify", "--quiet", f"refs/tags/{tag_name}^{{commit}}") or None
+    except GitCommandError:
+        return None
 
 
 @check_repo
@@ -122,12 +511,35 @@ def get_repository_owner_and_name() -> Tuple[str, str]:
 
 
 @check_repo
+def resolve_rev(name: str = "HEAD") -> str:
+    """Get the commit hash a reference points to.
+
+    The hash is read from the ref files of the git directory, git is only run when they cannot be read.
+
+    :param name: A full reference name, such as HEAD or refs/heads/main.
+    :return: The commit hash.
+    """
+    sha = resolve_ref(Path(repo.git_dir), name)
+    if sha is None:
+        logger.debug(f"Unable to read {name} from the git directory, asking git")
+        sha = repo.git.rev_parse(name)
+    return sha
+
+
 def get_current_head_hash() -> str:
     """Get the commit hash of the current HEAD.
 
     :return: The commit hash.
     """
-    return repo.head.commit.name_rev.split(" ")[0]
+    return resolve_rev("HEAD")
+
+
+def get_head_sha() -> Optional[str]:
+    """Get the commit hash of the current HEAD, or None if the current branch has no commit yet."""
+    try:
+        return get_current_head_hash()
+    except GitCommandError:
+        return None
 
 
 @check_repo
@@ -159,14 +571,104 @@ def commit_new_version(version: str):
         git_path: PurePath = PurePath(os.getcwd(), declaration.path).relative_to(repo.working_dir)  # type: ignore
         repo.git.add(str(git_path))
 
-    return repo.git.commit(m=message, author=commit_author)
+    result = repo.git.commit(m=message, author=commit_author)
+    invalidate_release_context()
+    return result
+
+
+def find_offsets(path: Path, needle: bytes) -> List[int]:
+    """Return the offset of each occurrence of `needle` in a file, searched through a memory map."""
+    offsets: List[int] = []
+    with path.open("rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return offsets
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offset = mapped.find(needle)
+            while offset != -1:
+                offsets.append(offset)
+                offset = mapped.find(needle, offset + len(needle))
+    return offsets
+
+
+def copy_bytes(source: IO[bytes], target: IO[bytes], count: int):
+    """Copy `count` bytes from `source` to `target` in blocks."""
+    while count > 0:
+        block = source.read(min(count, COPY_BLOCK_SIZE))
+        if not block:
+            break
+        target.write(block)
+        count -= len(block)
+
+
+def insert_into_file(path: Path, offsets: List[int], text: bytes):
+    """Insert `text` at each of the sorted offsets, by copying the file in blocks and replacing it atomically."""
+    # The source is closed before it is replaced
+    with atomic_write(path) as target, path.open("rb") as source:
+        position = 0
+        for offset in offsets:
+            copy_bytes(source, target, offset - position)
+            target.write(text)
+            position = offset
+        shutil.copyfileobj(source, target, COPY_BLOCK_SIZE)
+
+
+def get_changelog_index_path() -> Optional[Path]:
+    """Return the path of the changelog placeholder index inside the git directory, None if there is no repository."""
+    git_repo = get_repo()
+    if git_repo is None:
+        return None
+    # Stored next to the parsed commit cache
+    return Path(git_repo.git_dir) / "semantic-release" / CHANGELOG_INDEX_FILE
+
+
+def changelog_index_key(path: Path, placeholder: bytes) -> list:
+    stat = path.stat()
+    return [str(path), stat.st_size, stat.st_mtime_ns, placeholder.decode()]
+
+
+def read_placeholder_offsets(path: Path, placeholder: bytes, index_path: Path) -> Optional[List[int]]:
+    """Return the placeholder offsets stored in the index.
+
+    They are only returned if the file was not modified since they were stored and the placeholder is still found at
+    each of them, None otherwise.
+    """
+    try:
+        index = json.loads(index_path.read_text())
+        if index["key"] != changelog_index_key(path, placeholder):
+            return None
+        with path.open("rb") as file:
+            for offset in index["offsets"]:
+                file.seek(offset)
+                if file.read(len(placeholder)) != placeholder:
+                    return None
+        return index["offsets"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def find_placeholder(path: Path, placeholder: bytes, index_path: Optional[Path]) -> List[int]:
+    """Return the offsets of the placeholder in the changelog file, from the index or by searching the file."""
+    offsets = read_placeholder_offsets(path, placeholder, index_path) if index_path else None
+    return find_offsets(path, placeholder) if offsets is None else offsets
+
+
+def save_placeholder_offsets(path: Path, placeholder: bytes, offsets: List[int], index_path: Path):
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_text(json.dumps({"key": changelog_index_key(path, placeholder), "offsets": offsets}))
+    except OSError as error:
+        logger.warning(f"Unable to save changelog index {index_path}: {error}")
 
 
 @check_repo
-@LoggedFunction(logger)
+@LoggedFunction(logger, max_length=LOG_MAX_LENGTH)
 def update_changelog_file(version: str, content_to_add: str):
     """Update changelog file with changelog for the release.
 
+    The release notes are inserted after each placeholder without reading the whole file into memory, and the file
+    is replaced atomically. The placeholder offsets are kept in an index in the git directory, so the next release
+    does not need to search the file.
+
     :param version: The release version number, as a string.
     :param content_to_add: The release notes for the version.
     """
@@ -174,29 +676,24 @@ def update_changelog_file(version: str, content_to_add: str):
     changelog_placeholder = config.get("changelog_placeholder")
     git_path = Path(os.getcwd(), changelog_file)
     if not git_path.exists():
-        original_content = f"# Changelog\n\n{changelog_placeholder}\n"
         logger.warning(f"Changelog file not found: {git_path} - creating it.")
-    else:
-        original_content = git_path.read_text()
+        git_path.write_text(f"# Changelog\n\n{changelog_placeholder}\n", encoding="utf-8")
 
-    if changelog_placeholder not in original_content:
+    placeholder = changelog_placeholder.encode()
+    index_path = get_changelog_index_path()
+    offsets = find_placeholder(git_path, placeholder, index_path)
+    if not offsets:
         logger.warning(
             f"Placeholder '{changelog_placeholder}' not found " f"in changelog file {git_path} - skipping change."
         )
         return
 
-    updated_content = original_content.replace(
-        changelog_placeholder,
-        "\n".join(
-            [
-                changelog_placeholder,
-                "",
-                f"## v{version} ({date.today():%Y-%m-%d})",
-                content_to_add,
-            ]
-        ),
-    )
-    git_path.write_text(updated_content)
+    section = "\n".join(["", "", f"## v{version} ({date.today():%Y-%m-%d})", content_to_add]).encode()
+    insert_into_file(git_path, [offset + len(placeholder) for offset in offsets], section)
+    if index_path:
+        # Each placeholder moved by the sections inserted before it
+        moved = [offset + position * len(section) for position, offset in enumerate(offsets)]
+        save_placeholder_offsets(git_path, placeholder, moved, index_path)
     repo.git.add(str(git_path.relative_to(str(repo.working_dir))))
 
 
@@ -208,7 +705,14 @@ def tag_new_version(version: str):
     :param version: The version number used in the tag as a string.
     """
     tag = get_formatted_tag(version)
-    return repo.git.tag("-a", tag, m=tag)
+    result = repo.git.tag("-a", tag, m=tag)
+    invalidate_release_context()
+    # Keep the tag index and refs up to date instead of reading all the tags again
+    if _tag_index is not None and _tag_index[0] is repo:
+        _tag_index[1].add(tag, get_current_head_hash(), int(time.time()))
+    if _tag_refs is not None and _tag_refs[0] is repo:
+        _tag_refs[1].add(tag, get_current_head_hash())
+    return result
 
 
 @check_repo
@@ -257,11 +761,16 @@ def checkout(branch: str):
 
     :param branch: The branch to checkout.
     """
-    return repo.git.checkout(branch)
+    head = get_head_sha()
+    result = repo.git.checkout(branch)
+    if get_head_sha() != head:
+        # The walks and results memoized for the previous HEAD do not apply anymore
+        invalidate_release_context()
+    return result
 
 
 @check_repo
-def get_commits_beetwen(from_rev=None, to_rev=None, rev: str = None) -> Iterator[Commit]:
+def get_commits_beetwen(from_rev=None, to_rev=None, rev: Optional[str] = None) -> Iterator[Union[Commit, CommitRecord]]:
     """Yield all commits from last to first."""
     if from_rev:
         from_rev = get_formatted_tag(from_rev)
@@ -278,4 +787,4 @@ def get_commits_beetwen(from_rev=None, to_rev=None, rev: str = None) -> Iterator
         except BadName:
             logger.debug(f"Reference {to_rev} does not exist, considering entire history")
 
-    yield from repo.iter_commits(rev)
+    yield from iter_commits(rev)
@@ -13,12 +13,17 @@ def reset_config():
     config.
     """
     yield
-    from importlib import reload
+    from importlib import import_module, reload
+
+    # The CLI imports these lazily, so they may not be imported yet
+    import_module("semantic_release.history.logs")
+    import_module("semantic_release.history.packages")
 
     reload(semantic_release.settings)
     reload(semantic_release.vcs_helpers)
     reload(semantic_release.history)
     reload(semantic_release.history.logs)
+    reload(semantic_release.history.packages)
 
 
 def wrapped_config_get(**kwargs):
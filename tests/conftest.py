@@ -0,0 +1,13 @@
+import pytest
+from git import Repo
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    """Empty repository in a temporary directory, used as the repository of semantic-release."""
+    repo = Repo.init(tmp_path)
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "a")
+        writer.set_value("user", "email", "a@a")
+    monkeypatch.setattr("semantic_release.vcs_helpers.repo", repo)
+    return repo
@@ -0,0 +1,93 @@
+import pytest
+
+from semantic_release.errors import UnknownCommitMessageStyleError
+from semantic_release.history import angular_parser, emoji_parser
+from semantic_release.history.cache import ParsedCommitCache, get_parsed_commit_cache
+from semantic_release.history.logs import evaluate_version_bump, generate_changelog
+
+from .. import wrapped_config_get
+from . import MAJOR, MINOR, PATCH, UNKNOWN_STYLE
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "semantic-release" / "parsed-commits.json"
+
+
+@pytest.fixture
+def parser():
+    def counting_parser(message):
+        counting_parser.calls.append(message)
+        return angular_parser(message)
+
+    counting_parser.calls = []
+    return counting_parser
+
+
+def test_should_reuse_parsed_commits(cache_path, parser):
+    cache = ParsedCommitCache(parser, cache_path)
+    parsed = cache.parse(*MINOR)
+    cache.save()
+
+    cache = ParsedCommitCache(parser, cache_path)
+    assert cache.parse(*MINOR) == parsed
+    assert parser.calls == [MINOR[1]]
+
+
+def test_should_remember_unknown_commit_style(cache_path, parser):
+    cache = ParsedCommitCache(parser, cache_path)
+    with pytest.raises(UnknownCommitMessageStyleError):
+        cache.parse(*UNKNOWN_STYLE)
+    cache.save()
+
+    cache = ParsedCommitCache(parser, cache_path)
+    with pytest.raises(UnknownCommitMessageStyleError):
+        cache.parse(*UNKNOWN_STYLE)
+    assert parser.calls == [UNKNOWN_STYLE[1]]
+
+
+def test_should_invalidate_when_parser_changes(cache_path):
+    cache = ParsedCommitCache(angular_parser, cache_path)
+    cache.parse(*PATCH)
+    cache.save()
+
+    cache = ParsedCommitCache(emoji_parser, cache_path)
+    assert cache.commits == {}
+
+
+def test_should_invalidate_when_parser_settings_change(cache_path, mocker):
+    cache = ParsedCommitCache(angular_parser, cache_path)
+    cache.parse(*PATCH)
+    cache.save()
+
+    mocker.patch(
+        "semantic_release.history.cache.config",
+        wrapped_config_get(parser_angular_patch_types=["fix", "perf", "refactor"]),
+    )
+    cache = ParsedCommitCache(angular_parser, cache_path)
+    assert cache.commits == {}
+
+
+def test_should_not_store_anything_when_disabled(cache_path):
+    cache = get_parsed_commit_cache(angular_parser)
+    cache.parse(*PATCH)
+    cache.save()
+    assert cache.path is None
+    assert not cache_path.exists()
+
+
+def test_log_functions_should_use_cache(cache_path, parser, mocker):
+    mocker.patch("semantic_release.history.logs.import_from_settings", return_value=parser)
+    mocker.patch("semantic_release.history.cache.config", wrapped_config_get(commit_parser_cache=True))
+    mocker.patch("semantic_release.history.cache.get_cache_path", return_value=cache_path)
+    mocker.patch("semantic_release.history.logs.get_commit_log", lambda *a, **kw: [MINOR, PATCH, MAJOR])
+
+    assert evaluate_version_bump("0.0.0") == "major"
+    assert len(parser.calls) == 3
+    assert cache_path.exists()
+
+    mocker.patch.dict("semantic_release.history.cache._caches", clear=True)
+    changelog = generate_changelog("0.0.0")
+    assert len(parser.calls) == 3
+    assert changelog["feature"][0][0] == MINOR[0]
+    assert changelog["fix"][0][0] == PATCH[0]
@@ -0,0 +1,127 @@
+import pytest
+
+from semantic_release.errors import ImproperConfigurationError
+from semantic_release.history.packages import (
+    Package,
+    PathTrie,
+    analyze_packages,
+    get_package_version,
+    get_packages,
+)
+from semantic_release.vcs_helpers import TagIndex, iter_commit_paths
+
+from .. import mock, wrapped_config_get
+
+
+def test_path_trie_should_match_the_longest_prefix():
+    trie = PathTrie()
+    trie.add("libs/core", "core")
+    trie.add("libs/core/docs/", "core-docs")
+    trie.add("./apps/web", "web")
+    assert trie.match("libs/core/setup.py") == "core"
+    assert trie.match("libs/core/docs/index.md") == "core-docs"
+    assert trie.match("apps/web/main.py") == "web"
+    assert trie.match("libs/core-extra/setup.py") is None
+    assert trie.match("README.md") is None
+
+    trie.add(".", "root")
+    assert trie.match("README.md") == "root"
+    assert trie.match("libs/core/setup.py") == "core"
+
+
+@mock.patch("semantic_release.history.packages.config", wrapped_config_get(packages="core=libs/core, web = apps/web"))
+def test_get_packages():
+    assert get_packages() == [Package("core", "libs/core"), Package("web", "apps/web")]
+
+
+@pytest.mark.parametrize("packages", [["libs/core"], ["=libs/core"], ["core=libs/core", "core=libs/other"]])
+def test_get_packages_should_raise_on_invalid_entries(mocker, packages):
+    mocker.patch("semantic_release.history.packages.config", wrapped_config_get(packages=packages))
+    with pytest.raises(ImproperConfigurationError):
+        get_packages()
+
+
+@mock.patch(
+    "semantic_release.history.packages.get_tag_index",
+    lambda: TagIndex([("web-v2.0.0", "c", 4), ("core-v1.1.0", "b", 3), ("v9.0.0", "z", 2), ("core-v1.0.0", "a", 1)]),
+)
+def test_get_package_version():
+    assert get_package_version("core") == "1.1.0"
+    assert get_package_version("web") == "2.0.0"
+    assert get_package_version("cli") == "0.0.0"
+
+
+@mock.patch("semantic_release.history.packages.get_tag_index", lambda: TagIndex([("core-v1.0.0", "ccc", 1)]))
+@mock.patch("semantic_release.history.packages.config", wrapped_config_get(packages=["core=libs/core"]))
+def test_analyze_packages_should_stop_at_the_last_release():
+    commits = iter(
+        [
+            ("eee", "fix: a bug", ["libs/core/main.py"]),
+            ("ddd", "feat: something else", ["apps/web/main.py"]),
+            ("ccc", "1.0.0", ["libs/core/setup.py"]),
+            ("bbb", "feat!: not read", ["libs/core/main.py"]),
+        ]
+    )
+    with mock.patch("semantic_release.history.packages.iter_commit_paths", lambda: commits):
+        release = analyze_packages(get_packages())["core"]
+    assert (release.current_version, release.bump, release.new_version, release.commit_count) == (
+        "1.0.0",
+        "patch",
+        "1.0.1",
+        1,
+    )
+    assert release.changelog["fix"] == [("eee", "A bug")]
+    assert next(commits)[0] == "bbb"
+
+
+@pytest.fixture
+def monorepo(git_repo, tmp_path, monkeypatch):
+    monkeypatch.setattr("semantic_release.vcs_helpers._tag_index", None)
+
+    def commit(message, *paths):
+        for path in paths:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            with (tmp_path / path).open("a") as file:
+                file.write(message)
+        git_repo.git.add(*paths)
+        git_repo.git.commit("-m", message)
+
+    return git_repo, commit
+
+
+@mock.patch(
+    "semantic_release.history.packages.config",
+    wrapped_config_get(packages=["core=libs/core", "web=apps/web", "docs=libs/core/docs"]),
+)
+def test_analyze_packages(monorepo):
+    git_repo, commit = monorepo
+    commit("feat: initial version", "libs/core/main.py", "apps/web/main.py")
+    commit("1.0.0", "libs/core/setup.py")
+    git_repo.git.tag("-a", "core-v1.0.0", m="core-v1.0.0")
+    commit("fix(core): handle errors", "libs/core/main.py")
+    commit("docs: describe the api", "libs/core/docs/index.md")
+    commit("feat: shared change", "libs/core/utils.py", "apps/web/utils.py")
+    commit("feat!: unrelated", "README.md")
+
+    releases = analyze_packages(get_packages())
+
+    assert {name: (release.current_version, release.new_version) for name, release in releases.items()} == {
+        "core": ("1.0.0", "1.1.0"),
+        "web": ("0.0.0", "0.1.0"),
+        "docs": ("0.0.0", "0.0.0"),
+    }
+    assert releases["core"].commit_count == 2
+    assert releases["web"].commit_count == 2
+    assert [message for _, message in releases["core"].changelog["fix"]] == ["**core:** Handle errors"]
+    assert releases["core"].changelog["breaking"] == []
+
+
+def test_iter_commit_paths(monorepo):
+    git_repo, commit = monorepo
+    commit("first\r\n\r\nbody", "a/x", "b/y")
+    git_repo.git.commit("--allow-empty", "-m", "empty")
+    git_repo.git.mv("a/x", "b/x")
+    git_repo.git.commit("-m", "move")
+
+    commits = [(message, paths) for _, message, paths in iter_commit_paths()]
+    assert commits == [("move\n", ["a/x", "b/x"]), ("empty\n", []), ("first\n\nbody\n", ["a/x", "b/y"])]
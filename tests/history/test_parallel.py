@@ -0,0 +1,47 @@
+import pytest
+
+from semantic_release.history import angular_parser
+from semantic_release.history.cache import ParsedCommitCache
+from semantic_release.history.logs import analyze_version_bump, generate_changelog
+
+from .. import wrapped_config_get
+from . import (
+    ALL_KINDS_OF_COMMIT_MESSAGES,
+    MAJOR2,
+    MAJOR_MULTIPLE_FOOTERS,
+    NO_TAG,
+    PATCH,
+    UNKNOWN_STYLE,
+)
+
+COMMITS = [
+    (f"{index}{sha}", message)
+    for index, (sha, message) in enumerate(
+        ALL_KINDS_OF_COMMIT_MESSAGES + [MAJOR2, UNKNOWN_STYLE, NO_TAG, MAJOR_MULTIPLE_FOOTERS, PATCH] * 3
+    )
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 100])
+def test_parse_batch_with_workers_should_keep_commit_order(chunk_size):
+    serial = list(ParsedCommitCache(angular_parser).parse_batch(COMMITS))
+    parallel = list(ParsedCommitCache(angular_parser).parse_batch(COMMITS, workers=2, chunk_size=chunk_size))
+    assert parallel == serial
+
+
+def test_parse_batch_with_workers_should_use_cached_commits():
+    cache = ParsedCommitCache(angular_parser, memoize=True)
+    cached = list(cache.parse_batch(COMMITS[:3]))
+    cache.commit_parser = None  # A worker would fail to import the parser
+    assert list(cache.parse_batch(COMMITS[:3], workers=2)) == cached
+
+
+def test_log_functions_with_workers_should_match_serial_results(mocker):
+    mocker.patch("semantic_release.history.logs.get_commit_log", lambda *a, **kw: COMMITS)
+    serial = generate_changelog("0.0.0"), analyze_version_bump("0.0.0", exhaustive=True)
+
+    mocker.patch(
+        "semantic_release.history.logs.config",
+        wrapped_config_get(parse_workers=2, parse_chunk_size=3),
+    )
+    assert (generate_changelog("0.0.0"), analyze_version_bump("0.0.0", exhaustive=True)) == serial
@@ -11,6 +11,7 @@ from semantic_release.history import (
     TomlVersionDeclaration,
     VersionDeclaration,
     get_current_version,
+    get_current_version_by_config_file,
     get_current_version_by_tag,
     get_new_version,
     get_previous_version,
@@ -49,18 +50,38 @@ def test_current_version_should_return_default_version(mock_last_version):
 
 
 class TestGetPreviousVersion:
+    @mock.patch("semantic_release.history.describe_previous_version", return_value="0.9.0")
+    @mock.patch("semantic_release.history.get_release_commit_log")
+    def test_should_use_the_nearest_release_tag(self, mock_log, mock_describe):
+        assert get_previous_version("0.10.0") == "0.9.0"
+        mock_describe.assert_called_once_with("0.10.0")
+        mock_log.assert_not_called()
+
+    @mock.patch("semantic_release.history.describe_previous_version", return_value=None)
+    @mock.patch("semantic_release.history.get_tag_index")
+    @mock.patch("semantic_release.history.get_release_commit_log")
+    def test_should_use_the_tag_index(self, mock_log, mock_tag_index, mock_describe):
+        mock_tag_index.return_value.previous_version.return_value = "0.9.0"
+        assert get_previous_version("0.10.0") == "0.9.0"
+        mock_tag_index.return_value.previous_version.assert_called_once_with("0.10.0")
+        mock_log.assert_not_called()
+
+    @mock.patch("semantic_release.history.describe_previous_version", return_value=None)
+    @mock.patch("semantic_release.history.get_tag_index", lambda: mock.Mock(previous_version=lambda _: None))
     @mock.patch(
-        "semantic_release.history.get_commit_log",
+        "semantic_release.history.get_release_commit_log",
         lambda: [("211", "0.10.0"), ("13", "0.9.0")],
     )
-    def test_should_return_correct_version(self):
+    def test_should_return_correct_version(self, mock_describe):
         assert get_previous_version("0.10.0") == "0.9.0"
 
+    @mock.patch("semantic_release.history.describe_previous_version", return_value=None)
+    @mock.patch("semantic_release.history.get_tag_index", lambda: mock.Mock(previous_version=lambda _: None))
     @mock.patch(
-        "semantic_release.history.get_commit_log",
-        lambda: [("211", "0.10.0"), ("13", "0.9.0")],
+        "semantic_release.history.get_release_commit_log",
+        lambda: [("211", "v0.10.0"), ("13", "v0.9.0")],
     )
-    def test_should_return_correct_version_with_v(self):
+    def test_should_return_correct_version_with_v(self, mock_describe):
         assert get_previous_version("0.10.0") == "0.9.0"
 
 
@@ -100,6 +121,57 @@ def test_set_version(tmp_cwd):
     assert path.read_text() == "my_version_var = 'X.Y.Z'"
 
 
+@mock.patch(
+    "semantic_release.history.config",
+    wrapped_config_get(
+        version_variable="version.py:__version__,version.py:VERSION",
+        version_pattern="pyproject.toml:^version = ['\"]{version}['\"]",
+        version_toml="pyproject.toml:tool.poetry.version",
+    ),
+)
+def test_version_files_should_be_read_and_written_once(tmp_cwd, mocker):
+    (tmp_cwd / "version.py").write_text("__version__ = '1.2.3'\nVERSION = '1.2.3'\n")
+    (tmp_cwd / "pyproject.toml").write_text('[tool.poetry]\nversion = "1.2.3"\n')
+    read_text = mocker.spy(Path, "read_text")
+    write_text = mocker.spy(Path, "write_text")
+
+    assert get_current_version_by_config_file() == "1.2.3"
+    assert read_text.call_count == 2
+
+    set_new_version("2.0.0")
+    assert read_text.call_count == 4
+    write_text.assert_not_called()
+    assert (tmp_cwd / "version.py").read_text() == "__version__ = '2.0.0'\nVERSION = '2.0.0'\n"
+    assert (tmp_cwd / "pyproject.toml").read_text() == '[tool.poetry]\nversion = "2.0.0"\n'
+    assert sorted(path.name for path in tmp_cwd.iterdir()) == ["pyproject.toml", "version.py"]
+
+
+@mock.patch(
+    "semantic_release.history.config",
+    wrapped_config_get(
+        version_variable="",
+        version_pattern="",
+        version_toml="pyproject.toml:tool.poetry.version,pyproject.toml:project.version",
+    ),
+)
+def test_toml_documents_should_be_parsed_once(tmp_cwd, mocker):
+    pyproject = tmp_cwd / "pyproject.toml"
+    pyproject.write_text('[project]\nversion = "1.2.3"\n\n[tool.poetry]\nversion = "1.2.3"\n')
+    loads_toml = mocker.spy(semantic_release.history, "loads_toml")
+    dumps = mocker.spy(semantic_release.history.tomlkit, "dumps")
+
+    assert get_current_version_by_config_file() == "1.2.3"
+    assert get_current_version_by_config_file() == "1.2.3"
+    assert loads_toml.call_count == 1
+
+    set_new_version("2.0.0")
+    assert dumps.call_count == 1
+    assert pyproject.read_text() == '[project]\nversion = "2.0.0"\n\n[tool.poetry]\nversion = "2.0.0"\n'
+
+    assert get_current_version_by_config_file() == "2.0.0"
+    assert loads_toml.call_count == 2
+
+
 class TestVersionPattern:
     @pytest.mark.parametrize(
         "str, path, pattern",
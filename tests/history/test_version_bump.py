@@ -1,6 +1,8 @@
 from unittest import mock
 
 from semantic_release.history import evaluate_version_bump
+from semantic_release.history.logs import analyze_version_bump
+from semantic_release.history.parser_angular import grep_pattern
 
 from .. import wrapped_config_get
 from . import (
@@ -10,7 +12,9 @@ from . import (
     MINOR,
     MINOR_AND_PATCH_COMMIT_MESSAGES,
     NO_TAG,
+    PATCH,
     PATCH_COMMIT_MESSAGES,
+    UNKNOWN_STYLE,
 )
 
 
@@ -96,3 +100,63 @@ def test_should_return_none_without_commits():
 @mock.patch("semantic_release.history.logs.get_commit_log", lambda *a, **kw: [MAJOR])
 def test_should_minor_without_major_on_zero():
     assert evaluate_version_bump("0.1.0") == "minor"
+
+
+def test_analyze_should_return_deciding_commit():
+    with mock.patch(
+        "semantic_release.history.logs.get_commit_log",
+        lambda *a, **kw: [PATCH, MINOR, PATCH],
+    ):
+        assert analyze_version_bump("1.0.0") == ("minor", 3, MINOR[0], True)
+
+
+def test_analyze_should_stop_reading_after_major():
+    def commit_log(*args, **kwargs):
+        yield PATCH
+        yield MAJOR
+        yield MINOR
+        raise AssertionError("The log should not be read after a major change")
+
+    with mock.patch("semantic_release.history.logs.get_commit_log", commit_log):
+        assert analyze_version_bump("1.0.0") == ("major", 2, MAJOR[0], False)
+
+
+def test_analyze_exhaustive_should_count_all_commits():
+    with mock.patch(
+        "semantic_release.history.logs.get_commit_log",
+        lambda *a, **kw: [PATCH, MAJOR, MINOR, ("22", "1.0.0"), MAJOR],
+    ):
+        assert analyze_version_bump("1.0.0", exhaustive=True) == ("major", 3, MAJOR[0], True)
+
+
+@mock.patch("semantic_release.history.logs.config", wrapped_config_get(patch_without_tag=True))
+@mock.patch("semantic_release.history.logs.get_commit_log", lambda *a, **kw: [UNKNOWN_STYLE, NO_TAG])
+def test_analyze_patch_without_tag_should_be_decided_by_last_commit():
+    assert analyze_version_bump("1.0.0") == ("patch", 2, UNKNOWN_STYLE[0], True)
+
+
+def test_analyze_force():
+    assert analyze_version_bump("1.0.0", "minor") == ("minor", 0, None, False)
+
+
+@mock.patch(
+    "semantic_release.history.logs.config", wrapped_config_get(patch_without_tag=True, commit_log_prefilter=True)
+)
+@mock.patch("semantic_release.history.logs.get_commit_log", lambda rev=None, grep=(): [] if grep else [UNKNOWN_STYLE])
+def test_analyze_patch_without_tag_should_count_commits_filtered_out_by_git():
+    assert analyze_version_bump("1.0.0") == ("patch", 0, UNKNOWN_STYLE[0], True)
+
+
+@mock.patch("semantic_release.history.logs.config", wrapped_config_get(commit_log_prefilter=True))
+def test_analyze_should_pre_filter_the_log_with_the_parser_pattern():
+    commit_log = mock.Mock(return_value=[MINOR])
+    with mock.patch("semantic_release.history.logs.get_commit_log", commit_log):
+        assert analyze_version_bump("1.0.0") == ("minor", 1, MINOR[0], True)
+    commit_log.assert_called_once_with("1.0.0", (grep_pattern(), r"1\.0\.0"))
+
+
+def test_analyze_should_read_the_whole_log_by_default():
+    commit_log = mock.Mock(return_value=[MINOR])
+    with mock.patch("semantic_release.history.logs.get_commit_log", commit_log):
+        assert analyze_version_bump("1.0.0") == ("minor", 1, MINOR[0], True)
+    commit_log.assert_called_once_with("1.0.0", ())
@@ -136,6 +136,8 @@ def mock_gitlab(status="success"):
         mock.patch("os.environ", {"GL_TOKEN": "token"}),
         mock.patch("semantic_release.hvcs.config", wrapped_config_get(hvcs="gitlab")),
         mock.patch("gitlab.Gitlab.auth"),
+        # A shared client would keep the project manager of a previous test
+        mock.patch.dict("semantic_release.hvcs._clients", clear=True),
         mock.patch(
             "gitlab.v4.objects.ProjectManager",
             return_value={"owner/repo": _GitlabProject(status)},
@@ -1,7 +1,12 @@
+import re
+
 import pytest
 
 from semantic_release.errors import UnknownCommitMessageStyleError
 from semantic_release.history import angular_parser
+from semantic_release.history.parser_angular import AngularParser, grep_pattern, parse_many
+from semantic_release.history.parser_helpers import parse_or_none
+from semantic_release.vcs_helpers import get_commit_log
 
 from .. import mock, wrapped_config_get
 
@@ -126,3 +131,81 @@ def test_parser_custom_minor_types():
 )
 def test_parser_custom_patch_types():
     assert angular_parser("test(this): added a test")[0] == 1
+
+
+@mock.patch(
+    "semantic_release.history.parser_angular.config",
+    wrapped_config_get(parser_angular_minor_types="docs, test"),
+)
+def test_parser_custom_minor_types_separated_by_commas():
+    assert angular_parser("docs: write some docs")[0] == 2
+    assert angular_parser("test: add a test")[0] == 2
+    assert angular_parser("feat: add a feature")[0] == 0
+
+
+def test_parser_should_be_built_once_per_settings(mocker):
+    from_config = mocker.spy(AngularParser, "from_config")
+    mocker.patch("semantic_release.history.parser_angular._parser", None)
+    angular_parser("feat: a feature")
+    angular_parser("fix: a fix")
+    assert from_config.call_count == 1
+
+    mocker.patch("semantic_release.history.parser_angular.config", wrapped_config_get(parser_angular_minor_types="fix"))
+    assert angular_parser("fix: a fix")[0] == 2
+    assert from_config.call_count == 2
+
+
+def test_parse_many():
+    results = list(parse_many(["feat: a feature", "random commit", "fix!: a breaking fix"]))
+    assert results[0] == angular_parser("feat: a feature")
+    assert results[1] is None
+    assert results[2].bump == 3
+
+
+@pytest.mark.parametrize(
+    "message, matches",
+    [
+        ("feat(parser): Add new parser pattern", True),
+        ("fix!: a breaking fix", True),
+        ("Merge branch 'main'\n\nfeat: merged feature", True),
+        ("random commit", False),
+        ("feature: not an allowed type", False),
+        ("1.0.0", False),
+    ],
+)
+def test_grep_pattern_should_match_the_recognised_messages(message, matches):
+    pattern = grep_pattern()
+    assert bool(re.search(pattern, message, re.M)) == matches
+    if not matches:
+        pytest.raises(UnknownCommitMessageStyleError, angular_parser, message)
+
+
+def test_grep_pattern_should_be_none_with_regular_expression_types():
+    with mock.patch(
+        "semantic_release.history.parser_angular.config",
+        wrapped_config_get(parser_angular_allowed_types="feat,fix,chore.*"),
+    ):
+        assert grep_pattern() is None
+
+
+@pytest.mark.parametrize("backend", ["git", "gitpython"])
+def test_grep_pattern_should_select_every_accepted_commit(git_repo, monkeypatch, backend):
+    for message in [
+        "feat: a feature",
+        "build-ci(deps): bump the runner",
+        "refactor!: a breaking refactor",
+        "fix(parser): a fix\n\nbody\n\nBREAKING CHANGE: a break",
+        "docs: not an allowed type",
+        "random commit",
+        "Merge pull request #1\n\nfeat: a merged feature",
+    ]:
+        git_repo.git.commit("--allow-empty", "-m", message)
+    settings = wrapped_config_get(parser_angular_allowed_types="feat,fix,build-ci,refactor", commit_log_backend=backend)
+    monkeypatch.setattr("semantic_release.history.parser_angular.config", settings)
+    monkeypatch.setattr("semantic_release.vcs_helpers.config", settings)
+
+    accepted = {sha for sha, message in get_commit_log() if parse_or_none(angular_parser, message)}
+    selected = {sha for sha, _ in get_commit_log(grep=(grep_pattern(),))}
+    assert len(accepted) == 4
+    assert accepted <= selected
+    assert len(selected) == 5
@@ -1,5 +1,7 @@
 from semantic_release.history import emoji_parser
 
+from .. import wrapped_config_get
+
 
 def test_major():
     commit = ":boom: Breaking changes\n\n" "More description\n\n" "Even more description"
@@ -63,3 +65,12 @@ def test_emoji_in_description():
         ":boom: should not be detected",
     ]
     assert parsed_commit[4] == []
+
+
+def test_emoji_contained_in_another_emoji(mocker):
+    mocker.patch(
+        "semantic_release.history.parser_emoji.config",
+        wrapped_config_get(major_emoji=["💥"], minor_emoji=["✨💥"], patch_emoji=[]),
+    )
+    assert emoji_parser("✨💥 Add a feature")[0] == 3
+    assert [parsed.type for parsed in emoji_parser.parse_batch(["✨💥 Add", "✨ Add"])] == ["💥", "Other"]
@@ -1,4 +1,24 @@
-from semantic_release.history.parser_helpers import parse_paragraphs
+import pytest
+
+from semantic_release.errors import UnknownCommitMessageStyleError
+from semantic_release.history import (
+    angular_parser,
+    emoji_parser,
+    gitmoji_parser,
+    scipy_parser,
+    tag_parser,
+)
+from semantic_release.history.parser_helpers import (
+    BatchParser,
+    ParsedCommit,
+    ere_escape,
+    get_grep_pattern,
+    parse_batch,
+    parse_or_none,
+    parse_paragraphs,
+    with_grep_pattern,
+    with_parse_batch,
+)
 
 
 def test_parse_paragraphs_with_no_content():
@@ -16,3 +36,69 @@ def test_parse_paragraphs():
 def test_parse_paragraphs_multiline():
     paragraphs = parse_paragraphs("This paragraph is over\nmultiple lines.")
     assert paragraphs[0] == "This paragraph is over\nmultiple lines."
+
+
+@pytest.mark.parametrize("commit_parser", [angular_parser, emoji_parser, gitmoji_parser, scipy_parser, tag_parser])
+def test_bundled_parsers_batch_should_match_single_message_parsing(commit_parser):
+    messages = [
+        "feat(x): Add a feature",
+        "fix: Fix a bug\n\nBREAKING CHANGE: Changes everything",
+        ":boom: Breaking changes :sparkles:",
+        ":nut_and_bolt: Fix with a tag",
+        "ENH: enhance something",
+        "🐛 fix a bug",
+        "random commits are the worst",
+    ]
+    expected = [parse_or_none(commit_parser, message) for message in messages]
+    assert list(commit_parser.parse_batch(messages)) == expected
+
+
+def test_parse_batch_should_fall_back_to_single_message_parser():
+    def custom_parser(message):
+        if message == "unknown":
+            raise UnknownCommitMessageStyleError(message)
+        return ParsedCommit(1, "fix", None, [message], [])
+
+    assert list(parse_batch(custom_parser, ["fix", "unknown"])) == [ParsedCommit(1, "fix", None, ["fix"], []), None]
+
+
+def test_batch_parser_should_only_read_fed_messages():
+    read = []
+
+    def batch(messages):
+        for message in messages:
+            read.append(message)
+            yield ParsedCommit(0, message, None, [message], [])
+
+    @with_parse_batch(batch)
+    def custom_parser(message):
+        raise AssertionError("The batch API should be used")
+
+    parser = BatchParser(custom_parser)
+    assert parser.parse("first").type == "first"
+    assert read == ["first"]
+    assert parser.parse("second").type == "second"
+    assert read == ["first", "second"]
+
+
+def test_batch_parser_should_restart_a_batch_which_read_ahead():
+    @with_parse_batch(lambda messages: iter([ParsedCommit(0, message, None, [], []) for message in messages]))
+    def custom_parser(message):
+        raise AssertionError("The batch API should be used")
+
+    parser = BatchParser(custom_parser)
+    assert [parser.parse(message).type for message in ["first", "second"]] == ["first", "second"]
+
+
+def test_ere_escape():
+    assert ere_escape("1.0.0-rc.1+build") == r"1\.0\.0-rc\.1\+build"
+    assert ere_escape("(a|b)*[c]{2}?^$\\") == r"\(a\|b\)\*\[c]\{2}\?\^\$\\"
+
+
+def test_get_grep_pattern():
+    @with_grep_pattern(lambda: "^fix: .")
+    def custom_parser(message):
+        return ParsedCommit(1, "fix", None, [message], [])
+
+    assert get_grep_pattern(custom_parser) == "^fix: ."
+    assert get_grep_pattern(tag_parser) is None
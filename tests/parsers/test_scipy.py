@@ -1,4 +1,7 @@
+import re
+
 from semantic_release.history import scipy_parser
+from semantic_release.history.parser_scipy import GREP_PATTERN
 
 
 def test_valid_scipy_commit(valid_scipy_commit, expected_response_scipy):
@@ -9,3 +12,7 @@ def test_valid_scipy_commit(valid_scipy_commit, expected_response_scipy):
     assert result[1] == subject
     assert len(result[3]) == len(body_parts)
     assert all(a == b for a, b in zip(result[3], body_parts))
+
+
+def test_grep_pattern_should_match_valid_scipy_commit(valid_scipy_commit):
+    assert re.search(GREP_PATTERN, valid_scipy_commit, re.M)
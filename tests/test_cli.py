@@ -1,8 +1,12 @@
+import time
+
 from click.testing import CliRunner
 
-from semantic_release.cli import changelog, main, print_version, publish, version
+from semantic_release.cli import changelog, main, print_packages, print_version, publish, version
 from semantic_release.errors import GitError, ImproperConfigurationError
+from semantic_release.history.packages import Package, PackageRelease
 from semantic_release.repository import ArtifactRepo
+from semantic_release.settings import overload_configuration
 
 from . import mock, pytest, reset_config, wrapped_config_get
 from .mocks import mock_version_file
@@ -275,6 +279,41 @@ def test_print_version_change(mocker, runner, capsys):
     mock_evaluate_bump.assert_called_once_with("1.2.3", None)
 
 
+def test_cli_print_packages(mocker, runner):
+    mock_print_packages = mocker.patch("semantic_release.cli.print_packages")
+    result = runner.invoke(main, ["print-packages"])
+    mock_print_packages.assert_called_once_with(
+        force_level=None,
+        noop=False,
+        post=False,
+        retry=False,
+        define=(),
+    )
+    assert result.exit_code == 0
+
+
+def test_print_packages(mocker, capsys):
+    packages = [Package("core", "libs/core"), Package("web", "apps/web")]
+    mocker.patch("semantic_release.cli.get_packages", return_value=packages)
+    mock_analyze_packages = mocker.patch(
+        "semantic_release.cli.analyze_packages",
+        return_value={
+            "core": PackageRelease(packages[0], "1.0.0", "minor", "1.1.0", 3, {}),
+            "web": PackageRelease(packages[1], "0.2.0", None, "0.2.0", 0, {}),
+        },
+    )
+
+    assert print_packages()
+    assert capsys.readouterr().out == "core 1.0.0 1.1.0\nweb 0.2.0 0.2.0\n"
+    mock_analyze_packages.assert_called_once_with(packages)
+
+
+def test_print_packages_without_packages(mocker, capsys):
+    mocker.patch("semantic_release.cli.get_packages", return_value=[])
+    assert not print_packages()
+    assert capsys.readouterr().err == "No package is declared in the packages setting.\n"
+
+
 def test_print_version_force_major(mocker, runner, capsys):
     mock_current_version = mocker.patch("semantic_release.cli.get_current_version", return_value="1.2.3")
     mock_evaluate_bump = mocker.patch("semantic_release.cli.evaluate_version_bump", return_value="major")
@@ -516,6 +555,66 @@ def test_publish_should_call_functions(mocker):
     mock_checkout.assert_called_once_with("main")
 
 
+def test_publish_should_read_publish_concurrency_from_a_define(mocker):
+    settings = wrapped_config_get()
+    mocker.patch("semantic_release.settings.config", settings)
+    mocker.patch("semantic_release.cli.config", settings)
+    mocker.patch("semantic_release.cli.checkout")
+    mocker.patch("semantic_release.ci_checks.check")
+    mocker.patch("semantic_release.cli.should_bump_version", return_value=True)
+    mocker.patch(
+        "semantic_release.cli.get_repository_owner_and_name",
+        return_value=("mom1", "project-semantic-release"),
+    )
+    mocker.patch("semantic_release.cli.get_current_version", return_value="1.0.0")
+    mocker.patch("semantic_release.cli.evaluate_version_bump", lambda *x: "minor")
+    mocker.patch("semantic_release.cli.import_from_settings")
+    mocker.patch("semantic_release.cli.markdown_changelog", lambda *x, **y: "CHANGES")
+    mocker.patch("semantic_release.cli.update_changelog_file")
+    mocker.patch("semantic_release.cli.bump_version")
+    mocker.patch("semantic_release.cli.should_remove_dist", return_value=False)
+    mock_run_steps = mocker.patch("semantic_release.cli.run_steps")
+
+    overload_configuration(publish)(define=["publish_concurrency=4"])
+
+    assert mock_run_steps.call_args[1]["workers"] == 4
+
+
+def test_publish_should_not_upload_to_repository_when_push_fails(mocker):
+    def push_new_version(**kwargs):
+        # The build is done long before the push is rejected
+        time.sleep(0.2)
+        raise GitError("rejected")
+
+    mocker.patch("semantic_release.cli.config", wrapped_config_get(publish_concurrency=2))
+    mocker.patch("semantic_release.cli.push_new_version", push_new_version)
+    mocker.patch("semantic_release.cli.checkout")
+    mocker.patch("semantic_release.ci_checks.check")
+    mocker.patch("semantic_release.cli.should_bump_version", return_value=True)
+    mocker.patch.dict("os.environ", {"REPOSITORY_USERNAME": "repo-username", "REPOSITORY_PASSWORD": "repo-password"})
+    mock_repository = mocker.patch.object(ArtifactRepo, "upload")
+    mock_release = mocker.patch("semantic_release.cli.upload_to_release")
+    mocker.patch("semantic_release.cli.build_dists")
+    mocker.patch("semantic_release.cli.remove_dists")
+    mocker.patch(
+        "semantic_release.cli.get_repository_owner_and_name",
+        return_value=("mom1", "project-semantic-release"),
+    )
+    mocker.patch("semantic_release.cli.evaluate_version_bump", lambda *x: "feature")
+    mocker.patch("semantic_release.cli.import_from_settings")
+    mocker.patch("semantic_release.cli.markdown_changelog", lambda *x, **y: "CHANGES")
+    mocker.patch("semantic_release.cli.update_changelog_file")
+    mocker.patch("semantic_release.cli.bump_version")
+    mocker.patch("semantic_release.cli.get_new_version", lambda *x: "2.0.0")
+    mocker.patch("semantic_release.cli.check_token", lambda: True)
+
+    with pytest.raises(GitError):
+        publish()
+
+    assert not mock_repository.called
+    assert not mock_release.called
+
+
 def test_publish_should_skip_build_when_command_is_empty(mocker):
     mock_push = mocker.patch("semantic_release.cli.push_new_version")
     mock_checkout = mocker.patch("semantic_release.cli.checkout")
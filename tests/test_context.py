@@ -0,0 +1,172 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from semantic_release.context import (
+    ReleaseContext,
+    ReplayableIterator,
+    get_release_context,
+    invalidate_release_context,
+    memoized,
+    with_release_context,
+)
+from semantic_release.history import angular_parser
+from semantic_release.history.logs import evaluate_version_bump, generate_changelog, get_commits
+from semantic_release.vcs_helpers import Actor, CommitRecord, Tree, checkout, get_commit_log
+
+from .history import MINOR, PATCH
+
+
+def test_replayable_iterator_should_read_once():
+    read = []
+
+    def numbers():
+        for i in range(5):
+            read.append(i)
+            yield i
+
+    iterable = ReplayableIterator(numbers())
+    for i in iterable:
+        if i == 2:
+            break
+    assert read == [0, 1, 2]
+    assert list(iterable) == [0, 1, 2, 3, 4]
+    assert list(iterable) == [0, 1, 2, 3, 4]
+    assert read == [0, 1, 2, 3, 4]
+
+
+def test_replayable_iterator_close():
+    def numbers():
+        try:
+            yield 1
+            yield 2
+        finally:
+            closed.append(True)
+
+    closed = []
+    iterable = ReplayableIterator(numbers())
+    next(iter(iterable))
+    iterable.close()
+    assert closed == [True]
+    assert list(iterable) == [1]
+
+
+def test_release_context_should_be_active_only_inside():
+    assert get_release_context() is None
+    with ReleaseContext() as outer:
+        assert get_release_context() is outer
+        with ReleaseContext() as inner:
+            assert get_release_context() is inner
+        assert get_release_context() is outer
+    assert get_release_context() is None
+
+
+def test_memoized_should_only_memoize_inside_release_context():
+    calls = []
+
+    @memoized
+    def changelog(version):
+        calls.append(version)
+        return {"feature": [version]}
+
+    changelog("1.0.0")
+    changelog("1.0.0")
+    assert len(calls) == 2
+
+    with ReleaseContext():
+        result = changelog("1.0.0")
+        result["feature"].append("modified")
+        assert changelog("1.0.0") == {"feature": ["1.0.0"]}
+        changelog("2.0.0")
+        assert calls == ["1.0.0", "1.0.0", "1.0.0", "2.0.0"]
+
+        invalidate_release_context()
+        changelog("1.0.0")
+        assert len(calls) == 5
+
+
+def test_with_release_context():
+    @with_release_context
+    def command():
+        return get_release_context()
+
+    assert isinstance(command(), ReleaseContext)
+    assert command() is not command()
+    assert get_release_context() is None
+
+
+@pytest.fixture
+def log_backend(mocker):
+    date = datetime(2022, 1, 1, tzinfo=timezone.utc)
+    author = Actor("Alice", "alice@example.com")
+    records = [CommitRecord(sha * 10, Tree("0" * 40), author, date, author, date, msg) for sha, msg in [MINOR, PATCH]]
+    backend = mocker.Mock(side_effect=lambda rev: iter(records))
+    mocker.patch.dict("semantic_release.vcs_helpers.LOG_BACKENDS", {"git": backend})
+    return backend
+
+
+@pytest.fixture
+def commit_parser(mocker):
+    parser = mocker.Mock(side_effect=angular_parser, spec=[])
+    mocker.patch("semantic_release.history.logs.import_from_settings", return_value=parser)
+    return parser
+
+
+def test_release_context_should_walk_and_parse_once(log_backend, commit_parser):
+    with ReleaseContext(replay_commits=True):
+        assert evaluate_version_bump("9.9.9") == "minor"
+        changelog = generate_changelog("9.9.9")
+        commits = get_commits("9.9.9")
+        assert evaluate_version_bump("9.9.9") == "minor"
+
+    assert changelog["feature"][0][0] == MINOR[0] * 10
+    assert changelog["fix"][0][0] == PATCH[0] * 10
+    assert [commit["type"] for commit in commits] == ["feature", "fix"]
+    log_backend.assert_called_once_with(None)
+    assert commit_parser.call_count == 2
+
+
+def test_release_context_should_not_reuse_walks_after_checkout(git_repo):
+    for message in ["0.1.0", "fix: One", "feat: Two"]:
+        git_repo.git.commit("--allow-empty", "-m", message)
+        if message == "0.1.0":
+            git_repo.git.tag("v0.1.0")
+    branch = git_repo.active_branch.name
+    git_repo.git.checkout("HEAD~1")
+
+    with ReleaseContext(replay_commits=True):
+        assert evaluate_version_bump("0.1.0") == "patch"
+        checkout(branch)
+        changelog = generate_changelog("0.1.0")
+        assert evaluate_version_bump("0.1.0") == "minor"
+
+    assert [message for _, message in changelog["feature"]] == ["Two"]
+    assert [message for _, message in changelog["fix"]] == ["One"]
+
+
+def test_release_context_walks_should_depend_on_head(git_repo):
+    git_repo.git.commit("--allow-empty", "-m", "fix: One")
+    with ReleaseContext(replay_commits=True):
+        assert len(list(get_commit_log())) == 1
+        # HEAD moves without going through semantic-release
+        git_repo.git.commit("--allow-empty", "-m", "feat: Two")
+        assert len(list(get_commit_log())) == 2
+
+
+def test_release_context_should_stream_commits_without_replay(log_backend, commit_parser):
+    with ReleaseContext():
+        assert evaluate_version_bump("9.9.9") == "minor"
+        assert evaluate_version_bump("9.9.9") == "minor"
+        generate_changelog("9.9.9")
+
+    # The results and the parsed commits are memoized, the log is read by each walk
+    assert log_backend.call_count == 2
+    assert commit_parser.call_count == 2
+
+
+def test_with_release_context_replay_commits():
+    @with_release_context(replay_commits=True)
+    def command():
+        return get_release_context().replay_commits
+
+    assert command()
@@ -0,0 +1,69 @@
+import logging
+
+from semantic_release.errors import ImproperConfigurationError
+from semantic_release.helpers import LazyImport, LoggedFunction, format_arg
+
+logger = logging.getLogger("semantic_release.tests.helpers")
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("Arguments should not be formatted when debug logging is disabled")
+
+
+def test_logged_function_should_not_format_when_debug_disabled(caplog):
+    caplog.set_level(logging.INFO, logger=logger.name)
+
+    @LoggedFunction(logger)
+    def identity(value):
+        return value
+
+    value = Unformattable()
+    assert identity(value) is value
+    assert caplog.messages == []
+
+
+def test_logged_function_should_log_arguments_and_result(caplog):
+    caplog.set_level(logging.DEBUG, logger=logger.name)
+
+    @LoggedFunction(logger)
+    def add(a, b=0):
+        return a + b
+
+    assert add(1, b=2) == 3
+    assert caplog.messages == ["add(1, b=2)", "add -> 3"]
+
+
+def test_logged_function_should_truncate(caplog):
+    caplog.set_level(logging.DEBUG, logger=logger.name)
+
+    @LoggedFunction(logger, max_length=5)
+    def upper(message):
+        return message.upper()
+
+    upper("abcdefgh")
+    assert caplog.messages == ["upper('abcd...<10 chars>)", "upper -> ABCDE...<8 chars>"]
+
+
+def test_logged_function_should_not_wrap_hot_functions_when_disabled(mocker):
+    def parse(message):
+        return message
+
+    mocker.patch.object(LoggedFunction, "hot_path_logging", False)
+    assert LoggedFunction(logger, hot=True)(parse) is parse
+    assert LoggedFunction(logger)(parse) is not parse
+
+
+def test_format_arg():
+    assert format_arg(" message\n") == "'message'"
+    assert format_arg(12345, max_length=3) == "123...<5 chars>"
+
+
+def test_lazy_import_should_resolve_on_use(mocker):
+    lazy = LazyImport("semantic_release.errors", "ImproperConfigurationError")
+    assert repr(lazy) == "<lazy semantic_release.errors.ImproperConfigurationError>"
+    assert isinstance(lazy("message"), ImproperConfigurationError)
+    assert lazy.__name__ == "ImproperConfigurationError"
+
+    mocker.patch("semantic_release.errors.ImproperConfigurationError", return_value="patched")
+    assert lazy("message") == "patched"
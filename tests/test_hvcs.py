@@ -1,7 +1,9 @@
 import base64
 import json
+import logging
 import os
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import NamedTemporaryFile
 from unittest import TestCase
 
@@ -10,13 +12,18 @@ import responses
 
 from semantic_release.errors import ImproperConfigurationError
 from semantic_release.hvcs import (
+    AssetUpload,
     Github,
     Gitlab,
+    UploadStream,
     check_build_status,
     check_token,
+    close_clients,
     get_hvcs,
     post_changelog,
+    upload_concurrently,
 )
+from semantic_release.settings import overload_configuration
 
 from . import mock, wrapped_config_get
 from .mocks.mock_gitlab import mock_gitlab
@@ -420,6 +427,117 @@ class GithubReleaseTests(TestCase):
         os.remove(dummy_file_path)
 
 
+@responses.activate
+@mock.patch("semantic_release.hvcs.Github.token", return_value="super-token")
+@mock.patch("semantic_release.hvcs.config", wrapped_config_get(upload_concurrency=3))
+def test_upload_dists_should_upload_concurrently(mock_token, tmp_path):
+    names = [f"package-{i}-py3-none-any.whl" for i in range(6)]
+    for name in names:
+        (tmp_path / name).write_text(name)
+    uploaded = []
+
+    def request_callback(request):
+        name = request.body.decode()
+        uploaded.append(name)
+        return (500 if name == names[4] else 201), {}, json.dumps({})
+
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/mom1/rmoq/releases/tags/v1.0.0",
+        status=200,
+        body='{"id": 1}',
+        content_type="application/json",
+    )
+    responses.add_callback(
+        responses.POST, "https://uploads.github.com/repos/mom1/rmoq/releases/1/assets", callback=request_callback
+    )
+    with mock.patch("semantic_release.hvcs.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as executor:
+        assert not Github.upload_dists("mom1", "rmoq", "1.0.0", str(tmp_path))
+
+    executor.assert_called_once_with(3, thread_name_prefix="upload")
+    assert sorted(uploaded) == names
+
+
+def test_upload_concurrency_should_be_read_from_a_define(mocker):
+    settings = wrapped_config_get()
+    mocker.patch("semantic_release.settings.config", settings)
+    mocker.patch("semantic_release.hvcs.config", settings)
+    executor = mocker.patch("semantic_release.hvcs.ThreadPoolExecutor", wraps=ThreadPoolExecutor)
+
+    @overload_configuration
+    def upload(define=()):
+        return upload_concurrently(lambda file: AssetUpload(file, True, 0), ["a", "b", "c"])
+
+    assert upload(define=["upload_concurrency=2"]) == [AssetUpload(file, True, 0) for file in "abc"]
+    executor.assert_called_once_with(2, thread_name_prefix="upload")
+
+
+def test_upload_stream_should_read_in_chunks(tmp_path, caplog):
+    caplog.set_level(logging.DEBUG, logger="semantic_release.hvcs")
+    path = tmp_path / "package.whl"
+    path.write_bytes(b"x" * 100)
+
+    with path.open("rb") as fileobj:
+        stream = UploadStream(fileobj, path.name)
+        assert len(stream) == 100
+        assert [len(chunk) for chunk in iter(lambda: stream.read(30), b"")] == [30, 30, 30, 10]
+        assert stream.tell() == 100
+        stream.seek(0)
+        assert stream.read() == b"x" * 100
+
+    assert caplog.messages[:3] == [
+        "Uploading package.whl: 30% of 100 bytes",
+        "Uploading package.whl: 60% of 100 bytes",
+        "Uploading package.whl: 90% of 100 bytes",
+    ]
+    assert caplog.messages[3].startswith("Uploaded package.whl: 100 bytes in ")
+
+
+@mock.patch.dict("semantic_release.hvcs._clients", clear=True)
+@mock.patch("semantic_release.hvcs.config", wrapped_config_get(hvcs_pool_size=16))
+def test_github_session_should_be_shared():
+    with mock.patch.dict(os.environ, {"GH_TOKEN": "token"}):
+        session = Github.session()
+        assert Github.session() is session
+        assert session.get_adapter("https://api.github.com")._pool_maxsize == 16
+        assert Github.session(retry=False) is not session
+
+    with mock.patch.dict(os.environ, {"GH_TOKEN": "other-token"}):
+        assert Github.session() is not session
+
+    close_clients()
+    assert Github.session() is not session
+
+
+@mock.patch.dict("semantic_release.hvcs._clients", clear=True)
+def test_hvcs_pool_size_should_be_read_from_a_define(mocker):
+    settings = wrapped_config_get()
+    mocker.patch("semantic_release.settings.config", settings)
+    mocker.patch("semantic_release.hvcs.config", settings)
+
+    @overload_configuration
+    def session(define=()):
+        return Github.session()
+
+    with mock.patch.dict(os.environ, {"GH_TOKEN": "token"}):
+        assert session(define=["hvcs_pool_size=16"]).get_adapter("https://api.github.com")._pool_maxsize == 16
+
+
+@mock.patch.dict("semantic_release.hvcs._clients", clear=True)
+@mock.patch("gitlab.Gitlab.auth")
+def test_gitlab_client_should_be_shared_and_authenticated_once(mock_auth):
+    with mock.patch.dict(os.environ, {"GL_TOKEN": "token"}):
+        client = Gitlab.client()
+        mock_auth.assert_not_called()
+        assert Gitlab.client(authenticate=True) is client
+        mock_auth.assert_called_once_with()
+
+        client.user = object()
+        assert Gitlab.client(authenticate=True) is client
+        mock_auth.assert_called_once_with()
+        assert Gitlab.client(ssl_verify=False) is not client
+
+
 class GitlabReleaseTests(TestCase):
     @mock_gitlab()
     def test_should_return_true_if_success(self, mock_auth, mock_project):
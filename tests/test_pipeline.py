@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from semantic_release.pipeline import Step, run_steps
+
+
+def recorder(calls, name, error=None, wait_for=None):
+    def func():
+        if wait_for is not None:
+            assert wait_for.wait(5)
+        calls.append(name)
+        if error:
+            raise error
+
+    return func
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_steps_should_follow_requirements(workers):
+    calls = []
+    run_steps(
+        [
+            Step("push", recorder(calls, "push"), []),
+            Step("build", recorder(calls, "build"), []),
+            Step("upload", recorder(calls, "upload"), ["build"]),
+            Step("release", recorder(calls, "release"), ["push", "upload"]),
+        ],
+        workers=workers,
+    )
+    assert sorted(calls) == ["build", "push", "release", "upload"]
+    assert calls.index("upload") > calls.index("build")
+    assert calls[-1] == "release"
+    if workers == 1:
+        assert calls == ["push", "build", "upload", "release"]
+
+
+def test_run_steps_should_overlap_independent_steps():
+    calls = []
+    pushed = threading.Event()
+    run_steps(
+        [
+            # build can only complete while push runs in another thread
+            Step("build", recorder(calls, "build", wait_for=pushed), []),
+            Step("push", lambda: (calls.append("push"), pushed.set()), []),
+        ],
+        workers=2,
+    )
+    assert calls == ["push", "build"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_steps_should_stop_after_a_failure(workers):
+    calls = []
+    with pytest.raises(RuntimeError, match="build failed"):
+        run_steps(
+            [
+                Step("build", recorder(calls, "build", RuntimeError("build failed")), []),
+                Step("upload", recorder(calls, "upload"), ["build"]),
+                Step("post", recorder(calls, "post"), ["upload"]),
+            ],
+            workers=workers,
+        )
+    assert calls == ["build"]
+
+
+def test_run_steps_should_raise_the_first_failure_of_the_list():
+    calls = []
+    released = threading.Event()
+    with pytest.raises(ValueError, match="first"):
+        run_steps(
+            [
+                Step("first", recorder(calls, "first", ValueError("first"), wait_for=released), []),
+                Step("second", lambda: (released.set(), calls.append("second"), 1 / 0), []),
+            ],
+            workers=2,
+        )
+    assert sorted(calls) == ["first", "second"]
+
+
+def test_run_steps_should_reject_later_requirements():
+    with pytest.raises(ValueError, match="'upload' requires build"):
+        run_steps([Step("upload", lambda: None, ["build"]), Step("build", lambda: None, [])])
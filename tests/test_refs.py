@@ -0,0 +1,184 @@
+import mmap
+import subprocess
+
+import pytest
+
+from semantic_release.refs import (
+    TagRefs,
+    parse_packed_refs,
+    peel_object,
+    read_packed_ref,
+    read_packed_refs,
+    resolve_ref,
+)
+
+from . import mock
+
+SHA_1 = "1" * 40
+SHA_2 = "2" * 40
+SHA_3 = "3" * 40
+
+
+@pytest.fixture
+def git_dir(tmp_path):
+    (tmp_path / "refs" / "heads").mkdir(parents=True)
+    (tmp_path / "refs" / "tags").mkdir()
+    (tmp_path / "HEAD").write_text("ref: refs/heads/main\n")
+    return tmp_path
+
+
+def test_resolve_ref_should_follow_head_to_a_loose_ref(git_dir):
+    (git_dir / "refs" / "heads" / "main").write_text(f"{SHA_1}\n")
+    assert resolve_ref(git_dir) == SHA_1
+    assert resolve_ref(git_dir, "refs/heads/main") == SHA_1
+
+
+def test_resolve_ref_should_read_packed_refs(git_dir):
+    (git_dir / "packed-refs").write_text(
+        f"# pack-refs with: peeled fully-peeled sorted\n{SHA_1} refs/heads/main\n{SHA_2} refs/tags/v1.0.0\n^{SHA_1}\n"
+    )
+    assert resolve_ref(git_dir) == SHA_1
+    assert resolve_ref(git_dir, "refs/tags/v1.0.0") == SHA_2
+    assert read_packed_ref(git_dir, "refs/tags/v1.0.0") == SHA_2
+    assert read_packed_ref(git_dir, "refs/tags/v2.0.0") is None
+
+
+def test_resolve_ref_should_prefer_loose_refs(git_dir):
+    (git_dir / "packed-refs").write_text(f"{SHA_1} refs/heads/main\n")
+    (git_dir / "refs" / "heads" / "main").write_text(f"{SHA_2}\n")
+    assert resolve_ref(git_dir) == SHA_2
+
+
+def test_resolve_ref_detached_head(git_dir):
+    (git_dir / "HEAD").write_text(f"{SHA_2}\n")
+    assert resolve_ref(git_dir) == SHA_2
+
+
+def test_resolve_ref_should_return_none_when_unresolved(git_dir):
+    assert resolve_ref(git_dir) is None
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "refs" / "heads" / "main").write_text("ref: refs/heads/main\n")
+    assert resolve_ref(git_dir) is None
+
+
+def test_resolve_ref_in_linked_worktree(tmp_path):
+    common_dir = tmp_path / "repo" / ".git"
+    (common_dir / "refs" / "heads").mkdir(parents=True)
+    (common_dir / "refs" / "heads" / "feature").write_text(f"{SHA_1}\n")
+    git_dir = common_dir / "worktrees" / "feature"
+    git_dir.mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/feature\n")
+    (git_dir / "commondir").write_text("../..\n")
+    assert resolve_ref(git_dir) == SHA_1
+
+
+@pytest.fixture
+def git(tmp_path):
+    def run(*args):
+        return subprocess.run(
+            ["git", "-c", "user.name=a", "-c", "user.email=a@a", *args],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+
+    run("init", "--quiet")
+    return run
+
+
+def test_resolve_ref_should_match_git(tmp_path, git):
+    git("commit", "--quiet", "--allow-empty", "-m", "first")
+    git("tag", "v1.0.0")
+    git("pack-refs", "--all")
+    git("commit", "--quiet", "--allow-empty", "-m", "second")
+
+    assert resolve_ref(tmp_path / ".git") == git("rev-parse", "HEAD")
+    assert resolve_ref(tmp_path / ".git", "refs/tags/v1.0.0") == git("rev-parse", "v1.0.0")
+
+
+PACKED_REFS = (
+    f"{SHA_1} refs/heads/main\n"
+    f"{SHA_2} refs/tags/v1.0.0\n"
+    f"^{SHA_1}\n"
+    f"{SHA_1} refs/tags/v1.1.0\n"
+    f"{SHA_3} refs/zzz/v1.0.0\n"
+).encode()
+
+
+def test_parse_packed_refs_with_peeled_tags():
+    data = b"# pack-refs with: peeled fully-peeled sorted \n" + PACKED_REFS
+    assert parse_packed_refs(data, "refs/tags/") == {
+        "refs/tags/v1.0.0": (SHA_2, SHA_1),
+        "refs/tags/v1.1.0": (SHA_1, SHA_1),
+    }
+    assert parse_packed_refs(data, "refs/remotes/") == {}
+
+
+def test_parse_packed_refs_should_stop_after_the_prefix_when_sorted():
+    data = b"# pack-refs with: sorted\n" + PACKED_REFS + f"{SHA_3} refs/tags/v9.0.0\n".encode()
+    assert list(parse_packed_refs(data, "refs/tags/")) == ["refs/tags/v1.0.0", "refs/tags/v1.1.0"]
+
+
+def test_parse_packed_refs_without_peeled_tags():
+    assert parse_packed_refs(PACKED_REFS + f"{SHA_3} refs/tags/v9.0.0".encode(), "refs/tags/") == {
+        "refs/tags/v1.0.0": (SHA_2, SHA_1),
+        "refs/tags/v1.1.0": (SHA_1, None),
+        "refs/tags/v9.0.0": (SHA_3, None),
+    }
+
+
+@mock.patch("semantic_release.refs.MMAP_THRESHOLD", 0)
+def test_read_packed_refs_should_map_large_files(git_dir):
+    (git_dir / "packed-refs").write_bytes(b"# pack-refs with: peeled sorted\n" + PACKED_REFS)
+    with mock.patch("semantic_release.refs.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+        assert read_packed_refs(git_dir, "refs/tags/")["refs/tags/v1.0.0"] == (SHA_2, SHA_1)
+    mock_mmap.assert_called_once()
+
+
+def test_tag_refs_should_prefer_loose_refs(git_dir):
+    (git_dir / "packed-refs").write_text(f"# pack-refs with: peeled sorted\n{SHA_1} refs/tags/v1.0.0\n")
+    tag_refs = TagRefs.read(git_dir)
+    (git_dir / "refs" / "tags" / "v1.0.0").write_text(f"{SHA_2}\n")
+    (git_dir / "refs" / "tags" / "v1.1.0").write_text("ref: refs/tags/v1.0.0\n")
+    assert tag_refs.get("v1.0.0") == (SHA_2, None)
+    assert tag_refs.get("v1.1.0") is None
+    tag_refs.add("v1.2.0", SHA_3)
+    assert tag_refs.commit("v1.2.0") == SHA_3
+
+
+def test_tag_refs_should_peel_loose_tags(tmp_path, git):
+    git("commit", "--quiet", "--allow-empty", "-m", "first")
+    git("tag", "-a", "v1.0.0", "-m", "v1.0.0")
+    git("tag", "-a", "v1.0.0-signed", "-m", "tag of a tag", "v1.0.0")
+    git("tag", "v1.1.0")
+    head = git("rev-parse", "HEAD")
+
+    assert peel_object(tmp_path / ".git", git("rev-parse", "v1.0.0")) == head
+    tag_refs = TagRefs.read(tmp_path / ".git")
+    assert tag_refs.commit("v1.0.0") == head
+    assert tag_refs.commit("v1.0.0-signed") == head
+    assert tag_refs.commit("v1.1.0") == head
+    assert tag_refs.commit("v2.0.0") is None
+    assert "v1.0.0" in tag_refs
+    assert "v2.0.0" not in tag_refs
+
+
+def test_tag_refs_should_read_peeled_packed_tags(tmp_path, git):
+    git("commit", "--quiet", "--allow-empty", "-m", "first")
+    git("tag", "-a", "v1.0.0", "-m", "v1.0.0")
+    git("gc", "--quiet")
+    head = git("rev-parse", "HEAD")
+
+    tag_refs = TagRefs.read(tmp_path / ".git")
+    with mock.patch("semantic_release.refs.peel_object") as mock_peel:
+        assert tag_refs.commit("v1.0.0") == head
+    mock_peel.assert_not_called()
+
+
+def test_tag_refs_should_not_read_reftable_repositories(git_dir):
+    (git_dir / "reftable").mkdir()
+    (git_dir / "refs" / "tags" / "v1.0.0").write_text(f"{SHA_1}\n")
+    tag_refs = TagRefs.read(git_dir)
+    assert not tag_refs.readable
+    assert tag_refs.commit("v1.0.0") is None
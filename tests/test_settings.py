@@ -5,7 +5,12 @@ from unittest import TestCase
 
 from semantic_release.errors import ImproperConfigurationError
 from semantic_release.history import parser_angular
-from semantic_release.settings import _config, import_from_settings
+from semantic_release.settings import (
+    _config,
+    get_settings,
+    import_from_settings,
+    overload_configuration,
+)
 
 from . import mock, reset_config, wrapped_config_get
 
@@ -98,3 +103,46 @@ foo = "bar"
 
     def test_current_commit_parser_should_return_correct_parser(self):
         self.assertEqual(import_from_settings("commit_parser"), parser_angular.parse_commit_message)
+
+
+class SettingsSnapshotTests(TestCase):
+    def test_snapshot_should_convert_settings(self):
+        settings = get_settings(
+            wrapped_config_get(
+                patch_without_tag="false",
+                major_on_zero="true",
+                hvcs="GitLab",
+                hvcs_pool_size="16",
+                parser_angular_minor_types="feat, docs",
+                parse_workers="4",
+                publish_concurrency="2",
+                upload_concurrency="3",
+            )
+        )
+        self.assertFalse(settings.patch_without_tag)
+        self.assertTrue(settings.major_on_zero)
+        self.assertEqual(settings.hvcs, "gitlab")
+        self.assertEqual(settings.hvcs_pool_size, 16)
+        self.assertEqual(settings.parser_angular_minor_types, ("feat", "docs"))
+        self.assertEqual(settings.parse_workers, 4)
+        self.assertEqual(settings.publish_concurrency, 2)
+        self.assertEqual(settings.upload_concurrency, 3)
+
+    def test_snapshot_should_be_frozen(self):
+        with self.assertRaises(AttributeError):
+            get_settings().hvcs = "gitlab"  # type: ignore
+
+    def test_snapshot_should_be_built_once_per_settings_object(self):
+        settings = wrapped_config_get()
+        self.assertIs(get_settings(settings), get_settings(settings))
+        self.assertIsNot(get_settings(settings), get_settings(wrapped_config_get()))
+
+    def test_overload_configuration_should_rebuild_snapshot(self):
+        snapshot = get_settings()
+
+        @overload_configuration
+        def command(define=()):
+            return get_settings()
+
+        self.assertIs(command(define=["not_a_pair"]), snapshot)
+        self.assertEqual(command(define=["minor_tag=:new:"]).minor_tag, ":new:")
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+# Modules which are only needed to build, upload or post a release
+HEAVY_MODULES = ["chevron", "gitlab", "invoke", "requests", "semver", "tomlkit", "twine", "urllib3"]
+
+
+def imported_modules(statement):
+    code = f"import sys\n{statement}\nprint('\\n'.join(sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return {name.partition(".")[0] for name in output.splitlines()}
+
+
+def test_cli_import_should_not_load_heavy_modules():
+    assert imported_modules("import semantic_release.cli").isdisjoint(HEAVY_MODULES)
+
+
+def test_cli_import_should_not_open_the_repository():
+    code = "import semantic_release.cli; from semantic_release import vcs_helpers; print(vcs_helpers.repo.opened)"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == "False"
+
+
+def test_print_current_version_should_not_load_release_modules():
+    modules = imported_modules(
+        "from semantic_release.cli import main\n"
+        "try:\n"
+        "    main(['print-version', '--current'], standalone_mode=False)\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    assert modules.isdisjoint(["chevron", "gitlab", "invoke", "requests", "twine"])
@@ -1,22 +1,38 @@
+import io
 import os
-from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 
-import git
 import pytest
-from git import GitCommandError, Repo, TagObject
+from git import GitCommandError
 
+from semantic_release import vcs_helpers
 from semantic_release.errors import GitError, HvcsRepoParseError
+from semantic_release.refs import TagRefs
 from semantic_release.vcs_helpers import (
+    TAG_FORMAT,
+    TagIndex,
     check_repo,
     checkout,
     commit_new_version,
+    describe_previous_version,
     get_commit_log,
+    get_commit_pathspecs,
+    get_commits_beetwen,
     get_current_head_hash,
     get_last_version,
+    get_release_commit_log,
     get_repository_owner_and_name,
+    get_tag_index,
     get_version_from_tag,
+    insert_into_file,
+    iter_commits,
+    iter_commits_git,
+    iter_commits_gitpython,
+    iter_records,
+    parse_commit_record,
     push_new_version,
+    resolve_rev,
     tag_new_version,
     update_changelog_file,
 )
@@ -39,6 +55,134 @@ def test_first_commit_is_not_initial_commit():
     assert next(get_commit_log()) != "Initial commit"
 
 
+@mock.patch("semantic_release.vcs_helpers.COMMIT_LOG_CHUNK_SIZE", 3)
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        (b"", []),
+        (b"first\0", [b"first"]),
+        (b"first\0second\nline\0", [b"first", b"second\nline"]),
+        (b"first\0unterminated", [b"first", b"unterminated"]),
+    ],
+)
+def test_iter_records(data, expected):
+    assert list(iter_records(io.BytesIO(data))) == expected
+
+
+def test_parse_commit_record():
+    record = parse_commit_record(
+        "\x1f".join(
+            [
+                "a" * 40,
+                "b" * 40,
+                "Alice",
+                "alice@example.com",
+                "2022-01-23T10:00:00+03:00",
+                "Bob",
+                "bob@example.com",
+                "2022-01-24T10:00:00+00:00",
+                "feat: add a\x1fb\n\nbody\n",
+            ]
+        ).encode()
+    )
+    assert record.hexsha == "a" * 40
+    assert record.tree.hexsha == "b" * 40
+    assert record.author.name == "Alice"
+    assert record.author.email == "alice@example.com"
+    assert record.authored_datetime == datetime(2022, 1, 23, 10, tzinfo=timezone(timedelta(hours=3)))
+    assert record.committer.name == "Bob"
+    assert record.committer.email == "bob@example.com"
+    assert str(record.committed_datetime) == "2022-01-24 10:00:00+00:00"
+    assert record.message == "feat: add a\x1fb\n\nbody\n"
+
+
+def test_log_backends_should_yield_the_same_commits():
+    attributes = [
+        lambda c: c.hexsha,
+        lambda c: c.tree.hexsha,
+        lambda c: (c.author.name, c.author.email, str(c.authored_datetime)),
+        lambda c: (c.committer.name, c.committer.email, str(c.committed_datetime)),
+        lambda c: c.message,
+    ]
+    git_commits = [[attr(c) for attr in attributes] for c in iter_commits_git()]
+    gitpython_commits = [[attr(c) for attr in attributes] for c in iter_commits_gitpython()]
+    assert git_commits == gitpython_commits
+
+
+def test_iter_commits_should_use_configured_backend(mocker):
+    mocker.patch("semantic_release.vcs_helpers.config", wrapped_config_get(commit_log_backend="gitpython"))
+    backend = mocker.patch.dict("semantic_release.vcs_helpers.LOG_BACKENDS", {"gitpython": mock.Mock(return_value=[])})
+    assert list(iter_commits("v1.0.0...")) == []
+    backend["gitpython"].assert_called_once_with("v1.0.0...")
+
+
+def test_iter_commits_should_import_custom_backend(mocker):
+    mocker.patch("semantic_release.vcs_helpers.config", wrapped_config_get(commit_log_backend="tests.custom_backend"))
+    mocker.patch("tests.custom_backend", mock.Mock(return_value=iter(["commit"])), create=True)
+    assert list(iter_commits()) == ["commit"]
+
+
+def test_iter_commits_should_give_the_pathspecs_to_the_backend(mocker):
+    mocker.patch("semantic_release.vcs_helpers.config", wrapped_config_get(commit_log_backend="gitpython"))
+    mocker.patch("semantic_release.vcs_helpers.get_commit_pathspecs", return_value=("libs/core",))
+    backend = mocker.patch.dict("semantic_release.vcs_helpers.LOG_BACKENDS", {"gitpython": mock.Mock(return_value=[])})
+    assert list(iter_commits("v1.0.0...")) == []
+    backend["gitpython"].assert_called_once_with("v1.0.0...", ("libs/core",))
+
+
+@pytest.fixture
+def subdirectory_repo(git_repo, tmp_path, monkeypatch):
+    for message, path in [
+        ("feat: core", "libs/core/a.py"),
+        ("fix: web", "apps/web/b.py"),
+        ("fix: core", "libs/core/c.py"),
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(message)
+        git_repo.git.add(path)
+        git_repo.git.commit("-m", message)
+    monkeypatch.chdir(tmp_path / "libs" / "core")
+    return git_repo
+
+
+def test_get_commit_pathspecs(subdirectory_repo, mocker):
+    mocker.patch(
+        "semantic_release.vcs_helpers.config",
+        wrapped_config_get(commit_paths=[".", "../shared", ":(exclude)docs"]),
+    )
+    assert get_commit_pathspecs() == ("libs/core", "libs/shared", ":(exclude)docs")
+
+
+@pytest.mark.parametrize("backend", ["git", "gitpython"])
+def test_get_commit_log_should_only_list_commits_changing_the_commit_paths(subdirectory_repo, mocker, backend):
+    mocker.patch("semantic_release.vcs_helpers.config", wrapped_config_get(commit_log_backend=backend))
+    assert [message for _, message in get_commit_log()] == ["fix: core\n", "fix: web\n", "feat: core\n"]
+
+    mocker.patch(
+        "semantic_release.vcs_helpers.config", wrapped_config_get(commit_log_backend=backend, commit_paths=".")
+    )
+    assert [message for _, message in get_commit_log()] == ["fix: core\n", "feat: core\n"]
+    assert [commit.message for commit in get_commits_beetwen()] == ["fix: core\n", "feat: core\n"]
+
+
+@pytest.mark.parametrize("backend", ["git", "gitpython"])
+def test_get_commit_log_should_only_list_commits_matching_the_grep_patterns(subdirectory_repo, mocker, backend):
+    mocker.patch("semantic_release.vcs_helpers.config", wrapped_config_get(commit_log_backend=backend))
+    assert [message for _, message in get_commit_log(grep=("^feat: .", r"^web$"))] == ["feat: core\n"]
+    assert [message for _, message in get_commit_log(grep=("^fix", "^feat"))] == [
+        "fix: core\n",
+        "fix: web\n",
+        "feat: core\n",
+    ]
+
+
+def test_iter_commits_should_not_give_the_grep_patterns_to_a_custom_backend(mocker):
+    mocker.patch("semantic_release.vcs_helpers.config", wrapped_config_get(commit_log_backend="tests.custom_backend"))
+    backend = mocker.patch("tests.custom_backend", mock.Mock(return_value=iter(["commit"])), create=True)
+    assert list(iter_commits(grep=("^fix",))) == ["commit"]
+    backend.assert_called_once_with(None)
+
+
 @pytest.mark.parametrize(
     "params",
     [
@@ -266,8 +410,16 @@ def test_get_repository_owner_and_name_gitlab(mocker, origin_url, expected_resul
 
 
 def test_get_current_head_hash(mocker):
-    mocker.patch("git.objects.commit.Commit.name_rev", "commit-hash branch-name")
-    assert get_current_head_hash() == "commit-hash"
+    name_rev = mocker.patch("git.objects.commit.Commit.name_rev", new_callable=mock.PropertyMock)
+    assert get_current_head_hash() == vcs_helpers.repo.head.commit.hexsha
+    name_rev.assert_not_called()
+
+
+def test_resolve_rev_should_ask_git_when_refs_cannot_be_read(mock_git, mocker):
+    mocker.patch("semantic_release.vcs_helpers.resolve_ref", return_value=None)
+    mock_git.rev_parse.return_value = "commit-hash"
+    assert resolve_rev("refs/heads/main") == "commit-hash"
+    mock_git.rev_parse.assert_called_once_with("refs/heads/main")
 
 
 @mock.patch("semantic_release.vcs_helpers.config", wrapped_config_get(hvcs="gitlab"))
@@ -283,6 +435,37 @@ def test_checkout_should_checkout_correct_branch(mock_git):
     mock_git.checkout.assert_called_once_with("a-branch")
 
 
+FOR_EACH_REF_OUTPUT = "\n".join(
+    [
+        # name, object, peeled commit of annotated tags, creation date
+        "badly_formatted\x00eeeee\x00\x005",
+        "v2.0.0\x00tag-dd\x00ddddd\x004",
+        "v1.1.0\x00tag-cc\x00ccccc\x003",
+        "v1.0.0\x00bbbbb\x00\x002",
+        "v0.1.0\x00tag-aa\x00aaaaa\x001",
+    ]
+)
+
+
+@pytest.fixture
+def tag_index(mock_git, mocker):
+    mocker.patch("semantic_release.vcs_helpers._tag_index", None)
+    # Refs which cannot be read from the git directory, every tag is peeled by git
+    mocker.patch("semantic_release.vcs_helpers._tag_refs", (vcs_helpers.repo, TagRefs({}, readable=False)))
+    mock_git.for_each_ref.return_value = FOR_EACH_REF_OUTPUT
+    mock_git.rev_parse.side_effect = rev_parse
+    return mock_git
+
+
+def rev_parse(*args):
+    """Peel the tags of `FOR_EACH_REF_OUTPUT`, as `git rev-parse --verify --quiet refs/tags/<tag>^{commit}`."""
+    commits = {"v2.0.0": "ddddd", "v1.1.0": "ccccc", "v1.0.0": "bbbbb", "v0.1.0": "aaaaa"}
+    tag_name = args[-1].split("/")[-1].split("^")[0]
+    if tag_name not in commits:
+        raise GitCommandError("rev-parse", 1)
+    return commits[tag_name]
+
+
 @pytest.mark.parametrize(
     "skip_tags,expected_result",
     [
@@ -291,35 +474,9 @@ def test_checkout_should_checkout_correct_branch(mock_git):
         (["v0.1.0", "v1.0.0", "v1.1.0", "v2.0.0"], None),
     ],
 )
-def test_get_last_version(skip_tags, expected_result):
-    @dataclass
-    class FakeCommit:
-        committed_date: int
-
-    @dataclass
-    class FakeTagObject:
-        tagged_date: int
-
-    class FakeTag:
-        def __init__(self, name, sha, date, is_tag_object):
-            self.name = name
-            self.tag = FakeTagObject(date)
-            if is_tag_object:
-                self.commit = TagObject(Repo(), sha)
-            else:
-                self.commit = FakeCommit(date)
-
-    mock.patch("semantic_release.vcs_helpers.check_repo")
-    git.repo.base.Repo.tags = mock.PropertyMock(
-        return_value=[
-            FakeTag("v0.1.0", "aaaaaaaaaaaaaaaaaaaa", 1, True),
-            FakeTag("v2.0.0", "dddddddddddddddddddd", 4, True),
-            FakeTag("badly_formatted", "eeeeeeeeeeeeeeeeeeee", 5, False),
-            FakeTag("v1.1.0", "cccccccccccccccccccc", 3, True),
-            FakeTag("v1.0.0", "bbbbbbbbbbbbbbbbbbbb", 2, False),
-        ]
-    )
+def test_get_last_version(tag_index, skip_tags, expected_result):
     assert expected_result == get_last_version(skip_tags)
+    tag_index.for_each_ref.assert_called_once_with("--sort=-creatordate", f"--format={TAG_FORMAT}", "refs/tags")
 
 
 @pytest.mark.parametrize(
@@ -327,32 +484,141 @@ def test_get_last_version(skip_tags, expected_result):
     [
         ("v0.1.0", "aaaaa"),
         ("v1.0.0", "bbbbb"),
-        ("v2.0.0", None),
+        ("v3.0.0", None),
     ],
 )
-def test_get_version_from_tag(tag_name, expected_version):
-    @dataclass
-    class FakeCommit:
-        hexsha: str
-
-    class FakeTag:
-        def __init__(self, name, sha):
-            self.name = name
-            self.commit = FakeCommit(sha)
-
-    mock.patch("semantic_release.vcs_helpers.check_repo")
-    git.repo.base.Repo.tags = mock.PropertyMock(
-        return_value=[
-            FakeTag("v0.1.0", "aaaaa"),
-            FakeTag("v1.0.0", "bbbbb"),
-            FakeTag("v1.1.0", "ccccc"),
-        ]
-    )
+def test_get_version_from_tag(tag_index, tag_name, expected_version):
     assert expected_version == get_version_from_tag(tag_name)
+    tag_index.rev_parse.assert_called_once_with("--verify", "--quiet", f"refs/tags/{tag_name}^{{commit}}")
+    tag_index.for_each_ref.assert_not_called()
+
+
+def test_get_version_from_tag_should_use_the_built_tag_index(tag_index):
+    get_last_version()
+    assert get_version_from_tag("v1.1.0") == "ccccc"
+    tag_index.rev_parse.assert_not_called()
 
 
-def test_update_changelog_file_ok(mock_git, mocker):
-    initial_content = (
+def test_get_version_from_tag_should_peel_a_tag_once(tag_index):
+    assert get_version_from_tag("v1.1.0") == "ccccc"
+    assert get_version_from_tag("v1.1.0") == "ccccc"
+    tag_index.rev_parse.assert_called_once()
+
+
+def test_describe_previous_version(tag_index):
+    tag_index.describe.return_value = "v1.0.0"
+    assert describe_previous_version("1.1.0") == "1.0.0"
+    tag_index.describe.assert_called_once_with("--tags", "--abbrev=0", "--match=v*", "v1.1.0^")
+
+
+def test_describe_previous_version_without_previous_tag(tag_index):
+    tag_index.describe.side_effect = GitCommandError("describe", 128)
+    assert describe_previous_version("0.1.0") is None
+
+
+def test_describe_previous_version_should_not_describe_untagged_versions(tag_index):
+    assert describe_previous_version("1.5.0") is None
+    tag_index.describe.assert_not_called()
+
+
+def test_get_release_commit_log(mock_git):
+    mock_git.log.return_value = "aaaaa\n1.1.0\r\n\r\nRelease\n\0bbbbb\n1.0.0\n\0"
+    assert list(get_release_commit_log()) == [("aaaaa", "1.1.0\n\nRelease\n"), ("bbbbb", "1.0.0\n")]
+    mock_git.log.assert_called_once_with(
+        "--fixed-strings", "--author=semantic-release <semantic-release>", "-z", "--format=%H%n%B"
+    )
+
+
+def test_tag_index_should_be_built_once(tag_index):
+    get_last_version()
+    get_version_from_tag("v1.0.0")
+    get_tag_index().previous_version("2.0.0")
+    tag_index.for_each_ref.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "version,expected_version",
+    [
+        ("2.0.0", "1.1.0"),
+        ("1.5.0", "1.1.0"),
+        ("1.0.0", "0.1.0"),
+        ("0.1.0", None),
+        ("3.0.0", "2.0.0"),
+    ],
+)
+def test_tag_index_previous_version(tag_index, version, expected_version):
+    assert get_tag_index().previous_version(version) == expected_version
+
+
+def test_tag_index_tags_for(tag_index):
+    index = get_tag_index()
+    assert index.tags_for("ddddd") == ["v2.0.0"]
+    assert index.tags_for("fffff") == []
+
+
+def test_tag_index_add():
+    index = TagIndex([("v1.0.0", "bbbbb", 2), ("v0.1.0", "aaaaa", 1)])
+    index.add("v1.1.0", "ccccc", 3)
+    index.add("v0.2.0", "ddddd", 1)
+    assert [tag[0] for tag in index.tags] == ["v1.1.0", "v1.0.0", "v0.1.0", "v0.2.0"]
+    assert index.last_version() == "1.1.0"
+    assert index.sha("v1.1.0") == "ccccc"
+    assert index.previous_version("1.0.0") == "0.2.0"
+
+
+def test_tag_new_version_should_update_tag_index(tag_index):
+    index = get_tag_index()
+    tag_new_version("3.0.0")
+    assert get_last_version() == "3.0.0"
+    assert get_tag_index() is index
+
+
+def test_get_version_from_tag_should_read_the_refs(git_repo, monkeypatch):
+    git_repo.git.commit("--allow-empty", "-m", "first")
+    git_repo.git.tag("-a", "v1.0.0", m="v1.0.0")
+    git_repo.git.tag("v1.1.0")
+    monkeypatch.setattr("semantic_release.vcs_helpers._tag_refs", None)
+    with mock.patch("semantic_release.vcs_helpers.get_tag_index") as mock_tag_index:
+        assert get_version_from_tag("v1.0.0") == git_repo.head.commit.hexsha
+        assert get_version_from_tag("v1.1.0") == git_repo.head.commit.hexsha
+        assert get_version_from_tag("v2.0.0") is None
+    mock_tag_index.assert_not_called()
+
+
+def test_get_version_from_tag_should_peel_packed_tag_objects_with_git(git_repo, monkeypatch):
+    git_repo.git.commit("--allow-empty", "-m", "first")
+    git_repo.git.tag("-a", "v1.0.0", m="v1.0.0")
+    # Loose refs and packed objects
+    git_repo.git.repack("-a", "-d")
+    git_repo.git.prune_packed()
+    assert TagRefs.read(Path(git_repo.git_dir)).commit("v1.0.0") is None
+    monkeypatch.setattr("semantic_release.vcs_helpers._tag_refs", None)
+    with mock.patch("semantic_release.vcs_helpers.get_tag_index") as mock_tag_index:
+        assert get_version_from_tag("v1.0.0") == git_repo.head.commit.hexsha
+    mock_tag_index.assert_not_called()
+
+
+def test_tag_new_version_should_update_tag_refs(tag_index, mocker):
+    mocker.patch("semantic_release.vcs_helpers._tag_refs", (vcs_helpers.repo, TagRefs({})))
+    mocker.patch("semantic_release.vcs_helpers.get_current_head_hash", return_value="fffff")
+    tag_new_version("3.0.0")
+    assert get_version_from_tag("v3.0.0") == "fffff"
+    tag_index.for_each_ref.assert_not_called()
+
+
+@pytest.fixture
+def changelog_repo(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.working_dir)
+    return git_repo
+
+
+def staged_files(git_repo):
+    return [path for path, _ in git_repo.index.entries]
+
+
+def test_update_changelog_file_ok(changelog_repo):
+    changelog = Path(changelog_repo.working_dir, "CHANGELOG.md")
+    changelog.write_text(
         "# Changelog\n"
         "\n"
         "<!--next-version-placeholder-->\n"
@@ -361,15 +627,11 @@ def test_update_changelog_file_ok(mock_git, mocker):
         "### Feature\n"
         "* Just a start"
     )
-    mocker.patch("semantic_release.vcs_helpers.Path.exists", return_value=True)
-    mocked_read_text = mocker.patch("semantic_release.vcs_helpers.Path.read_text", return_value=initial_content)
-    mocked_write_text = mocker.patch("semantic_release.vcs_helpers.Path.write_text")
 
     content_to_add_str = "### Fix\n* Fix a bug\n### Feature\n* Add something awesome"
     update_changelog_file("2.0.0", content_to_add_str)
 
-    mock_git.add.assert_called_once_with("CHANGELOG.md")
-    mocked_read_text.assert_called_once()
+    assert staged_files(changelog_repo) == ["CHANGELOG.md"]
     expected_content_str = (
         "# Changelog\n"
         "\n"
@@ -385,19 +647,14 @@ def test_update_changelog_file_ok(mock_git, mocker):
         "### Feature\n"
         "* Just a start"
     )
-    mocked_write_text.assert_called_once_with(expected_content_str)
-
+    assert changelog.read_text() == expected_content_str
 
-def test_update_changelog_file_missing_file(mock_git, mocker):
-    mocker.patch("semantic_release.vcs_helpers.Path.exists", return_value=False)
-    mocked_read_text = mocker.patch("semantic_release.vcs_helpers.Path.read_text")
-    mocked_write_text = mocker.patch("semantic_release.vcs_helpers.Path.write_text")
 
+def test_update_changelog_file_missing_file(changelog_repo):
     update_changelog_file("2.0.0", "* Some new content")
 
-    mock_git.add.assert_called_once_with("CHANGELOG.md")
-    mocked_read_text.assert_not_called()
-    mocked_write_text.assert_called_once_with(
+    assert staged_files(changelog_repo) == ["CHANGELOG.md"]
+    assert Path(changelog_repo.working_dir, "CHANGELOG.md").read_text() == (
         "# Changelog\n"
         "\n"
         "<!--next-version-placeholder-->\n"
@@ -407,13 +664,47 @@ def test_update_changelog_file_missing_file(mock_git, mocker):
     )
 
 
-def test_update_changelog_file_missing_placeholder(mock_git, mocker):
-    mocker.patch("semantic_release.vcs_helpers.Path.exists", return_value=True)
-    mocked_read_text = mocker.patch("semantic_release.vcs_helpers.Path.read_text", return_value="# Changelog")
-    mocked_write_text = mocker.patch("semantic_release.vcs_helpers.Path.write_text")
+def test_update_changelog_file_missing_placeholder(changelog_repo):
+    changelog = Path(changelog_repo.working_dir, "CHANGELOG.md")
+    changelog.write_text("# Changelog")
 
     update_changelog_file("2.0.0", "")
 
-    mock_git.add.assert_not_called()
-    mocked_read_text.assert_called_once()
-    mocked_write_text.assert_not_called()
+    assert staged_files(changelog_repo) == []
+    assert changelog.read_text() == "# Changelog"
+
+
+def test_update_changelog_file_should_use_the_placeholder_index(changelog_repo, mocker):
+    changelog = Path(changelog_repo.working_dir, "CHANGELOG.md")
+    changelog.write_text("# Changelog\n\n<!--next-version-placeholder-->\n\n## v1.0.0\n")
+    find_offsets = mocker.spy(vcs_helpers, "find_offsets")
+
+    update_changelog_file("2.0.0", "* Second")
+    update_changelog_file("3.0.0", "* Third")
+    assert find_offsets.call_count == 1
+
+    changelog.write_text(changelog.read_text().replace("# Changelog", "# Release notes"))
+    update_changelog_file("4.0.0", "* Fourth")
+    assert find_offsets.call_count == 2
+
+    today = f"{date.today():%Y-%m-%d}"
+    assert changelog.read_text() == (
+        "# Release notes\n\n<!--next-version-placeholder-->\n\n"
+        f"## v4.0.0 ({today})\n* Fourth\n\n"
+        f"## v3.0.0 ({today})\n* Third\n\n"
+        f"## v2.0.0 ({today})\n* Second\n\n"
+        "## v1.0.0\n"
+    )
+
+
+def test_insert_into_file_should_copy_in_blocks(tmp_path, mocker):
+    mocker.patch("semantic_release.vcs_helpers.COPY_BLOCK_SIZE", 4)
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"0123456789")
+    path.chmod(0o640)
+
+    insert_into_file(path, [2, 7], b"--")
+
+    assert path.read_bytes() == b"01--23456--789"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert [file.name for file in tmp_path.iterdir()] == ["file.txt"]